@@ -1,83 +1,152 @@
-import os
-import json
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
-from app.agent.tools import PlatformKnowledgeTool
-
-def run_crew(query: str):
-    # Debug: Check API Key
-    api_key = os.getenv("OPENAI_API_KEY")
-    print(f"DEBUG: API Key loaded: {'Yes' if api_key else 'No'}")
-    if not api_key:
-        return "Error: OPENAI_API_KEY is missing in backend .env"
-
-    # LLM Configuration
-    try:
-        # Using Direct OpenAI
-        # gpt-4o-mini is cost-effective and capable
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=api_key,
-            temperature=0
-        )
-        print("DEBUG: LLM Initialized (OpenAI gpt-4o-mini)")
-    except Exception as e:
-        print(f"DEBUG: Error initializing LLM: {e}")
-        return f"Internal Error: {str(e)}"
+from typing import AsyncIterator, Optional
+
+import httpx
+import logging
+from app.agent.knowledge import knowledge_snapshot
+from app.agent.response_cache import chat_response_cache
+from app.core.config import settings
+from app.core.metrics import InstrumentedTransport, InstrumentedAsyncTransport, classify_openai
 
-    # Tools
-    platform_tool = PlatformKnowledgeTool()
-    tools = [platform_tool]
-    
-    # Bind tools to LLM
-    llm_with_tools = llm.bind_tools(tools)
+logger = logging.getLogger(__name__)
 
-    # Initial messages
-    messages = [
-        SystemMessage(content="""You are a helpful assistant for the DSK Portal. 
-You have access to real-time data about services and categories using the platform_knowledge tool. 
+SYSTEM_PROMPT = """You are a helpful assistant for the DSK Portal.
+You have access to real-time data about services and categories using the platform_knowledge tool.
 
 **STRICT RESPONSE FORMATTING RULES:**
 1. **Use Markdown**: Always use Markdown headers (###), bullet points, and bold text to organize your response.
 2. **Be Structured**: Never output a "wall of text". Break information into logical sections.
 3. **Services List**: When listing services, always use a Markdown Table with columns for Name, Price, and Category.
 4. **Currency**: All prices are in Indian Rupees (INR). Always display prices with the '₹' symbol or 'INR' suffix (e.g., ₹100 or 100 INR).
-5. **Tone**: Professional, concise, and helpful. 
+5. **Tone**: Professional, concise, and helpful.
+
+If the user asks about services or categories, ALWAYS use the platform_knowledge tool to get the latest info first."""
+
+MISSING_KEY_MESSAGE = "Error: OPENAI_API_KEY is missing in backend .env"
+
+# Built once per worker and reused by every chat request; ChatOpenAI keeps
+# its own pooled HTTP client, so connections to the model API stay warm.
+# LangChain (and the openai SDK under it) takes over a second to import, so it
+# is loaded here on the first chat request rather than when the app boots.
+_llm_with_tools = None
+_platform_tool = None
+
+def get_platform_tool():
+    global _platform_tool
+    if _platform_tool is None:
+        from app.agent.tools import PlatformKnowledgeTool
+        _platform_tool = PlatformKnowledgeTool()
+    return _platform_tool
+
+def get_llm_with_tools():
+    global _llm_with_tools
+    if _llm_with_tools is None:
+        from langchain_openai import ChatOpenAI
+
+        # gpt-4o-mini is cost-effective and capable
+        llm = ChatOpenAI(
+            model=settings.OPENAI_MODEL,
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            timeout=settings.OPENAI_TIMEOUT,
+            temperature=0,
+            # Instrumented clients, so model calls show up in /metrics
+            http_client=httpx.Client(transport=InstrumentedTransport(httpx.HTTPTransport(), classify_openai)),
+            http_async_client=httpx.AsyncClient(transport=InstrumentedAsyncTransport(httpx.AsyncHTTPTransport(), classify_openai)),
+        )
+        _llm_with_tools = llm.bind_tools([get_platform_tool()])
+        logger.info("LLM initialized", extra={"model": settings.OPENAI_MODEL})
+    return _llm_with_tools
+
+def _initial_messages(query: str) -> list:
+    from langchain_core.messages import HumanMessage, SystemMessage
+    return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=query)]
 
-If the user asks about services or categories, ALWAYS use the platform_knowledge tool to get the latest info first."""),
-        HumanMessage(content=query)
-    ]
+async def _run_tool_calls(messages: list, tool_calls: list):
+    from langchain_core.messages import ToolMessage
+    for tool_call in tool_calls:
+        if tool_call["name"] == "platform_knowledge":
+            tool_output = await get_platform_tool().ainvoke(tool_call["args"])
+            messages.append(ToolMessage(tool_call_id=tool_call["id"], content=tool_output))
 
-    print(f"DEBUG: Invoking LLM with query: {query}")
+async def _catalog_version() -> str:
+    # Refreshes the snapshot if it is stale, so cached answers never outlive a catalog change
+    await knowledge_snapshot.aget()
+    return knowledge_snapshot.version
+
+async def _answer(query: str) -> str:
+    """Run the agent without the cache. Errors propagate, so error text is never cached."""
     try:
+        llm_with_tools = get_llm_with_tools()
+        messages = _initial_messages(query)
+
         # First Run
-        response_1 = llm_with_tools.invoke(messages)
+        response_1 = await llm_with_tools.ainvoke(messages)
         messages.append(response_1)
-        print(f"DEBUG: First Response: {response_1}")
-
-        # Check for tool calls
-        if response_1.tool_calls:
-            print(f"DEBUG: Tool calls found: {response_1.tool_calls}")
-            for tool_call in response_1.tool_calls:
-                if tool_call["name"] == "platform_knowledge":
-                    print("DEBUG: Executing platform_knowledge tool...")
-                    # Execute tool
-                    tool_output = platform_tool.invoke(tool_call["args"])
-                    print(f"DEBUG: Tool Output: {tool_output[:100]}...") # Print first 100 chars
-                    # Append result
-                    messages.append(ToolMessage(tool_call_id=tool_call["id"], content=tool_output))
-            
-            # Second Run (to generate final answer)
-            print("DEBUG: Invoking LLM for final response...")
-            response_2 = llm_with_tools.invoke(messages)
-            print(f"DEBUG: Final Response: {response_2.content}")
-            return response_2.content
-        else:
-            # No tool called, return initial response
-            print("DEBUG: No tool calls, returning initial response")
+
+        # No tool called, return initial response
+        if not response_1.tool_calls:
             return response_1.content
+
+        await _run_tool_calls(messages, response_1.tool_calls)
+
+        # Second Run (to generate final answer)
+        response_2 = await llm_with_tools.ainvoke(messages)
+        return response_2.content
+    except Exception:
+        logger.exception("Chat agent failed")
+        raise
+
+async def run_crew(query: str) -> str:
+    """Answer a chat message, from the response cache when possible. Runs entirely on the event loop."""
+    if not settings.OPENAI_API_KEY:
+        return MISSING_KEY_MESSAGE
+
+    try:
+        version = await _catalog_version()
+        cached = chat_response_cache.lookup(query, version)
+        if cached is not None:
+            return cached
+
+        answer = await _answer(query)
+        if answer:
+            chat_response_cache.store(query, version, answer)
+        return answer
     except Exception as e:
-        print(f"DEBUG: Error during execution: {e}")
-        import traceback
-        traceback.print_exc()
         return f"I encountered an error processing your request: {str(e)}"
+
+async def stream_crew(query: str) -> AsyncIterator[str]:
+    """
+    Same flow as run_crew, but yields answer tokens as the model produces them.
+    Tool-call rounds are accumulated silently; only user-facing text is yielded.
+    """
+    if not settings.OPENAI_API_KEY:
+        yield MISSING_KEY_MESSAGE
+        return
+
+    version = await _catalog_version()
+    cached = chat_response_cache.lookup(query, version)
+    if cached is not None:
+        yield cached
+        return
+
+    llm_with_tools = get_llm_with_tools()
+    messages = _initial_messages(query)
+    answer = []
+
+    # At most two rounds: the optional tool call, then the final answer
+    for _ in range(2):
+        gathered: Optional[object] = None
+        async for chunk in llm_with_tools.astream(messages):
+            gathered = chunk if gathered is None else gathered + chunk
+            if chunk.content:
+                answer.append(chunk.content)
+                yield chunk.content
+
+        if gathered is None or not gathered.tool_calls:
+            break
+
+        messages.append(gathered)
+        await _run_tool_calls(messages, gathered.tool_calls)
+
+    if answer:
+        chat_response_cache.store(query, version, "".join(answer))
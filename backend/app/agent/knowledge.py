@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.db.catalog import service_catalog
+from app.db.supabase import supabase, get_async_supabase
+
+def _build_snapshot(categories: list, services: list) -> str:
+    # Compact JSON: no indentation and category flattened to a name, to keep prompt tokens down
+    data = {
+        "categories": [c["name"] for c in categories],
+        "services": [
+            {
+                "name": s["name"],
+                "price": s.get("price"),
+                "category": (s.get("categories") or {}).get("name")
+            }
+            for s in services
+        ]
+    }
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+class KnowledgeSnapshot:
+    """
+    Precomputed platform_knowledge output for the active catalog.
+    Rebuilt after KNOWLEDGE_TTL seconds or when the service catalog is invalidated.
+    `version` is a hash of the snapshot text, so it changes exactly when the content does.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.text: Optional[str] = None
+        self.version: Optional[str] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self.text is not None and time.monotonic() - self._built_at < self.ttl
+
+    def _store(self, text: str) -> str:
+        self.text = text
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        self._built_at = time.monotonic()
+        return text
+
+    def get(self) -> str:
+        if self._is_fresh():
+            return self.text
+        with self._lock:
+            if not self._is_fresh():
+                categories = supabase.table("categories").select("name").eq("is_active", True).execute()
+                services = supabase.table("services").select("name, price, categories(name)").eq("is_active", True).execute()
+                self._store(_build_snapshot(categories.data or [], services.data or []))
+        return self.text
+
+    async def aget(self) -> str:
+        if self._is_fresh():
+            return self.text
+        async with self._async_lock:
+            if not self._is_fresh():
+                db = await get_async_supabase()
+                categories, services = await asyncio.gather(
+                    db.table("categories").select("name").eq("is_active", True).execute(),
+                    db.table("services").select("name, price, categories(name)").eq("is_active", True).execute(),
+                )
+                self._store(_build_snapshot(categories.data or [], services.data or []))
+        return self.text
+
+    def invalidate(self):
+        self._built_at = 0.0
+
+knowledge_snapshot = KnowledgeSnapshot(ttl=settings.KNOWLEDGE_TTL)
+service_catalog.add_listener(knowledge_snapshot.invalidate)
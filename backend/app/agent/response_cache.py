@@ -0,0 +1,114 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+# Words that don't change what is being asked; negations are deliberately not here
+_STOPWORDS = frozenset(
+    "a an the is are was were be do does did i me my you your we our it its this that these those "
+    "to of in on at for with and or please can could would will how what which when where who".split()
+)
+
+def normalize(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace: 'What services?' == 'what services'."""
+    text = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+def content_words(text: str) -> frozenset:
+    """The words of a normalized question that carry its meaning: 'birth' vs 'death', 'not'."""
+    return frozenset(word for word in text.split() if word not in _STOPWORDS)
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class ChatResponseCache:
+    """
+    Answers to previously seen chat questions, in two tiers:
+      - exact: same normalized question
+      - similar: trigram Jaccard similarity >= `similarity` and the same set of
+        content words (0 disables this tier). Trigrams alone rate long questions
+        that differ in one word ("birth"/"death", "not") as near-duplicates.
+    Entries are keyed by the catalog snapshot version, so a catalog change
+    makes every older answer unreachable. Bounded by `maxsize` with LRU eviction.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, similarity: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity = similarity
+        # (version, normalized question) -> (answer, trigrams, content words, expires_at)
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _find_similar(self, version: str, text: str, now: float) -> Optional[Tuple[str, str]]:
+        grams, words = trigrams(text), content_words(text)
+        best_key, best_score = None, self.similarity
+        for key, (_, entry_grams, entry_words, expires_at) in self._entries.items():
+            if key[0] != version or expires_at <= now or entry_words != words:
+                continue
+            union = len(grams | entry_grams)
+            score = len(grams & entry_grams) / union if union else 0.0
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def lookup(self, query: str, version: str) -> Optional[str]:
+        text = normalize(query)
+        now = time.monotonic()
+        with self._lock:
+            key = (version, text)
+            entry = self._entries.get(key)
+            if entry and entry[3] > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+
+            if self.similarity > 0:
+                similar = self._find_similar(version, text, now)
+                if similar:
+                    self._entries.move_to_end(similar)
+                    self.similar_hits += 1
+                    return self._entries[similar][0]
+
+            self.misses += 1
+            return None
+
+    def store(self, query: str, version: str, answer: str):
+        text = normalize(query)
+        with self._lock:
+            self._entries[(version, text)] = (answer, trigrams(text), content_words(text), time.monotonic() + self.ttl)
+            self._entries.move_to_end((version, text))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            total = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / total) if total else 0.0,
+            }
+
+chat_response_cache = ChatResponseCache(
+    maxsize=settings.CHAT_CACHE_SIZE,
+    ttl=settings.CHAT_CACHE_TTL,
+    similarity=settings.CHAT_CACHE_SIMILARITY,
+)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, admin, services, wallet, chat, jobs, notifications
+from app.api.v1.endpoints import auth, admin, services, wallet, chat, jobs, notifications, documents, events
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -10,3 +10,5 @@ api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 
+api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
-from app.core.security import get_current_admin, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.security import get_current_admin
 from app.db.supabase import supabase
+from app.db import repository
+from app.core.uploads import check_upload, store_upload, store_bytes, IMAGE_TYPES, DOCUMENT_TYPES
+from app.core.images import build_logo_variants, InvalidImage
+from app.db.catalog import service_catalog
+from app.core.push import push_hub
+from app.db.stats import admin_stats_cache
+from app.db.submissions import parse_fields, fetch_submissions_page, fetch_services_by_id, iter_submissions
 from pydantic import BaseModel
-from typing import List, Optional, Any
-import shutil
+from typing import Optional
+import asyncio
+import logging
+import secrets
 import time
+import json
+import csv
+import io
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -21,48 +37,98 @@ class AdminStats(BaseModel):
     rejected_applications: int
 
 @router.get("/stats", response_model=AdminStats)
-def get_admin_stats(current_user: dict = Depends(get_current_admin)):
+async def get_admin_stats(current_user: dict = Depends(get_current_admin)):
     """
     Get aggregated statistics for the Admin Dashboard.
+    Served from the in-memory snapshot, refreshed in the background every ADMIN_STATS_TTL seconds.
     """
     try:
-        # Parallel fetching would be better but sequential is fine for now
-        users = supabase.table("users").select("id", count="exact", head=True).execute()
-        services = supabase.table("services").select("id", count="exact", head=True).execute()
-        
-        total_apps = supabase.table("submissions").select("id", count="exact", head=True).execute()
-        pending = supabase.table("submissions").select("id", count="exact", head=True).eq("status", "pending").execute()
-        approved = supabase.table("submissions").select("id", count="exact", head=True).eq("status", "approved").execute()
-        rejected = supabase.table("submissions").select("id", count="exact", head=True).eq("status", "rejected").execute()
-
-        return {
-            "total_users": users.count or 0,
-            "total_services": services.count or 0,
-            "total_applications": total_apps.count or 0,
-            "pending_applications": pending.count or 0,
-            "approved_applications": approved.count or 0,
-            "rejected_applications": rejected.count or 0
-        }
+        return await admin_stats_cache.get()
     except Exception as e:
-        print(f"Error fetching admin stats: {e}")
-        # Return zeros on error to keep dashboard functional, or re-raise
-        # Re-raising 500 allows frontend to see error. 
-        # But returning zeros might be "safer" for UI rendering? 
+        logger.exception("Error fetching admin stats")
         # Let's raise 500 so our new frontend error handling picks it up.
         raise HTTPException(status_code=500, detail=f"Stats calculation failed: {str(e)}")
 
 @router.get("/applications")
-def get_all_applications(status: Optional[str] = None, current_user: dict = Depends(get_current_admin)):
+def get_all_applications(
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.ADMIN_PAGE_SIZE, ge=1, le=settings.ADMIN_PAGE_SIZE_MAX),
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin)
+):
     """
-    Get all applications with User and Service details.
+    Get applications page by page, newest first, with User and Service details.
+    Pass the returned `next_cursor` as `cursor` to get the next page.
+    `fields=id,status,...` limits the submission columns (e.g. to skip the `data` blob).
+    Services are returned once in the `services` map instead of on every row.
     """
-    query = supabase.table("submissions").select("*, users(email), services(name, fields, Category:categories(name))")
-    
-    if status:
-        query = query.eq("status", status)
-        
-    response = query.order("created_at", desc=True).execute()
-    return response.data
+    try:
+        columns = parse_fields(fields)
+        items, next_cursor = fetch_submissions_page(columns, status=status, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    services = fetch_services_by_id(item.get("service_id") for item in items)
+
+    return {
+        "items": items,
+        "services": services,
+        "next_cursor": next_cursor
+    }
+
+def _export_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+def _export_csv(rows, columns):
+    header = columns + ["user_email", "service_name"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow([
+            json.dumps(row.get(col)) if isinstance(row.get(col), (dict, list)) else row.get(col)
+            for col in header
+        ])
+        yield buffer.getvalue()
+
+@router.get("/applications/export")
+def export_applications(
+    format: str = "ndjson",
+    status: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    Download all applications as NDJSON or CSV.
+    Rows are streamed in batches as they are fetched, so memory stays flat for any table size.
+    """
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+    try:
+        columns = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = iter_submissions(columns, status=status, batch_size=settings.ADMIN_EXPORT_BATCH_SIZE)
+    filename = f"applications-{time.strftime('%Y%m%d')}.{format}"
+
+    if format == "csv":
+        body, media_type = _export_csv(rows, columns), "text/csv"
+    else:
+        body, media_type = _export_ndjson(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/applications/{id}")
 def get_application_detail(id: int, current_user: dict = Depends(get_current_admin)):
@@ -73,7 +139,7 @@ def get_application_detail(id: int, current_user: dict = Depends(get_current_adm
         response = supabase.table("submissions").select("*, users(email), services(name, fields, Category:categories(name))").eq("id", id).single().execute()
         return response.data
     except Exception as e:
-        print(f"Error fetching application {id}: {e}")
+        logger.exception("Error fetching application", extra={"submission_id": id})
         raise HTTPException(status_code=500, detail=f"Fetch failed: {str(e)}")
 
 class StatusUpdate(BaseModel):
@@ -89,47 +155,76 @@ def update_application_status(id: int, update: StatusUpdate, current_user: dict
 
 
     response = supabase.table("submissions").update({"status": update.status}).eq("id", id).execute()
+    admin_stats_cache.mark_stale()
+    # Tell the applicant's open dashboards right away instead of waiting for a reload
+    for row in response.data or []:
+        push_hub.publish(
+            "application_status",
+            {"submission_id": row["id"], "service_id": row.get("service_id"), "status": row.get("status")},
+            user_id=row.get("user_id"),
+        )
     return response.data
 
 @router.post("/upload-logo")
-async def upload_service_logo(file: UploadFile = File(...), current_user: dict = Depends(get_current_admin)):
+async def upload_service_logo(
+    file: UploadFile = File(...),
+    service_id: Optional[int] = Query(None, description="Also store the new logo on this service"),
+    current_user: dict = Depends(get_current_admin),
+):
     """
-    Upload a service logo to Supabase Storage (bypassing RLS via Service Role).
+    Upload a service logo to Supabase Storage (bypassing RLS via Service Role),
+    together with resized variants (64px thumbnail, 256px card, each also as WebP)
+    rendered in the image process pool. Returns the original's URL and the variant URLs.
     """
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
 
+    # Checks the real type and size without reading the file into memory
+    upload = await check_upload(file, IMAGE_TYPES, settings.UPLOAD_LOGO_MAX_BYTES)
+
+    # SVGs scale on their own; everything else gets raster variants
+    variants = {}
+    if upload.content_type != "image/svg+xml":
+        data = await asyncio.to_thread(upload.file.file.read)
+        await file.seek(0)
+        try:
+            variants = await build_logo_variants(data)
+        except InvalidImage as e:
+            raise HTTPException(status_code=415, detail=str(e))
+
     try:
         # Generate unique filename
-        file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'png'
-        file_name = f"{int(time.time())}_{file.filename}"
-        
-        # Read file content
-        file_content = await file.read()
-
-        # Upload to Supabase Storage
-        # NOTE: The current 'supabase' client in app.db.supabase is likely initialized with SERVICE_ROLE_KEY if properly configured for backend
-        # logic, or we rely on the specific bucket being public for reading.
-        # For writing, if the client uses Anon key, it respects RLS. If Service key, it bypasses.
-        # Ensure app.db.supabase uses Service Role Key for this to work perfectly.
-        
-        res = supabase.storage.from_("service-logos").upload(
-            file_name,
-            file_content,
-            {"content-type": file.content_type}
+        stamp = f"{int(time.time())}_{secrets.token_hex(4)}"
+        file_name = f"{stamp}_{file.filename}"
+
+        # Variant paths are never reused, so they can be cached for a long time
+        variant_paths = {name: f"variants/{stamp}/{name.replace('_webp', '')}.{ext}" for name, (_, _, ext) in variants.items()}
+        await asyncio.gather(
+            store_upload("service-logos", file_name, upload),
+            *(
+                store_bytes("service-logos", variant_paths[name], body, content_type, cache_control="31536000")
+                for name, (body, content_type, _) in variants.items()
+            ),
         )
 
-        # Construct Public URL (Simpler than calling getPublicUrl which sometimes returns slight variations)
-        # Standard Supabase Storage Public URL format:
-        # https://<project_ref>.supabase.co/storage/v1/object/public/<bucket>/<file>
-        
-        # However, to be safe, let's ask Supabase for it.
-        public_url_res = supabase.storage.from_("service-logos").get_public_url(file_name)
-        
-        return {"url": public_url_res}
+        public_url_res = await repository.get_public_url("service-logos", file_name)
+        variant_urls = {}
+        for name, path in variant_paths.items():
+            variant_urls[name] = await repository.get_public_url("service-logos", path)
+
+        if service_id is not None:
+            values = {"logo_url": public_url_res}
+            # Same guard as services.update_service: no logo_variants column without its migration
+            current = await repository.get_service(service_id)
+            if current and "logo_variants" in current:
+                values["logo_variants"] = variant_urls or None
+            await repository.update_service(service_id, values)
+            service_catalog.invalidate()
+
+        return {"url": public_url_res, "variants": variant_urls}
 
     except Exception as e:
-        print(f"Upload Error: {str(e)}")
+        logger.exception("Logo upload failed")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @router.post("/applications/{id}/document")
@@ -138,48 +233,30 @@ async def upload_application_document(id: int, file: UploadFile = File(...), cur
     Upload a final document for an application (Admin only).
     Stored in 'final-documents' bucket (Private).
     """
+    upload = await check_upload(file, DOCUMENT_TYPES, settings.UPLOAD_DOCUMENT_MAX_BYTES)
+
     try:
-        print(f"[DEBUG] Uploading file for app {id}")
-        
         # Check if settings are loaded
-        from app.core.config import settings
         if not settings.SUPABASE_SERVICE_ROLE_KEY:
-            print("[DEBUG] CRITICAL: SUPABASE_SERVICE_ROLE_KEY is missing!")
+            logger.critical("SUPABASE_SERVICE_ROLE_KEY is missing")
             raise Exception("Server configuration error: Missing Service Role Key")
 
-        # Generate unique filename
-        file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'pdf'
-        file_name = f"app_{id}_{int(time.time())}.{file_ext}"
-        print(f"[DEBUG] Generated filename: {file_name}")
-        
-        # Read file content
-        file_content = await file.read()
-        print(f"[DEBUG] File size: {len(file_content)} bytes")
-
-        # Upload to Supabase Storage (final-documents bucket)
-        print("[DEBUG] Attempting upload to 'final-documents' bucket...")
-        res = supabase.storage.from_("final-documents").upload(
-            file_name,
-            file_content,
-            {"content-type": file.content_type}
-        )
-        print(f"[DEBUG] Upload res type: {type(res)}")
+        # Generate unique filename (extension from the sniffed type, not the client's name)
+        file_name = f"app_{id}_{int(time.time())}.{upload.extension}"
+
+        # Stream to Supabase Storage (final-documents bucket)
+        res = await store_upload("final-documents", file_name, upload)
         # Note: supabase-py upload might return a response object or dict depending on version.
         # If it fails, it usually raises an exception or returns error dict.
-        
-        print(f"[DEBUG] Upload successful. Updating database...")
+        logger.debug("Final document uploaded", extra={"submission_id": id, "file_name": file_name, "bytes": upload.size})
 
         # Store the FILE PATH (not public URL) in the database
-        update_res = supabase.table("submissions").update({
+        update_res = await repository.update_submission(id, {
             "final_document_url": file_name
-        }).eq("id", id).execute()
-        
-        print(f"[DEBUG] Database updated: {update_res.data}")
+        })
         
         return {"success": True, "file_path": file_name}
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"[DEBUG] Document Upload Error: {str(e)}")
+        logger.exception("Document upload failed", extra={"submission_id": id})
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
@@ -5,11 +5,17 @@ router = APIRouter()
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, EmailStr
 from app.db.supabase import supabase
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, EmailStr
-from app.db.supabase import supabase
+from typing import Optional
+from app.core.security import get_current_user
+from app.db import repository
+from app.db.login_history import login_history_writer
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class SignupRequest(BaseModel):
@@ -33,14 +39,8 @@ async def signup(request: Request, body: SignupRequest):
     # OR standard signUp if we are just proxying.
     # Standard signUp returns a session if auto-confirm is on, or just user if not.
     try:
-        auth_response = supabase.auth.sign_up({
-            "email": body.email,
-            "password": body.password,
-            "options": {
-                "data": {
-                    "full_name": body.full_name
-                }
-            }
+        auth_response = await repository.sign_up(body.email, body.password, {
+            "full_name": body.full_name
         })
         
         if not auth_response.user:
@@ -52,11 +52,11 @@ async def signup(request: Request, body: SignupRequest):
         user_id = auth_response.user.id
         client_ip = request.client.host
         
-        supabase.table("users").update({
+        await repository.update_user(user_id, {
             "privacy_policy_accepted": True,
             "accepted_at": "now()",
             "ip_address": client_ip
-        }).eq("id", user_id).execute()
+        })
 
         return {"message": "Account created successfully! Please check your email."}
 
@@ -69,29 +69,30 @@ async def signup(request: Request, body: SignupRequest):
         raise HTTPException(status_code=400, detail=msg)
 
 class RecordLoginRequest(BaseModel):
-    user_id: str
+    user_id: Optional[str] = None
     user_agent: str
 
 @router.post("/record-login")
-async def record_login(request: Request, body: RecordLoginRequest):
+async def record_login(request: Request, body: RecordLoginRequest, user=Depends(get_current_user)):
     """
     Records a login session in the login_history table.
-    This is called from the frontend after a successful login.
+    This is called from the frontend after a successful login, with the new session's token.
+    Rows are buffered and written in bulk by login_history_writer.
     """
+    user_id = str(user.user.id)
+    if body.user_id and body.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Cannot record a login for another user")
+
     try:
         client_ip = request.client.host if request.client else "Unknown"
         
-        result = supabase.table("login_history").insert({
-            "user_id": body.user_id,
+        await login_history_writer.record({
+            "user_id": user_id,
             "ip_address": client_ip,
             "user_agent": body.user_agent[:500] if body.user_agent else "Unknown"  # Truncate long user agents
-        }).execute()
+        })
         
-        print(f"Login history insert result: {result}")
         return {"message": "Login recorded successfully"}
     except Exception as e:
-        # Log the full error for debugging
-        import traceback
-        traceback.print_exc()
-        print(f"Error recording login: {e}")
+        logger.exception("Error recording login")
         return {"message": f"Login recorded (with warnings): {str(e)}"}
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.agent.crew import run_crew
+from app.agent.crew import run_crew, stream_crew
+from app.agent.response_cache import chat_response_cache
+from app.core.security import get_current_admin
+import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -15,10 +22,45 @@ async def chat_endpoint(request: ChatRequest):
     try:
         if not request.message:
              raise HTTPException(status_code=400, detail="Message cannot be empty")
-        
-        result = run_crew(request.message)
-        
+
+        result = await run_crew(request.message)
+
         return ChatResponse(response=str(result))
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in chat endpoint: {e}")
+        logger.exception("Error in chat endpoint")
         raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@router.post("/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Server-Sent Events version of the chat endpoint.
+    Emits `data: {"token": ...}` events as the answer is generated, then `event: done`.
+    """
+    if not request.message:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    async def events():
+        try:
+            async for token in stream_crew(request.message):
+                yield _sse({"token": token})
+        except Exception as e:
+            logger.exception("Error in chat stream")
+            yield _sse({"detail": f"I encountered an error processing your request: {str(e)}"}, event="error")
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache-stats")
+def chat_cache_stats(current_user: dict = Depends(get_current_admin)):
+    """Admin only: hit rate and size of the chat response cache (this worker)."""
+    return chat_response_cache.stats()
@@ -0,0 +1,66 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from typing import List
+from app.core.security import get_current_user, get_user_role
+from app.db import repository
+from app.db.documents import final_document_urls
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_BATCH = 200
+
+class SignedUrlsRequest(BaseModel):
+    submission_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH)
+
+class SignedDocumentUrl(BaseModel):
+    submission_id: int
+    path: str
+    url: str
+    expires_at: int
+
+async def _signed_urls(submission_ids: List[int], current_user) -> List[SignedDocumentUrl]:
+    # Admins can download any final document; users only their own
+    role = await get_user_role(current_user)
+    owner = None if role == 'admin' else str(current_user.user.id)
+
+    rows = await repository.get_submission_documents(submission_ids, user_id=owner)
+    rows = [row for row in rows if row.get("final_document_url")]
+    signed = await final_document_urls.get_many([row["final_document_url"] for row in rows])
+
+    return [
+        SignedDocumentUrl(
+            submission_id=row["id"],
+            path=row["final_document_url"],
+            url=signed[row["final_document_url"]]["url"],
+            expires_at=signed[row["final_document_url"]]["expires_at"],
+        )
+        for row in rows
+        if row["final_document_url"] in signed
+    ]
+
+@router.post("/signed-urls", response_model=List[SignedDocumentUrl])
+async def get_signed_document_urls(request: SignedUrlsRequest, current_user=Depends(get_current_user)):
+    """
+    Signed download URLs for the final documents of many submissions, in one call.
+    Submissions without a document (or not visible to the caller) are left out.
+    """
+    try:
+        return await _signed_urls(request.submission_ids, current_user)
+    except Exception as e:
+        logger.exception("Error signing document URLs")
+        raise HTTPException(status_code=500, detail="Failed to create download links")
+
+@router.get("/{submission_id}/signed-url", response_model=SignedDocumentUrl)
+async def get_signed_document_url(submission_id: int, current_user=Depends(get_current_user)):
+    """Signed download URL for one submission's final document."""
+    try:
+        urls = await _signed_urls([submission_id], current_user)
+    except Exception as e:
+        logger.exception("Error signing document URL", extra={"submission_id": submission_id})
+        raise HTTPException(status_code=500, detail="Failed to create download link")
+    if not urls:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return urls[0]
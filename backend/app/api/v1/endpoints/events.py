@@ -0,0 +1,53 @@
+import time
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.push import push_hub, format_sse
+from app.core.security import get_current_user
+from app.db import repository
+
+router = APIRouter()
+
+@router.get("/stream")
+async def event_stream(request: Request, current_user=Depends(get_current_user)):
+    """
+    Server-Sent Events for the signed-in user: `job_notification`,
+    `job_notification_removed`, `job_service` (only while job alerts are on),
+    `application_status` and `preference`. The preference is read once on
+    connect; after that an idle stream costs no queries, only a heartbeat comment.
+    Streams end after PUSH_STREAM_MAX_AGE and the client reconnects with a fresh token.
+    The token only travels in the Authorization header, never in the URL, so it
+    stays out of access logs.
+    """
+    uid = str(current_user.user.id)
+
+    profile = await repository.get_user(uid, "job_notifications_enabled")
+    job_alerts = bool(profile and profile.get("job_notifications_enabled"))
+    subscription = push_hub.subscribe(uid, job_alerts)
+
+    async def stream():
+        ends_at = time.monotonic() + settings.PUSH_STREAM_MAX_AGE
+        try:
+            yield b"retry: 5000\n\n"
+            yield format_sse("ready", {"job_alerts": job_alerts})
+            while time.monotonic() < ends_at:
+                try:
+                    message = await subscription.next(settings.PUSH_HEARTBEAT)
+                except EOFError:
+                    return
+                if message is None:
+                    if await request.is_disconnected():
+                        return
+                    yield b": ping\n\n"
+                    continue
+                yield format_sse(message["event"], message["data"])
+        finally:
+            push_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
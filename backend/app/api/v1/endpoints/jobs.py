@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.core.security import get_current_admin, get_current_user
 from app.db.supabase import supabase
+from app.core.push import push_hub
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
@@ -50,6 +51,8 @@ def create_job(job: JobNotificationCreate, current_user: dict = Depends(get_curr
     try:
         response = supabase.table("job_notifications").insert(job.dict()).execute()
         if response.data:
+            if response.data[0].get("is_active"):
+                push_hub.publish("job_notification", response.data[0])
             return response.data[0]
         raise HTTPException(status_code=400, detail="Creation returned no data")
     except Exception as e:
@@ -65,6 +68,7 @@ def delete_job(id: int, current_user: dict = Depends(get_current_admin)):
         # User requested "add and remove", so hard delete is acceptable, or soft.
         # Let's do hard delete for now as requested.
         response = supabase.table("job_notifications").delete().eq("id", id).execute()
+        push_hub.publish("job_notification_removed", {"id": id})
         return {"message": "Job notification deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete job: {str(e)}")
@@ -1,9 +1,14 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from app.core.security import get_current_user
 from app.db.supabase import supabase
+from app.db.job_alerts import job_alert_feed
+from app.core.push import push_hub
 from pydantic import BaseModel
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class NotificationPreference(BaseModel):
@@ -29,7 +34,7 @@ def get_notification_preference(current_user=Depends(get_current_user)):
             return {"enabled": response.data.get("job_notifications_enabled", False)}
         return {"enabled": False}
     except Exception as e:
-        print(f"Error getting notification preference: {e}")
+        logger.warning("Error getting notification preference", extra={"error": str(e)})
         return {"enabled": False}
 
 @router.post("/preference")
@@ -42,10 +47,12 @@ def toggle_notification_preference(pref: NotificationPreference, current_user=De
         response = supabase.table("users").update({
             "job_notifications_enabled": pref.enabled
         }).eq("id", uid).execute()
+        # Also switches job_service events on/off for the user's open streams
+        push_hub.publish("preference", {"enabled": pref.enabled}, user_id=uid)
         
         return {"success": True, "enabled": pref.enabled}
     except Exception as e:
-        print(f"Error updating notification preference: {e}")
+        logger.exception("Error updating notification preference")
         raise HTTPException(status_code=500, detail=f"Failed to update preference: {str(e)}")
 
 @router.get("/jobs", response_model=List[JobService])
@@ -55,33 +62,19 @@ def get_new_job_services(current_user=Depends(get_current_user)):
     Returns services created in the last 7 days.
     """
     try:
+        # Same list for everyone, served from the shared job feed (no query when cached)
+        jobs = job_alert_feed.recent_jobs()
+        if not jobs:
+            return []
+
+        # Only the per-user preference still needs a round trip
         uid = current_user.user.id
-        
-        # First check if user has notifications enabled
         user_res = supabase.table("users").select("job_notifications_enabled").eq("id", uid).single().execute()
         if not user_res.data or not user_res.data.get("job_notifications_enabled", False):
             return []
-        
-        # Find the "Job Applications" category
-        cat_res = supabase.table("categories").select("id").ilike("name", "%job%application%").execute()
-        
-        if not cat_res.data or len(cat_res.data) == 0:
-            # Try alternate names
-            cat_res = supabase.table("categories").select("id").ilike("name", "%job%").execute()
-        
-        if not cat_res.data or len(cat_res.data) == 0:
-            return []
-        
-        category_id = cat_res.data[0]["id"]
-        
-        # Get services from this category created in last 7 days
-        from datetime import datetime, timedelta
-        seven_days_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-        
-        services_res = supabase.table("services").select("id, name, description, price, created_at").eq("category_id", category_id).eq("is_active", True).gte("created_at", seven_days_ago).order("created_at", desc=True).limit(10).execute()
-        
-        return services_res.data if services_res.data else []
-        
+
+        return jobs
+
     except Exception as e:
-        print(f"Error fetching job services: {e}")
+        logger.warning("Error fetching job services", extra={"error": str(e)})
         return []
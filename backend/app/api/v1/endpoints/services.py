@@ -1,38 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Header, Response
+from typing import Optional
 from app.core.security import get_current_admin
 from app.db.supabase import supabase
+from app.db import repository
+from app.db.stats import admin_stats_cache
+from app.db.catalog import service_catalog, etag_matches, CachedBody
+from app.db.job_alerts import job_alert_feed
+from app.core.images import variants_match
 from app.models.service import ServiceCreate, ServiceUpdate
 from app.models.submission import SubmissionCreate
 
 router = APIRouter()
 
+def _catalog_response(cached: CachedBody, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": "public, no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
 @router.get("/")
-def get_services():
-    """Public endpoint to list active services"""
-    response = supabase.table("services").select("*").eq("is_active", True).execute()
-    return response.data
+def get_services(category_id: Optional[int] = None, if_none_match: Optional[str] = Header(None)):
+    """Public endpoint to list active services (served from the catalog cache)"""
+    return _catalog_response(service_catalog.active_services(category_id), if_none_match)
 
 @router.get("/{service_id}")
-def get_service(service_id: int):
-    """Public endpoint to get service details"""
-    response = supabase.table("services").select("*").eq("id", service_id).single().execute()
-    if not response.data:
+def get_service(service_id: int, if_none_match: Optional[str] = Header(None)):
+    """Public endpoint to get service details (served from the catalog cache)"""
+    cached = service_catalog.service(service_id)
+    if not cached:
         raise HTTPException(status_code=404, detail="Service not found")
-    return response.data
+    return _catalog_response(cached, if_none_match)
 
 @router.post("/", dependencies=[Depends(get_current_admin)])
 def create_service(service: ServiceCreate):
     """Admin only: Create new service"""
     # Convert Pydantic to dict, handling fields list -> json
-    data = service.model_dump()
+    data = service.model_dump(exclude={"logo_variants"})
+    if variants_match(data.get("logo_url"), service.logo_variants):
+        data["logo_variants"] = service.logo_variants
     response = supabase.table("services").insert(data).execute()
+    service_catalog.invalidate()
+    admin_stats_cache.mark_stale()
+    job_alert_feed.announce(response.data[0])
     return response.data[0]
 
 @router.put("/{service_id}", dependencies=[Depends(get_current_admin)])
 def update_service(service_id: int, service: ServiceUpdate):
     """Admin only: Update service"""
-    data = service.model_dump()
+    data = service.model_dump(exclude={"logo_variants"})
+    if variants_match(data.get("logo_url"), service.logo_variants):
+        data["logo_variants"] = service.logo_variants
+    else:
+        # A logo changed without a new upload must not keep showing the old variants
+        current = supabase.table("services").select("*").eq("id", service_id).execute().data
+        if current and "logo_variants" in current[0] and current[0].get("logo_url") != data.get("logo_url"):
+            data["logo_variants"] = None
     response = supabase.table("services").update(data).eq("id", service_id).execute()
+    service_catalog.invalidate()
     return response.data
 
 @router.delete("/{service_id}", dependencies=[Depends(get_current_admin)])
@@ -43,6 +67,8 @@ def delete_service(service_id: int):
         supabase.table("submissions").delete().eq("service_id", service_id).execute()
         # Then delete the service
         response = supabase.table("services").delete().eq("id", service_id).execute()
+        service_catalog.invalidate()
+        admin_stats_cache.mark_stale()
         return {"message": "Service and related submissions deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete service: {str(e)}")
@@ -59,25 +85,22 @@ async def apply_for_service(submission: SubmissionCreate, request: Request = Non
 
     try:
         # 2. Call RPC to create submission and deduct wallet
-        response = supabase.rpc('submit_application', {
-            'p_user_id': user_id,
-            'p_service_id': submission.service_id,
-            'p_data': submission.data
-        }).execute()
+        result = await repository.submit_application(user_id, submission.service_id, submission.data)
         
         # 3. Update Submission with IP (Optional, but handy since we have it, keeping consistent with request even if captcha is gone)
         # Actually user asked to remove "captcha regarding code", didn't say remove IP tracking completely.
         # But usually IP tracking was for security alongside captcha.
         # I will keep IP tracking as it is good practice, but remove captcha_verified update.
-        if response.data and response.data.get('success'):
-            submission_id = response.data.get('submission_id')
+        if result and result.get('success'):
+            submission_id = result.get('submission_id')
             client_ip = request.client.host if request else "unknown"
             
-            supabase.table("submissions").update({
+            await repository.update_submission(submission_id, {
                 "submitted_ip": client_ip
-            }).eq("id", submission_id).execute()
+            })
+            admin_stats_cache.mark_stale()
         
-        return response.data
+        return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1,19 +1,23 @@
 from fastapi import APIRouter, HTTPException, Request, Header
-from app.db.supabase import supabase
+from app.db import repository
+from app.db.outbox import webhook_outbox
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.razorpay_gateway import razorpay_gateway, RazorpayBadRequest, RazorpayUnavailable
 from pydantic import BaseModel
 from typing import Optional
-import razorpay
+import logging
 import hmac
 import hashlib
 import json
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# Initialize Razorpay client
-razorpay_client = None
-if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
-    razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+# Razorpay payment ids credited recently by this worker; lets retried webhooks
+# and repeated verify calls skip the database entirely
+recent_payments = TTLCache(maxsize=10000, ttl=3600)
 
 # Plan configuration - maps plan names to amounts
 PLAN_AMOUNTS = {
@@ -39,44 +43,35 @@ def get_balance():
     return {"message": "Balance check should be done via Supabase Client on Frontend for now."}
 
 @router.post("/topup")
-def top_up_wallet(request: TopUpRequest):
+async def top_up_wallet(request: TopUpRequest):
     """Direct top-up endpoint (for testing or manual credits by admin)"""
     try:
-        # Get current user balance
-        user_response = supabase.table("users").select("wallet_balance").eq("id", request.user_id).single().execute()
-        
-        if not user_response.data:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        current_balance = float(user_response.data.get("wallet_balance", 0))
-        new_balance = current_balance + request.amount
-        
-        # Update wallet balance
-        supabase.table("users").update({
-            "wallet_balance": new_balance
-        }).eq("id", request.user_id).execute()
-        
-        # Create transaction record
-        supabase.table("transactions").insert({
-            "user_id": request.user_id,
-            "amount": request.amount,
-            "type": "credit",
-            "description": request.description
-        }).execute()
+        # Increment balance and record the transaction in one atomic call
+        result = await repository.credit_wallet(request.user_id, request.amount, request.description)
         
         return {
             "status": "success",
             "message": "Top-up successful",
-            "new_balance": new_balance
+            "new_balance": result["new_balance"]
         }
+    except repository.UserNotFound:
+        raise HTTPException(status_code=404, detail="User not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/razorpay-webhook")
-async def razorpay_webhook(request: Request, x_razorpay_signature: str = Header(None)):
+async def razorpay_webhook(
+    request: Request,
+    x_razorpay_signature: str = Header(None),
+    x_razorpay_event_id: str = Header(None)
+):
     """
     Webhook endpoint for Razorpay payment notifications.
     Configure this URL in Razorpay Dashboard: Settings -> Webhooks
+
+    The event is only verified and stored in the webhook_events outbox here;
+    the outbox workers credit the wallet, with retries. Razorpay gets its 200
+    as soon as the event is durable.
     """
     try:
         body = await request.body()
@@ -90,50 +85,58 @@ async def razorpay_webhook(request: Request, x_razorpay_signature: str = Header(
                 hashlib.sha256
             ).hexdigest()
             
-            if x_razorpay_signature != expected_signature:
+            if not x_razorpay_signature or not hmac.compare_digest(x_razorpay_signature, expected_signature):
                 raise HTTPException(status_code=400, detail="Invalid webhook signature")
         
         payload = json.loads(body_str)
         event = payload.get("event")
         
-        # Handle payment.captured event
-        if event == "payment.captured":
-            payment = payload.get("payload", {}).get("payment", {}).get("entity", {})
-            
-            payment_id = payment.get("id")
-            amount_paise = payment.get("amount", 0)
-            amount_rupees = amount_paise / 100  # Razorpay sends amounts in paise
-            email = payment.get("email", "")
-            notes = payment.get("notes", {})
-            
-            # Get user ID from notes or find by email
-            user_id = notes.get("user_id")
-            plan_name = notes.get("plan_name", "Top-up")
-            
-            if not user_id and email:
-                # Try to find user by email
-                user_response = supabase.table("users").select("id").eq("email", email).single().execute()
-                if user_response.data:
-                    user_id = user_response.data.get("id")
-            
-            if user_id:
-                # Check if this payment was already processed
-                existing = supabase.table("transactions").select("id").eq("description", f"Razorpay Payment: {payment_id}").execute()
-                
-                if not existing.data:
-                    # Credit the wallet
-                    await credit_wallet(user_id, amount_rupees, f"Razorpay Payment: {payment_id}", plan_name)
-                    
-            return {"status": "ok", "message": "Webhook processed"}
+        # Razorpay resends the same X-Razorpay-Event-Id on retries; fall back to the body hash
+        event_id = x_razorpay_event_id or hashlib.sha256(body).hexdigest()
+        queued = await repository.enqueue_webhook_event("razorpay", event_id, event, payload)
+        if queued:
+            webhook_outbox.notify()
         
         return {"status": "ok", "message": f"Event {event} received"}
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
     except Exception as e:
-        print(f"Webhook error: {str(e)}")
+        logger.exception("Webhook error")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def process_payment_captured(payload: dict):
+    """Outbox handler for payment.captured: credit the payer's wallet once per payment."""
+    payment = payload.get("payload", {}).get("payment", {}).get("entity", {})
+    
+    payment_id = payment.get("id")
+    amount_paise = payment.get("amount", 0)
+    amount_rupees = amount_paise / 100  # Razorpay sends amounts in paise
+    email = payment.get("email", "")
+    notes = payment.get("notes", {})
+    
+    # Get user ID from notes or find by email
+    user_id = notes.get("user_id")
+    plan_name = notes.get("plan_name", "Top-up")
+    
+    if not user_id and email:
+        # Try to find user by email
+        user_id = await repository.find_user_id_by_email(email)
+    
+    if not user_id:
+        logger.warning("Webhook payment has no matching user, skipped", extra={"payment_id": payment_id})
+        return
+    
+    # Skip payments this worker has just credited; the unique payment_reference
+    # makes the credit itself idempotent either way
+    if not recent_payments.get(payment_id):
+        # Credit the wallet
+        await credit_wallet(user_id, amount_rupees, f"Razorpay Payment: {payment_id}", plan_name, payment_reference=payment_id)
+
+webhook_outbox.add_handler("payment.captured", process_payment_captured)
+
 @router.post("/verify-payment")
 async def verify_payment(request: VerifyPaymentRequest):
     """
@@ -141,11 +144,11 @@ async def verify_payment(request: VerifyPaymentRequest):
     Called by frontend after user returns from payment page.
     """
     try:
-        if not razorpay_client:
+        if not razorpay_gateway.configured:
             raise HTTPException(status_code=500, detail="Razorpay not configured")
         
-        # Fetch payment details from Razorpay
-        payment = razorpay_client.payment.fetch(request.razorpay_payment_id)
+        # Fetch payment details from Razorpay (off the event loop; memoized once captured)
+        payment = await razorpay_gateway.fetch_payment(request.razorpay_payment_id)
         
         if payment.get("status") != "captured":
             return {
@@ -161,68 +164,65 @@ async def verify_payment(request: VerifyPaymentRequest):
         if expected_amount > 0 and abs(amount_rupees - expected_amount) > 1:  # Allow 1 rupee tolerance
             raise HTTPException(status_code=400, detail="Payment amount mismatch")
         
-        # Check if this payment was already processed
-        existing = supabase.table("transactions").select("id").eq(
-            "description", f"Razorpay Payment: {request.razorpay_payment_id}"
-        ).execute()
-        
-        if existing.data:
-            # Already processed - return current balance
-            user_data = supabase.table("users").select("wallet_balance").eq("id", request.user_id).single().execute()
+        # Check if this payment was already processed (recently, by this worker)
+        if recent_payments.get(request.razorpay_payment_id):
+            balance = await repository.get_wallet_balance(request.user_id)
             return {
                 "status": "already_processed",
                 "message": "Payment already credited",
-                "new_balance": float(user_data.data.get("wallet_balance", 0)) if user_data.data else 0
+                "new_balance": balance or 0
             }
         
-        # Credit the wallet
-        new_balance = await credit_wallet(
+        # Credit the wallet (no-op if the payment reference was already credited)
+        result = await credit_wallet(
             request.user_id, 
             amount_rupees, 
             f"Razorpay Payment: {request.razorpay_payment_id}",
-            request.plan_name
+            request.plan_name,
+            payment_reference=request.razorpay_payment_id
         )
         
+        if result["duplicate"]:
+            # Already processed - return current balance
+            return {
+                "status": "already_processed",
+                "message": "Payment already credited",
+                "new_balance": result["new_balance"]
+            }
+        
         return {
             "status": "success",
             "message": "Payment verified and wallet credited",
             "amount": amount_rupees,
-            "new_balance": new_balance
+            "new_balance": result["new_balance"]
         }
         
-    except razorpay.errors.BadRequestError as e:
+    except HTTPException:
+        raise
+    except RazorpayBadRequest as e:
         raise HTTPException(status_code=400, detail=f"Invalid payment ID: {str(e)}")
+    except RazorpayUnavailable as e:
+        logger.warning("Payment verification unavailable", extra={"error": str(e)})
+        raise HTTPException(status_code=503, detail="Payment provider unavailable, please retry shortly")
     except Exception as e:
-        print(f"Payment verification error: {str(e)}")
+        logger.exception("Payment verification error")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def credit_wallet(user_id: str, amount: float, description: str, plan_name: str = "Top-up") -> float:
+async def credit_wallet(user_id: str, amount: float, description: str, plan_name: str = "Top-up", payment_reference: Optional[str] = None) -> dict:
     """
     Helper function to credit user's wallet and create transaction record.
-    Returns the new balance.
+    A payment_reference is credited at most once (unique index on transactions.payment_reference).
+    Returns {"new_balance": float, "duplicate": bool}.
     """
-    # Get current balance
-    user_response = supabase.table("users").select("wallet_balance").eq("id", user_id).single().execute()
-    
-    if not user_response.data:
-        raise Exception(f"User {user_id} not found")
-    
-    current_balance = float(user_response.data.get("wallet_balance", 0))
-    new_balance = current_balance + amount
-    
-    # Update wallet balance
-    supabase.table("users").update({
-        "wallet_balance": new_balance
-    }).eq("id", user_id).execute()
-    
-    # Create transaction record
-    supabase.table("transactions").insert({
-        "user_id": user_id,
-        "amount": amount,
-        "type": "credit",
-        "description": f"{plan_name} Plan - {description}"
-    }).execute()
+    result = await repository.credit_wallet(
+        user_id, amount, f"{plan_name} Plan - {description}", payment_reference=payment_reference
+    )
+    if payment_reference:
+        recent_payments.set(payment_reference, True)
     
-    print(f"Credited {amount} to user {user_id}. New balance: {new_balance}")
+    if result["duplicate"]:
+        logger.info("Payment already credited", extra={"payment_reference": payment_reference, "user_id": user_id})
+    else:
+        logger.info("Wallet credited", extra={"user_id": user_id, "amount": amount, "new_balance": result["new_balance"]})
     
-    return new_balance
+    return result
@@ -10,10 +10,122 @@ class Settings:
     
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+
+    # Pooled HTTP client used by the async Supabase client (per worker)
+    SUPABASE_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "50"))
+    SUPABASE_MAX_KEEPALIVE: int = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+    SUPABASE_KEEPALIVE_EXPIRY: float = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+    SUPABASE_TIMEOUT: float = float(os.getenv("SUPABASE_TIMEOUT", "15"))
+    SUPABASE_CONNECT_TIMEOUT: float = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+
+    # Auth Verification
+    # "local" checks the JWT signature with the cached secret/JWKS and only calls
+    # Supabase Auth when the signing key is unknown; "remote" always calls Supabase Auth.
+    AUTH_VERIFY_MODE: str = os.getenv("AUTH_VERIFY_MODE", "local")
+    AUTH_TOKEN_CACHE_TTL: float = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_JWKS_TTL: float = float(os.getenv("AUTH_JWKS_TTL", "600"))
+
+    # Admin role lookups (public.users.role) cached per worker. Roles are only changed
+    # outside the API (promote_admin.py, SQL editor), so a promotion or demotion takes
+    # effect on running workers after up to ROLE_CACHE_TTL seconds.
+    ROLE_CACHE_TTL: float = float(os.getenv("ROLE_CACHE_TTL", "30"))
+    ROLE_CACHE_SIZE: int = int(os.getenv("ROLE_CACHE_SIZE", "1024"))
+
+    # Admin dashboard stats are served from memory and refreshed in the background
+    ADMIN_STATS_TTL: float = float(os.getenv("ADMIN_STATS_TTL", "30"))
+
+    # /admin/applications pagination
+    ADMIN_PAGE_SIZE: int = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
+    ADMIN_PAGE_SIZE_MAX: int = int(os.getenv("ADMIN_PAGE_SIZE_MAX", "200"))
+    ADMIN_EXPORT_BATCH_SIZE: int = int(os.getenv("ADMIN_EXPORT_BATCH_SIZE", "500"))
+
+    # Login history is buffered and bulk-inserted: flush at BATCH_SIZE rows or after
+    # FLUSH_INTERVAL seconds; logins wait (back-pressure) once MAX_PENDING rows are buffered
+    LOGIN_HISTORY_BATCH_SIZE: int = int(os.getenv("LOGIN_HISTORY_BATCH_SIZE", "500"))
+    LOGIN_HISTORY_FLUSH_INTERVAL: float = float(os.getenv("LOGIN_HISTORY_FLUSH_INTERVAL", "1"))
+    LOGIN_HISTORY_MAX_PENDING: int = int(os.getenv("LOGIN_HISTORY_MAX_PENDING", "10000"))
+
+    # Upload limits (bytes); larger multipart bodies are rejected while still arriving
+    UPLOAD_LOGO_MAX_BYTES: int = int(os.getenv("UPLOAD_LOGO_MAX_BYTES", str(5 * 1024 * 1024)))
+    UPLOAD_DOCUMENT_MAX_BYTES: int = int(os.getenv("UPLOAD_DOCUMENT_MAX_BYTES", str(25 * 1024 * 1024)))
+
+    # Logo variants (thumbnail/card, WebP) are rendered in a process pool of this size
+    LOGO_PROCESS_WORKERS: int = int(os.getenv("LOGO_PROCESS_WORKERS", "2"))
+
+    # Signed download URLs for the private final-documents bucket; cached until
+    # SIGNED_URL_REFRESH_MARGIN seconds before they expire
+    SIGNED_URL_EXPIRES_IN: int = int(os.getenv("SIGNED_URL_EXPIRES_IN", "3600"))
+    SIGNED_URL_REFRESH_MARGIN: int = int(os.getenv("SIGNED_URL_REFRESH_MARGIN", "300"))
+    SIGNED_URL_CACHE_SIZE: int = int(os.getenv("SIGNED_URL_CACHE_SIZE", "5000"))
+
+    # Public service catalog cache (invalidated by the admin service endpoints)
+    CATALOG_TTL: float = float(os.getenv("CATALOG_TTL", "300"))
+    # /notifications/jobs: cached "Job Applications" category id (re-checked sooner
+    # while no such category exists) and the shared 7-day list built from the catalog
+    JOB_CATEGORY_TTL: float = float(os.getenv("JOB_CATEGORY_TTL", "3600"))
+    JOB_CATEGORY_MISSING_TTL: float = float(os.getenv("JOB_CATEGORY_MISSING_TTL", "60"))
+    JOB_ALERTS_TTL: float = float(os.getenv("JOB_ALERTS_TTL", "60"))
     
+    # Server push (/events/stream). PUSH_BROKER=realtime fans events out to every
+    # worker over a Supabase Realtime broadcast channel; "local" stays in-process.
+    PUSH_BROKER: str = os.getenv("PUSH_BROKER", "local")
+    PUSH_CHANNEL: str = os.getenv("PUSH_CHANNEL", "dsk-push")
+    PUSH_QUEUE_SIZE: int = int(os.getenv("PUSH_QUEUE_SIZE", "100"))
+    PUSH_HEARTBEAT: float = float(os.getenv("PUSH_HEARTBEAT", "15"))
+    # Streams are ended after this long and the browser reconnects, so deploys
+    # don't wait on them and connections rebalance across workers
+    PUSH_STREAM_MAX_AGE: float = float(os.getenv("PUSH_STREAM_MAX_AGE", "600"))
+
+    # Logging and metrics. JSON logs; LOG_SAMPLE_RATE of the per-request access
+    # log lines are kept, plus every request slower than LOG_SLOW_REQUEST_MS or
+    # failing with a 5xx. /metrics needs "Authorization: Bearer <METRICS_TOKEN>"; without a
+    # token it answers 404, unless METRICS_PUBLIC=true (local use only).
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+    LOG_SLOW_REQUEST_MS: float = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    METRICS_PUBLIC: bool = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+
+    # Chat Assistant (OpenAI-compatible endpoint)
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "60"))
+    # How long the platform_knowledge tool may serve its catalog snapshot
+    KNOWLEDGE_TTL: float = float(os.getenv("KNOWLEDGE_TTL", "300"))
+    # Cached answers for repeated questions (same normalized text). CHAT_CACHE_SIMILARITY > 0
+    # also reuses answers for near-identical wording with the same content words; off by default
+    CHAT_CACHE_SIZE: int = int(os.getenv("CHAT_CACHE_SIZE", "512"))
+    CHAT_CACHE_TTL: float = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+    CHAT_CACHE_SIMILARITY: float = float(os.getenv("CHAT_CACHE_SIMILARITY", "0"))
+
     # Razorpay Configuration
     RAZORPAY_KEY_ID: str = os.getenv("RAZORPAY_KEY_ID", "")
     RAZORPAY_KEY_SECRET: str = os.getenv("RAZORPAY_KEY_SECRET", "")
     RAZORPAY_WEBHOOK_SECRET: str = os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
+    # Empty means the SDK default (https://api.razorpay.com); set to point at a mock server
+    RAZORPAY_BASE_URL: str = os.getenv("RAZORPAY_BASE_URL", "")
+    RAZORPAY_TIMEOUT: float = float(os.getenv("RAZORPAY_TIMEOUT", "10"))
+    RAZORPAY_CONNECT_TIMEOUT: float = float(os.getenv("RAZORPAY_CONNECT_TIMEOUT", "3"))
+    # Threads (and pooled connections) available for Razorpay API calls, per worker
+    RAZORPAY_MAX_CONCURRENCY: int = int(os.getenv("RAZORPAY_MAX_CONCURRENCY", "10"))
+    # Consecutive failures that open the circuit, and how long it stays open
+    RAZORPAY_BREAKER_FAILURES: int = int(os.getenv("RAZORPAY_BREAKER_FAILURES", "5"))
+    RAZORPAY_BREAKER_RESET: float = float(os.getenv("RAZORPAY_BREAKER_RESET", "30"))
+    # Captured payments are immutable, so they can be memoized for a long time
+    RAZORPAY_PAYMENT_CACHE_SIZE: int = int(os.getenv("RAZORPAY_PAYMENT_CACHE_SIZE", "10000"))
+    RAZORPAY_PAYMENT_CACHE_TTL: float = float(os.getenv("RAZORPAY_PAYMENT_CACHE_TTL", "86400"))
+
+    # Webhook outbox workers (per backend worker process)
+    WEBHOOK_WORKERS: int = int(os.getenv("WEBHOOK_WORKERS", "4"))
+    WEBHOOK_BATCH_SIZE: int = int(os.getenv("WEBHOOK_BATCH_SIZE", "10"))
+    WEBHOOK_POLL_INTERVAL: float = float(os.getenv("WEBHOOK_POLL_INTERVAL", "5"))
+    WEBHOOK_LEASE_SECONDS: int = int(os.getenv("WEBHOOK_LEASE_SECONDS", "60"))
+    # Failed events are retried with exponential backoff, then dead-lettered
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+    WEBHOOK_RETRY_BASE: float = float(os.getenv("WEBHOOK_RETRY_BASE", "5"))
+    WEBHOOK_RETRY_MAX: float = float(os.getenv("WEBHOOK_RETRY_MAX", "3600"))
 
 settings = Settings()
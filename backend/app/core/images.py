@@ -0,0 +1,106 @@
+"""
+Logo variants for the public catalog.
+
+Decoding and resizing are CPU-bound, so they run in a small process pool
+(LOGO_PROCESS_WORKERS) rather than on the event loop or in threads that
+would still hold the GIL.
+"""
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# name -> longest edge in px
+LOGO_SIZES = {"thumb_64": 64, "card_256": 256}
+MAX_PIXELS = 40_000_000
+
+class InvalidImage(ValueError):
+    pass
+
+def make_logo_variants(data: bytes) -> Dict[str, Tuple[bytes, str, str]]:
+    """
+    Returns {variant name: (bytes, content type, extension)} for every size in
+    LOGO_SIZES, once as WebP ("<name>_webp") and once as PNG/JPEG ("<name>")
+    for clients without WebP. Images are shrunk to fit, never enlarged.
+    Runs in a worker process, so it must stay a picklable module-level function.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.width * image.height > MAX_PIXELS:
+            raise InvalidImage("Image dimensions too large")
+        image.seek(0)  # first frame of animated GIF/WebP
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except InvalidImage:
+        raise
+    except Exception as e:
+        raise InvalidImage(f"Could not decode image: {e}")
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for name, edge in LOGO_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+
+        out = io.BytesIO()
+        resized.save(out, "WEBP", quality=82, method=6)
+        variants[f"{name}_webp"] = (out.getvalue(), "image/webp", "webp")
+
+        out = io.BytesIO()
+        if has_alpha:
+            resized.save(out, "PNG", optimize=True)
+            variants[name] = (out.getvalue(), "image/png", "png")
+        else:
+            resized.save(out, "JPEG", quality=85, optimize=True, progressive=True)
+            variants[name] = (out.getvalue(), "image/jpeg", "jpg")
+    return variants
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def variants_match(logo_url: Optional[str], variants: Optional[Dict[str, str]]) -> bool:
+    """
+    True if `variants` were made from `logo_url` by the same /admin/upload-logo
+    call: the original is stored as "<stamp>_<file name>" and its variants
+    under "variants/<stamp>/".
+    """
+    if not logo_url or not variants:
+        return False
+    file_name = logo_url.split("?")[0].rsplit("/", 1)[-1]
+    for url in variants.values():
+        marker = url.find("/variants/")
+        if marker < 0:
+            return False
+        stamp = url[marker + len("/variants/"):].split("/", 1)[0]
+        if not file_name.startswith(stamp + "_"):
+            return False
+    return True
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Not fork: a uvicorn worker already runs threads (logging, thread pools), and a
+        # forked child can deadlock on a lock one of them held. forkserver forks from
+        # a clean single-threaded server instead; spawn where that isn't available.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.LOGO_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _pool
+
+async def build_logo_variants(data: bytes) -> Dict[str, Tuple[bytes, str, str]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), make_logo_variants, data)
+
+def shutdown_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
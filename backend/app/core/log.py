@@ -0,0 +1,78 @@
+"""
+Structured, non-blocking logging.
+
+Records are formatted as one JSON object per line and written by a background
+thread (QueueHandler -> QueueListener), so a log call on the request path only
+enqueues. Hot-path events (the per-request access log) go through
+`sampled()`, which keeps LOG_SAMPLE_RATE of them plus every slow or failed one.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed via `extra=` and is logged as a field
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging():
+    """Send the app's loggers through a queue to a JSON stdout handler (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.propagate = False
+
+def shutdown_logging():
+    """Flush queued records (the listener drains the queue before stopping)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def sampled(slow: bool = False, failed: bool = False) -> bool:
+    """Whether to log a hot-path event: always when slow or failed, else LOG_SAMPLE_RATE of the time."""
+    return slow or failed or random.random() < settings.LOG_SAMPLE_RATE
+
+access_logger = logging.getLogger("app.access")
+
+def log_request(entry: dict):
+    """MetricsMiddleware callback: a sampled access log line."""
+    slow = entry["duration_ms"] >= settings.LOG_SLOW_REQUEST_MS
+    failed = entry["status"] >= 500
+    if sampled(slow=slow, failed=failed):
+        level = logging.WARNING if failed or slow else logging.INFO
+        access_logger.log(level, "request", extra=entry)
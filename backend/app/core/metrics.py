@@ -0,0 +1,346 @@
+"""
+In-process request and upstream metrics, exposed in the Prometheus text format
+at /metrics (see app.main).
+
+- MetricsMiddleware times every request by route template, and records request
+  and response body sizes.
+- InstrumentedTransport / InstrumentedAsyncTransport wrap the httpx transports
+  of the Supabase clients (PostgREST, Storage, Auth) and the OpenAI client, and
+  record each upstream call's latency, outcome and payload sizes.
+- The Razorpay gateway records its SDK calls with observe_upstream().
+
+Each worker keeps its own numbers, like the caches.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_float(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(tuple(str(v) for v in labelvalues), 0.0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_format_float(value)}")
+        return "\n".join(lines)
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        key = tuple(str(v) for v in labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            series = self._series.get(tuple(str(v) for v in labelvalues))
+            return series[2] if series else 0
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_float(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format_float(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return "\n".join(lines)
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled, by route template and status.", ("method", "route", "status")))
+http_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to handle a request, until the response is complete.", ("method", "route")))
+http_request_size = registry.register(Histogram(
+    "http_request_size_bytes", "Request body size.", ("method", "route"), SIZE_BUCKETS))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size.", ("method", "route"), SIZE_BUCKETS))
+
+upstream_requests = registry.register(Counter(
+    "upstream_requests_total", "Calls to upstream services, by outcome (HTTP status class or 'error').",
+    ("upstream", "operation", "outcome")))
+upstream_duration = registry.register(Histogram(
+    "upstream_request_duration_seconds", "Upstream call time, until the response body is read.", ("upstream", "operation")))
+upstream_request_size = registry.register(Histogram(
+    "upstream_request_size_bytes", "Bytes sent to upstream services.", ("upstream", "operation"), SIZE_BUCKETS))
+upstream_response_size = registry.register(Histogram(
+    "upstream_response_size_bytes", "Bytes received from upstream services.", ("upstream", "operation"), SIZE_BUCKETS))
+
+def observe_upstream(upstream: str, operation: str, seconds: float, outcome: str,
+                     sent: Optional[int] = None, received: Optional[int] = None):
+    upstream_requests.inc(upstream, operation, outcome)
+    upstream_duration.observe(seconds, upstream, operation)
+    if sent is not None:
+        upstream_request_size.observe(sent, upstream, operation)
+    if received is not None:
+        upstream_response_size.observe(received, upstream, operation)
+
+def _status_class(status: int) -> str:
+    return f"{status // 100}xx"
+
+# --- Upstream HTTP calls (httpx) ---
+
+def classify_supabase(request: httpx.Request) -> Tuple[str, str]:
+    """Map a Supabase URL to (upstream, operation) with bounded cardinality."""
+    segments = [s for s in request.url.path.split("/") if s]
+    if len(segments) >= 2 and segments[1] == "v1":
+        service, rest = segments[0], segments[2:]
+        if service == "rest":
+            if rest[:1] == ["rpc"] and len(rest) > 1:
+                return "postgrest", f"rpc/{rest[1]}"
+            return "postgrest", rest[0] if rest else "root"
+        if service == "storage":
+            # object/sign, object/public, ...; object/<bucket>/<path> -> object/data
+            if len(rest) >= 2 and rest[0] == "object":
+                kind = rest[1] if rest[1] in ("sign", "public", "authenticated", "list", "move", "copy", "info") else "data"
+                return "storage", f"object/{kind}"
+            return "storage", rest[0] if rest else "root"
+        if service == "auth":
+            return "auth", "/".join(rest[:2]) if rest[:1] == ["admin"] else (rest[0] if rest else "root")
+        return service, rest[0] if rest else "root"
+    return "supabase", segments[0] if segments else "root"
+
+def classify_openai(request: httpx.Request) -> Tuple[str, str]:
+    path = request.url.path
+    for operation in ("chat/completions", "completions", "embeddings", "responses"):
+        if path.endswith("/" + operation):
+            return "openai", operation
+    return "openai", "other"
+
+def _request_size(request: httpx.Request) -> Optional[int]:
+    length = request.headers.get("content-length")
+    return int(length) if length and length.isdigit() else None
+
+class _CountingStream(httpx.SyncByteStream):
+    def __init__(self, stream, done: Callable[[int], None]):
+        self._stream = stream
+        self._done = done
+        self._received = 0
+        self._closed = False
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._received += len(chunk)
+            yield chunk
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                self._stream.close()
+            finally:
+                self._done(self._received)
+
+class _AsyncCountingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, done: Callable[[int], None]):
+        self._stream = stream
+        self._done = done
+        self._received = 0
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._received += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                await self._stream.aclose()
+            finally:
+                self._done(self._received)
+
+def _recorder(upstream: str, operation: str, start: float, status: int, sent: Optional[int]):
+    def done(received: int):
+        observe_upstream(upstream, operation, time.perf_counter() - start, _status_class(status), sent, received)
+    return done
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """Records every request made through the wrapped (sync) httpx transport."""
+
+    def __init__(self, transport: httpx.BaseTransport, classify: Callable[[httpx.Request], Tuple[str, str]]):
+        self._transport = transport
+        self._classify = classify
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        upstream, operation = self._classify(request)
+        operation = f"{request.method} {operation}"
+        sent = _request_size(request)
+        start = time.perf_counter()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception:
+            observe_upstream(upstream, operation, time.perf_counter() - start, "error", sent)
+            raise
+        done = _recorder(upstream, operation, start, response.status_code, sent)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_CountingStream(response.stream, done),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self._transport.close()
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    """Records every request made through the wrapped async httpx transport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, classify: Callable[[httpx.Request], Tuple[str, str]]):
+        self._transport = transport
+        self._classify = classify
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream, operation = self._classify(request)
+        operation = f"{request.method} {operation}"
+        sent = _request_size(request)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            observe_upstream(upstream, operation, time.perf_counter() - start, "error", sent)
+            raise
+        done = _recorder(upstream, operation, start, response.status_code, sent)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_AsyncCountingStream(response.stream, done),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+# --- Incoming requests ---
+
+def route_template(scope) -> str:
+    """The matched route's path template, so /applications/12 and /applications/13 share a series."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # Routes from included routers only know their own part of the path; take
+    # the prefix from the request path (route params never span segments here)
+    path_segments = [s for s in scope.get("path", "").split("/") if s]
+    template_segments = [s for s in template.split("/") if s]
+    prefix = path_segments[: len(path_segments) - len(template_segments)]
+    return ("/" + "/".join(prefix) if prefix else "") + template
+
+class MetricsMiddleware:
+    """Times each HTTP request and records its sizes and status, labelled by route template."""
+
+    def __init__(self, app, on_complete: Optional[Callable[[dict], None]] = None):
+        self.app = app
+        self.on_complete = on_complete
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        start = time.perf_counter()
+        received = 0
+        sent = 0
+        status = 500
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            seconds = time.perf_counter() - start
+            route = route_template(scope)
+            http_requests.inc(method, route, str(status))
+            http_duration.observe(seconds, method, route)
+            http_request_size.observe(received, method, route)
+            http_response_size.observe(sent, method, route)
+            if self.on_complete is not None:
+                self.on_complete({
+                    "method": method,
+                    "route": route,
+                    "path": scope.get("path"),
+                    "status": status,
+                    "duration_ms": round(seconds * 1000, 2),
+                    "request_bytes": received,
+                    "response_bytes": sent,
+                })
@@ -0,0 +1,257 @@
+"""
+Server push for the dashboard (job notifications, new job services and
+application status changes), delivered over Server-Sent Events.
+
+Every worker runs one PushHub holding its open streams, indexed by user. An
+event published on any worker is delivered to the local streams right away and
+handed to the broker, which fans it out to the hubs of the other workers:
+
+- LocalBroker: in-process pub/sub. Enough for a single worker, and the stand-in
+  used by the benchmarks (several hubs on one broker behave like several workers).
+- RealtimeBroker: a Supabase Realtime broadcast channel shared by all workers.
+
+Idle streams cost no database queries; only publishing does work.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Delivered only to streams whose user has job notifications enabled
+AUDIENCE_JOB_ALERTS = "job_alerts"
+
+class Subscription:
+    """One open event stream. Events are buffered in a bounded queue; a stream
+    that falls `queue_size` events behind is closed and the client reconnects."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, user_id: str, job_alerts: bool, queue_size: int):
+        self.id = next(self._ids)
+        self.user_id = user_id
+        self.job_alerts = job_alerts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def offer(self, message: dict) -> bool:
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Wake the reader; the sentinel may replace a queued event, the stream is ending anyway
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                return
+            except asyncio.QueueFull:
+                self.queue.get_nowait()
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """The next event, or None on timeout (time for a heartbeat). Raises EOFError once closed."""
+        try:
+            if not self.queue.empty():
+                message = self.queue.get_nowait()
+            else:
+                message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            if self.closed:
+                raise EOFError
+            return None
+        if message is None:
+            raise EOFError
+        return message
+
+class LocalBroker:
+    """In-process pub/sub between the hubs attached to it."""
+
+    def __init__(self):
+        self._hubs: List["PushHub"] = []
+
+    async def start(self, hub: "PushHub"):
+        self._hubs.append(hub)
+
+    async def publish(self, origin: "PushHub", message: dict):
+        for hub in list(self._hubs):
+            if hub is not origin:
+                hub.deliver_threadsafe(message)
+
+    async def stop(self, hub: "PushHub"):
+        if hub in self._hubs:
+            self._hubs.remove(hub)
+
+class RealtimeBroker:
+    """Fans events out to every worker over a Supabase Realtime broadcast channel."""
+
+    EVENT = "push"
+
+    def __init__(self, topic: str):
+        self.topic = topic
+        self._client = None
+        self._channel = None
+
+    async def start(self, hub: "PushHub"):
+        from realtime import AsyncRealtimeClient
+
+        url = settings.SUPABASE_URL.rstrip("/") + "/realtime/v1"
+        self._client = AsyncRealtimeClient(url, token=settings.SUPABASE_SERVICE_ROLE_KEY, auto_reconnect=True)
+        await self._client.connect()
+        # "self": False - the publishing worker has already delivered locally
+        self._channel = self._client.channel(self.topic, {"config": {"broadcast": {"self": False, "ack": False}}})
+        self._channel.on_broadcast(self.EVENT, lambda payload: hub.deliver(payload.get("payload") or {}))
+        await self._channel.subscribe()
+
+    async def publish(self, origin: "PushHub", message: dict):
+        if self._channel is not None:
+            await self._channel.send_broadcast(self.EVENT, message)
+
+    async def stop(self, hub: "PushHub"):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._channel = None
+
+class PushHub:
+    """Per-worker fan-out of push events to the open streams of this worker."""
+
+    def __init__(self, broker, queue_size: int):
+        self.broker = broker
+        self.queue_size = queue_size
+        self._by_user: Dict[str, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self.broker.start(self)
+        except Exception as e:
+            # Streams keep working for events published on this worker
+            logger.warning("Push broker unavailable, delivering locally only", extra={"error": str(e)})
+
+    async def stop(self):
+        for subscriptions in list(self._by_user.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        self._by_user.clear()
+        try:
+            await self.broker.stop(self)
+        except Exception as e:
+            logger.warning("Error stopping push broker", extra={"error": str(e)})
+        self._loop = None
+
+    def subscribe(self, user_id: str, job_alerts: bool) -> Subscription:
+        subscription = Subscription(str(user_id), job_alerts, self.queue_size)
+        with self._lock:
+            self._by_user.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            subscriptions = self._by_user.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._by_user[subscription.user_id]
+
+    def publish(self, event: str, data: Any, user_id: Optional[str] = None, audience: Optional[str] = None):
+        """
+        Send an event to one user's streams (user_id), to opted-in users
+        (audience=AUDIENCE_JOB_ALERTS) or to everyone. Safe to call from sync
+        endpoints running in the threadpool; a no-op while the hub is stopped.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        message = {"event": event, "data": data, "user_id": str(user_id) if user_id is not None else None, "audience": audience}
+        self.published += 1
+        self.deliver_threadsafe(message)
+        asyncio.run_coroutine_threadsafe(self._broadcast(message), loop)
+
+    async def _broadcast(self, message: dict):
+        try:
+            await self.broker.publish(self, message)
+        except Exception as e:
+            logger.warning("Push broker publish failed", extra={"error": str(e)})
+
+    def deliver_threadsafe(self, message: dict):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.deliver(message)
+        else:
+            loop.call_soon_threadsafe(self.deliver, message)
+
+    def deliver(self, message: dict):
+        """Hand an event to the matching streams of this worker (event loop only)."""
+        user_id = message.get("user_id")
+        with self._lock:
+            if user_id is not None:
+                targets = list(self._by_user.get(user_id, ()))
+            else:
+                targets = [s for subscriptions in self._by_user.values() for s in subscriptions]
+
+        # Preference changes also update the stream's own filter
+        if message.get("event") == "preference" and user_id is not None:
+            for subscription in targets:
+                subscription.job_alerts = bool((message.get("data") or {}).get("enabled"))
+
+        if message.get("audience") == AUDIENCE_JOB_ALERTS:
+            targets = [s for s in targets if s.job_alerts]
+
+        for subscription in targets:
+            if subscription.offer(message):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            streams = sum(len(subscriptions) for subscriptions in self._by_user.values())
+            users = len(self._by_user)
+        return {
+            "streams": streams,
+            "users": users,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":"), default=str))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+def _make_broker():
+    if settings.PUSH_BROKER == "realtime":
+        return RealtimeBroker(settings.PUSH_CHANNEL)
+    return LocalBroker()
+
+push_hub = PushHub(_make_broker(), queue_size=settings.PUSH_QUEUE_SIZE)
@@ -0,0 +1,183 @@
+"""
+Razorpay API access for the async endpoints.
+
+The SDK is synchronous (requests), so calls run on a small dedicated thread
+pool instead of the event loop, over one pooled keep-alive session with a
+timeout. A circuit breaker makes calls fail fast while Razorpay is down, and
+captured payments are memoized, since a captured payment never changes.
+
+The SDK (and requests) is imported on first use, not at startup, so workers
+that never touch a payment don't pay for it in boot time.
+"""
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Optional
+from urllib.parse import urlparse
+
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.core.config import settings
+from app.core.metrics import observe_upstream
+
+if TYPE_CHECKING:
+    import razorpay
+    import requests
+
+# Razorpay ids look like pay_XXXX / order_XXXX
+_ID_SEGMENT = re.compile(r"^[a-z]+_[A-Za-z0-9]+$")
+
+def _operation(request: "requests.PreparedRequest") -> str:
+    path = urlparse(request.url).path
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/") if s and s != "v1"]
+    return f"{request.method} {'/'.join(segments) or 'root'}"
+
+def _record_response(response: "requests.Response", *args, **kwargs):
+    # Session hook: runs for every response, after the body has been read
+    body = response.request.body
+    observe_upstream(
+        "razorpay",
+        _operation(response.request),
+        response.elapsed.total_seconds(),
+        f"{response.status_code // 100}xx",
+        sent=len(body) if body else 0,
+        received=len(response.content),
+    )
+
+class RazorpayUnavailable(Exception):
+    """Razorpay timed out, failed, or its circuit is open; the caller may retry later."""
+
+class RazorpayBadRequest(Exception):
+    """Razorpay rejected the request (e.g. an unknown payment id)."""
+
+class RazorpayGateway:
+    def __init__(
+        self,
+        key_id: str,
+        key_secret: str,
+        base_url: str,
+        timeout: float,
+        connect_timeout: float,
+        max_concurrency: int,
+        breaker: CircuitBreaker,
+        payment_cache: TTLCache,
+    ):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.base_url = base_url
+        self.timeout = (connect_timeout, timeout)
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self.payment_cache = payment_cache
+        self._client: Optional["razorpay.Client"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.key_id and self.key_secret)
+
+    @property
+    def client(self) -> "razorpay.Client":
+        if self._client is None:
+            import razorpay
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.hooks["response"].append(_record_response)
+            options = {"base_url": self.base_url} if self.base_url else {}
+            self._client = razorpay.Client(session=session, auth=(self.key_id, self.key_secret), **options)
+        return self._client
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="razorpay")
+        return self._executor
+
+    async def _call(self, fn, *args, **kwargs):
+        """Run a blocking SDK call off the event loop, through the circuit breaker."""
+        # Already loaded by self.client, which produced fn
+        import razorpay
+        import requests
+
+        try:
+            self.breaker.before_call()
+        except CircuitOpen as e:
+            raise RazorpayUnavailable(str(e))
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), partial(fn, *args, timeout=self.timeout, **kwargs))
+        except razorpay.errors.BadRequestError as e:
+            # The request was wrong, not Razorpay: don't count it against the circuit
+            self.breaker.record_success()
+            raise RazorpayBadRequest(str(e)) from e
+        except (requests.exceptions.RequestException, razorpay.errors.ServerError, razorpay.errors.GatewayError) as e:
+            self.breaker.record_failure()
+            if isinstance(e, requests.exceptions.RequestException):
+                # No response, so the session hook never saw it
+                observe_upstream("razorpay", getattr(fn, "__qualname__", "call"), time.perf_counter() - start, "error")
+            raise RazorpayUnavailable(f"Razorpay request failed: {e}")
+        except BaseException:
+            # Cancelled or an unexpected error: no verdict on Razorpay, but a
+            # half-open circuit must not wait forever for this trial
+            self.breaker.release_trial()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def fetch_payment(self, payment_id: str) -> dict:
+        cached = self.payment_cache.get(payment_id)
+        if cached is not None:
+            return cached
+
+        # Concurrent lookups of the same payment share one request
+        pending = self._inflight.get(payment_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[payment_id] = future
+        try:
+            payment = await self._call(self.client.payment.fetch, payment_id)
+            if payment.get("status") == "captured":
+                self.payment_cache.set(payment_id, payment)
+            future.set_result(payment)
+            return payment
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved, so a future nobody else awaited doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(payment_id, None)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._client is not None:
+            self._client.session.close()
+            self._client = None
+
+razorpay_gateway = RazorpayGateway(
+    key_id=settings.RAZORPAY_KEY_ID,
+    key_secret=settings.RAZORPAY_KEY_SECRET,
+    base_url=settings.RAZORPAY_BASE_URL,
+    timeout=settings.RAZORPAY_TIMEOUT,
+    connect_timeout=settings.RAZORPAY_CONNECT_TIMEOUT,
+    max_concurrency=settings.RAZORPAY_MAX_CONCURRENCY,
+    breaker=CircuitBreaker(
+        "razorpay",
+        failure_threshold=settings.RAZORPAY_BREAKER_FAILURES,
+        reset_timeout=settings.RAZORPAY_BREAKER_RESET,
+    ),
+    payment_cache=TTLCache(maxsize=settings.RAZORPAY_PAYMENT_CACHE_SIZE, ttl=settings.RAZORPAY_PAYMENT_CACHE_TTL),
+)
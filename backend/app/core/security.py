@@ -1,7 +1,51 @@
 from fastapi import Header, HTTPException, Depends
 from typing import Optional
 from app.db.supabase import supabase
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.tokens import verify_token, remember_token, UnknownSigningKey
 import asyncio
+import jwt
+import logging
+
+logger = logging.getLogger(__name__)
+
+VALID_ROLES = ('user', 'admin')
+
+# user id -> role from public.users
+role_cache = TTLCache(maxsize=settings.ROLE_CACHE_SIZE, ttl=settings.ROLE_CACHE_TTL)
+
+def _role_from_claims(user) -> Optional[str]:
+    # app_metadata is only writable with the service role key, so a role there can be trusted
+    app_metadata = getattr(user.user, 'app_metadata', None) or {}
+    role = app_metadata.get('role')
+    return role if role in VALID_ROLES else None
+
+async def get_user_role(user) -> Optional[str]:
+    """
+    Resolve the user's role: JWT claims first, then the role cache, then public.users.
+    Returns None if the user has no profile row.
+    """
+    role = _role_from_claims(user)
+    if role:
+        return role
+
+    uid = str(user.user.id)
+    role = role_cache.get(uid)
+    if role:
+        return role
+
+    # Use execute() instead of single() to avoid PGRST116 on missing rows
+    response = await asyncio.to_thread(
+        lambda: supabase.table("users").select("role").eq("id", uid).execute()
+    )
+    if not response.data:
+        return None
+
+    role = response.data[0].get('role') or 'user'
+    # Missing profiles aren't cached so a freshly created row is picked up right away
+    role_cache.set(uid, role)
+    return role
 
 async def get_current_user(authorization: Optional[str] = Header(None)):
     if not authorization:
@@ -9,6 +53,17 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
     
     try:
         token = authorization.split(" ")[1]
+
+        # Verify signature and expiry locally; only unknown signing keys go to Supabase Auth
+        if settings.AUTH_VERIFY_MODE == "local":
+            try:
+                return await verify_token(token)
+            except UnknownSigningKey:
+                pass
+            except jwt.ExpiredSignatureError:
+                raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+            except jwt.InvalidTokenError:
+                raise HTTPException(status_code=401, detail="Invalid token")
         
         # Add timeout to prevent hanging
         try:
@@ -21,6 +76,9 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         
         if not user or not user.user:
             raise HTTPException(status_code=401, detail="Invalid token")
+
+        if settings.AUTH_VERIFY_MODE == "local":
+            remember_token(token, user)
         return user
     except HTTPException:
         raise
@@ -32,30 +90,21 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
 
 async def get_current_admin(user=Depends(get_current_user)):
     try:
-        # Check 'users' table for role. 
         uid = user.user.id
-        # print(f"[DEBUG] Checking admin role for user ID: {uid}")
-        
-        # Use execute() instead of single() to avoid PGRST116 on missing rows
-        response = supabase.table("users").select("role").eq("id", uid).execute()
-        
-        # print(f"[DEBUG] DB Response: {response.data}")
+        user_role = await get_user_role(user)
         
-        if not response.data or len(response.data) == 0:
-            print(f"[DEBUG] User {uid} not found in public.users table.")
+        if user_role is None:
+            logger.debug("User has no profile row", extra={"user_id": str(uid)})
             # If user is authenticated but missing profile, deny access cleanly
             raise HTTPException(status_code=403, detail="User profile not found. Please contact support.")
-            
-        user_role = response.data[0].get('role')
         
         if user_role != 'admin':
-            print(f"[DEBUG] User {uid} is not an admin. Role: {user_role}")
+            logger.debug("Admin access denied", extra={"user_id": str(uid), "role": user_role})
             raise HTTPException(status_code=403, detail="Admin privileges required")
         
-        # print(f"[DEBUG] Admin check passed for user: {uid}")
         return user
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[DEBUG] Exception in get_current_admin: {e}")
+        logger.exception("Error checking admin role")
         raise HTTPException(status_code=403, detail=f"Could not verify admin privileges: {str(e)}")
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+import jwt
+from supabase_auth.types import User, UserResponse
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Algorithms Supabase signs access tokens with. HS256 uses the project JWT secret,
+# the asymmetric ones are published on the project's JWKS endpoint.
+SYMMETRIC_ALGORITHMS = {"HS256"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256", "EdDSA"}
+
+# Don't hammer the JWKS endpoint when a token arrives with a kid we don't know.
+JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+# sha256(token) -> UserResponse
+verified_tokens = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+
+class UnknownSigningKey(Exception):
+    """The token was signed with a key we can't verify locally; ask Supabase Auth instead."""
+
+class JWKSCache:
+    """
+    Caches the project's JWKS signing keys, keyed by kid.
+    Keys are refetched after `ttl` seconds, or early when an unknown kid shows up.
+    """
+
+    def __init__(self, url: str, ttl: float):
+        self.url = url
+        self.ttl = ttl
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fetch(self) -> Dict[str, jwt.PyJWK]:
+        response = httpx.get(self.url, timeout=5.0)
+        response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        return {key.key_id: key for key in jwk_set.keys if key.key_id}
+
+    async def get_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        if not kid:
+            return None
+
+        now = time.monotonic()
+        if kid in self._keys and now - self._fetched_at < self.ttl:
+            return self._keys[kid]
+
+        async with self._lock:
+            # Another request may have refreshed the keys while we waited
+            if kid in self._keys and time.monotonic() - self._fetched_at < self.ttl:
+                return self._keys[kid]
+            if time.monotonic() - self._attempted_at < JWKS_MIN_REFRESH_INTERVAL:
+                return self._keys.get(kid)
+
+            self._attempted_at = time.monotonic()
+            try:
+                self._keys = await asyncio.to_thread(self._fetch)
+                self._fetched_at = time.monotonic()
+            except Exception as e:
+                # Projects on the legacy HS256 secret have no JWKS; fall back to remote checks
+                logger.warning("Could not refresh JWKS", extra={"url": self.url, "error": str(e)})
+            return self._keys.get(kid)
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+
+jwks_cache = JWKSCache(f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json", settings.AUTH_JWKS_TTL)
+
+def token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def user_from_claims(claims: dict) -> UserResponse:
+    """Build the same UserResponse shape that supabase.auth.get_user returns."""
+    aud = claims.get("aud")
+    if isinstance(aud, list):
+        aud = aud[0] if aud else ""
+    return UserResponse(user=User(
+        id=claims["sub"],
+        aud=aud or "",
+        email=claims.get("email"),
+        phone=claims.get("phone"),
+        role=claims.get("role"),
+        app_metadata=claims.get("app_metadata") or {},
+        user_metadata=claims.get("user_metadata") or {},
+        is_anonymous=claims.get("is_anonymous", False),
+        created_at=datetime.fromtimestamp(claims.get("iat", time.time()), tz=timezone.utc),
+    ))
+
+def remember_token(token: str, user: UserResponse, exp: Optional[float] = None) -> None:
+    """Cache a verified token, never past its own expiry."""
+    ttl = settings.AUTH_TOKEN_CACHE_TTL
+    if exp is None:
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.InvalidTokenError:
+            exp = None
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    verified_tokens.set(token_cache_key(token), user, ttl=ttl)
+
+async def verify_token(token: str) -> UserResponse:
+    """
+    Verify a Supabase access token locally.
+    Raises jwt.InvalidTokenError for bad/expired tokens and UnknownSigningKey
+    when the signing key isn't available here.
+    """
+    cached = verified_tokens.get(token_cache_key(token))
+    if cached is not None:
+        return cached
+
+    header = jwt.get_unverified_header(token)
+    alg = header.get("alg")
+
+    if alg in SYMMETRIC_ALGORITHMS:
+        if not settings.SUPABASE_JWT_SECRET:
+            raise UnknownSigningKey(alg)
+        key = settings.SUPABASE_JWT_SECRET
+    elif alg in ASYMMETRIC_ALGORITHMS:
+        jwk = await jwks_cache.get_key(header.get("kid"))
+        if jwk is None:
+            raise UnknownSigningKey(header.get("kid"))
+        key = jwk.key
+    else:
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {alg}")
+
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=[alg],
+        audience="authenticated",
+        options={"require": ["exp", "sub"]},
+    )
+
+    user = user_from_claims(claims)
+    remember_token(token, user, claims["exp"])
+    return user
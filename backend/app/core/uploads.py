@@ -0,0 +1,171 @@
+"""
+Bounded, streaming file uploads.
+
+Starlette's multipart parser already spools each uploaded file to a temporary
+file (only the first 1 MB stays in memory). Instead of `await file.read()`-ing
+that back into one bytes object, uploads are checked in place: the type is
+sniffed from the first chunk, the size is enforced, and the spooled file is
+streamed to Supabase Storage from a worker thread in small chunks.
+`UploadSizeLimitMiddleware` rejects oversized request bodies before any of
+that, while they are still arriving.
+"""
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.db.supabase import supabase
+
+SNIFF_BYTES = 2048
+
+IMAGE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "image/svg+xml"}
+DOCUMENT_TYPES = IMAGE_TYPES - {"image/svg+xml"} | {
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/svg+xml": "svg",
+    "application/pdf": "pdf",
+    "application/msword": "doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Identify a file from its first bytes (magic numbers), ignoring the client's claim."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return "application/msword"
+    if head.startswith(b"PK\x03\x04") and (b"word/" in head or b"[Content_Types].xml" in head):
+        return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+        return "image/svg+xml"
+    return None
+
+@dataclass
+class CheckedUpload:
+    file: UploadFile
+    content_type: str
+    extension: str
+    size: int
+
+async def check_upload(file: UploadFile, allowed_types: set, max_bytes: int) -> CheckedUpload:
+    """
+    Sniff the type from the first chunk and enforce `max_bytes`, without reading
+    the whole file into memory. Raises 413 / 415 HTTPExceptions.
+    """
+    head = await file.read(SNIFF_BYTES)
+    content_type = sniff_content_type(head)
+    if content_type not in allowed_types:
+        raise HTTPException(status_code=415, detail="Unsupported file type")
+
+    size = file.size
+    if size is None:
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+
+    await file.seek(0)
+    return CheckedUpload(file=file, content_type=content_type, extension=EXTENSIONS[content_type], size=size)
+
+def _upload_blocking(bucket: str, path: str, upload: CheckedUpload):
+    # fileno() rolls an in-memory spool over to disk; the duplicated descriptor gives
+    # storage3 a real file object that httpx streams in 64 KB chunks
+    source = upload.file.file
+    source.flush()
+    with os.fdopen(os.dup(source.fileno()), "rb") as reader:
+        reader.seek(0)
+        return supabase.storage.from_(bucket).upload(path, reader, {"content-type": upload.content_type})
+
+async def store_upload(bucket: str, path: str, upload: CheckedUpload):
+    """Stream a checked upload to Supabase Storage on a worker thread."""
+    return await asyncio.to_thread(_upload_blocking, bucket, path, upload)
+
+async def store_bytes(bucket: str, path: str, data: bytes, content_type: str, cache_control: str = "3600"):
+    """Upload a small in-memory object (e.g. a generated image variant) on a worker thread."""
+    options = {"content-type": content_type, "cache-control": cache_control}
+    return await asyncio.to_thread(supabase.storage.from_(bucket).upload, path, data, options)
+
+class BodyTooLarge(HTTPException):
+    # An HTTPException, so FastAPI's body parsing re-raises it as a 413 instead of a 400
+    def __init__(self):
+        super().__init__(status_code=413, detail="Request body too large")
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart request bodies larger than `max_bytes` with a 413, either
+    up front from Content-Length or, for chunked bodies, as soon as the limit is
+    crossed, so an oversized upload is never spooled in full.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers: Dict[bytes, bytes] = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "Request body too large"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+# Largest multipart body any upload endpoint accepts (the file plus form overhead)
+MAX_REQUEST_BYTES = max(settings.UPLOAD_LOGO_MAX_BYTES, settings.UPLOAD_DOCUMENT_MAX_BYTES) + 64 * 1024
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.supabase import supabase
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def _encode(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+
+class CachedBody:
+    """A pre-serialised JSON response body and its strong ETag."""
+
+    def __init__(self, data):
+        self.data = data
+        self.body = _encode(data)
+        self.etag = make_etag(self.body)
+
+class ServiceCatalog:
+    """
+    Process-wide copy of the services table, indexed by id and category.
+    The admin service endpoints call invalidate() after every write; the TTL
+    picks up changes made from other workers or directly in Supabase.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self._listeners: List[Callable[[], None]] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, CachedBody] = {}
+        self._active: CachedBody = CachedBody([])
+        self._active_by_category: Dict[int, CachedBody] = {}
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _load(self):
+        response = supabase.table("services").select("*").order("id").execute()
+        rows = response.data or []
+
+        active = [row for row in rows if row.get("is_active")]
+        by_category: Dict[int, List[dict]] = {}
+        for row in active:
+            by_category.setdefault(row.get("category_id"), []).append(row)
+
+        self._by_id = {row["id"]: CachedBody(row) for row in rows}
+        self._active = CachedBody(active)
+        self._active_by_category = {cid: CachedBody(items) for cid, items in by_category.items()}
+        self._loaded_at = time.monotonic()
+        self.version += 1
+
+    def _ensure_loaded(self):
+        if self._is_fresh():
+            return
+        with self._lock:
+            if not self._is_fresh():
+                self._load()
+
+    def active_services(self, category_id: Optional[int] = None) -> CachedBody:
+        self._ensure_loaded()
+        if category_id is None:
+            return self._active
+        return self._active_by_category.get(category_id) or CachedBody([])
+
+    def service(self, service_id: int) -> Optional[CachedBody]:
+        self._ensure_loaded()
+        return self._by_id.get(service_id)
+
+    def invalidate(self):
+        """Call after any write to the services table."""
+        with self._lock:
+            self._loaded_at = None
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Register a callback for invalidate(), for caches derived from the catalog."""
+        self._listeners.append(callback)
+
+service_catalog = ServiceCatalog(ttl=settings.CATALOG_TTL)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from typing import Dict, List
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import repository
+
+class SignedUrlCache:
+    """
+    Signed download URLs for a private bucket, cached per path until
+    `refresh_margin` seconds before they expire, so a URL handed out always
+    has at least that long left. Misses are signed together in one Storage call.
+    """
+
+    def __init__(self, bucket: str, expires_in: int, refresh_margin: int, maxsize: int):
+        self.bucket = bucket
+        self.expires_in = expires_in
+        self.refresh_margin = refresh_margin
+        # path -> {"url": ..., "expires_at": epoch seconds}
+        self._cache = TTLCache(maxsize=maxsize, ttl=max(expires_in - refresh_margin, 0))
+        self._lock = asyncio.Lock()
+
+    async def get_many(self, paths: List[str]) -> Dict[str, dict]:
+        result = {}
+        missing = []
+        for path in dict.fromkeys(paths):
+            entry = self._cache.get(path)
+            if entry is not None:
+                result[path] = entry
+            else:
+                missing.append(path)
+        if not missing:
+            return result
+
+        # One signing call at a time, so concurrent listings of the same
+        # documents don't each sign them
+        async with self._lock:
+            still_missing = []
+            for path in missing:
+                entry = self._cache.get(path)
+                if entry is not None:
+                    result[path] = entry
+                else:
+                    still_missing.append(path)
+            if still_missing:
+                expires_at = int(time.time()) + self.expires_in
+                signed = await repository.create_signed_urls(self.bucket, still_missing, self.expires_in)
+                for path, url in signed.items():
+                    entry = {"url": url, "expires_at": expires_at}
+                    self._cache.set(path, entry)
+                    result[path] = entry
+        return result
+
+    def invalidate(self, path: str = None):
+        if path is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(path)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+final_document_urls = SignedUrlCache(
+    "final-documents",
+    expires_in=settings.SIGNED_URL_EXPIRES_IN,
+    refresh_margin=settings.SIGNED_URL_REFRESH_MARGIN,
+    maxsize=settings.SIGNED_URL_CACHE_SIZE,
+)
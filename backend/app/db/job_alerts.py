@@ -0,0 +1,121 @@
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.push import push_hub, AUDIENCE_JOB_ALERTS
+from app.db.catalog import service_catalog
+from app.db.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+JOB_CATEGORY_PATTERN = re.compile(r"job.*application", re.IGNORECASE)
+RECENT_DAYS = 7
+RECENT_LIMIT = 10
+
+_UNSET = object()
+
+class JobAlertFeed:
+    """
+    The new-jobs list behind /notifications/jobs, shared by every opted-in user.
+
+    The "Job Applications" category id is resolved with a single categories
+    query and kept for `category_ttl` seconds (a missing category is retried
+    after `missing_ttl`). The 7-day list is derived from the in-process service
+    catalog, so building it costs no query at all; it is memoised per catalog
+    version for `list_ttl` seconds as the 7-day window moves.
+    """
+
+    def __init__(self, category_ttl: float, missing_ttl: float, list_ttl: float):
+        self.category_ttl = category_ttl
+        self.missing_ttl = missing_ttl
+        self._category_id = _UNSET
+        self._category_expires = 0.0
+        self._lock = threading.Lock()
+        self._recent = TTLCache(maxsize=8, ttl=list_ttl)
+
+    def _resolve_category_id(self) -> Optional[int]:
+        # One scan instead of '%job%application%' followed by a '%job%' fallback
+        response = supabase.table("categories").select("id, name").ilike("name", "%job%").order("id").execute()
+        rows = response.data or []
+        for row in rows:
+            if JOB_CATEGORY_PATTERN.search(row.get("name") or ""):
+                return row["id"]
+        return rows[0]["id"] if rows else None
+
+    def category_id(self) -> Optional[int]:
+        if self._category_id is not _UNSET and time.monotonic() < self._category_expires:
+            return self._category_id
+        with self._lock:
+            if self._category_id is _UNSET or time.monotonic() >= self._category_expires:
+                category_id = self._resolve_category_id()
+                ttl = self.category_ttl if category_id is not None else self.missing_ttl
+                self._category_id = category_id
+                self._category_expires = time.monotonic() + ttl
+            return self._category_id
+
+    def recent_jobs(self) -> List[dict]:
+        """Active job services created in the last 7 days, newest first."""
+        category_id = self.category_id()
+        if category_id is None:
+            return []
+
+        # Resolve the catalog first so the key carries its current version
+        services = service_catalog.active_services(category_id).data
+        key = (category_id, service_catalog.version)
+        cached = self._recent.get(key)
+        if cached is not None:
+            return cached
+
+        since = datetime.now(timezone.utc) - timedelta(days=RECENT_DAYS)
+        recent = []
+        for row in services:
+            created_at = _parse_timestamp(row.get("created_at"))
+            if created_at is not None and created_at >= since:
+                recent.append((created_at, row))
+        recent.sort(key=lambda item: item[0], reverse=True)
+        jobs = [row for _, row in recent[:RECENT_LIMIT]]
+
+        self._recent.set(key, jobs)
+        return jobs
+
+    def announce(self, service: dict):
+        """Push a newly created service to opted-in users if it is an active job service."""
+        try:
+            if not service.get("is_active") or service.get("category_id") != self.category_id():
+                return
+        except Exception as e:
+            logger.warning("Could not check job category for push", extra={"error": str(e)})
+            return
+        fields = ("id", "name", "description", "price", "created_at")
+        push_hub.publish("job_service", {key: service.get(key) for key in fields}, audience=AUDIENCE_JOB_ALERTS)
+
+    def invalidate(self):
+        """Forget the category id and the list (e.g. after categories or services change)."""
+        with self._lock:
+            self._category_id = _UNSET
+        self._recent.clear()
+
+    def stats(self) -> dict:
+        return {"category_id": None if self._category_id is _UNSET else self._category_id, "recent": self._recent.stats()}
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+job_alert_feed = JobAlertFeed(
+    category_ttl=settings.JOB_CATEGORY_TTL,
+    missing_ttl=settings.JOB_CATEGORY_MISSING_TTL,
+    list_ttl=settings.JOB_ALERTS_TTL,
+)
+# Service writes often come with category changes, so drop both together
+service_catalog.add_listener(job_alert_feed.invalidate)
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db import repository
+
+logger = logging.getLogger(__name__)
+
+def _is_row_error(error: Exception) -> bool:
+    """Postgres rejected the data itself (SQLSTATE class 22 or 23, e.g. a foreign key violation)."""
+    code = getattr(error, "code", None)
+    return isinstance(code, str) and code[:2] in ("22", "23")
+
+class LoginHistoryWriter:
+    """
+    Buffers login_history rows in memory and writes them with one bulk insert
+    per flush. A flush happens when `batch_size` rows are waiting or
+    `flush_interval` seconds after the oldest one arrived, whichever is first.
+
+    At most `max_pending` rows are buffered; beyond that `record()` waits for
+    the writer to catch up (back-pressure) instead of growing without bound.
+    `stop()` flushes everything still buffered. A batch the database rejects
+    because of its data is split in halves until the bad rows are isolated, so
+    only those are dropped.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int, max_retries: int = 3):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows taken off the queue by the flusher but not yet written
+        self._inflight: List[dict] = []
+        self._flushing = False
+        self._stopping = False
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # A bulk insert already in flight is allowed to finish (cancelling it could
+        # write the batch twice); a flusher that is only waiting for rows is cancelled
+        self._stopping = True
+        if not self._flushing:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Whatever is still buffered goes out now
+        if self._inflight:
+            rows, self._inflight = self._inflight, []
+            await self._flush(rows)
+        while not self._queue.empty():
+            await self._flush(self._take(self.batch_size))
+
+    async def record(self, row: Dict[str, Any]):
+        if self._task is None:
+            # Writer not running (scripts, tests): write through
+            await repository.insert_login_history([row])
+            return
+        await self._queue.put(row)
+
+    def _take(self, limit: int) -> List[dict]:
+        rows = []
+        while len(rows) < limit and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    async def _run(self):
+        while not self._stopping:
+            rows = self._inflight = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.batch_size:
+                rows.extend(self._take(self.batch_size - len(rows)))
+                remaining = deadline - time.monotonic()
+                if len(rows) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._flushing = True
+            try:
+                await self._flush(rows)
+            finally:
+                self._flushing = False
+            self._inflight = []
+
+    async def _flush(self, rows: List[dict]):
+        error = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await repository.insert_login_history(rows)
+                self.flushes += 1
+                self.rows_written += len(rows)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                if _is_row_error(e):
+                    # One bad row (e.g. an unknown user_id) fails the whole insert and
+                    # would fail again: find it by splitting instead of retrying
+                    break
+                logger.warning("Login history flush failed", extra={"rows": len(rows), "attempt": attempt, "error": str(e)})
+                if attempt < self.max_retries:
+                    await asyncio.sleep(0.5 * attempt)
+        else:
+            # Login history is best effort; don't let the buffer block forever on an outage
+            self.rows_dropped += len(rows)
+            return
+
+        if len(rows) == 1:
+            logger.warning("Login history row rejected", extra={"user_id": rows[0].get("user_id"), "error": str(error)})
+            self.rows_dropped += 1
+            return
+        middle = len(rows) // 2
+        await self._flush(rows[:middle])
+        await self._flush(rows[middle:])
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue else 0,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+        }
+
+login_history_writer = LoginHistoryWriter(
+    batch_size=settings.LOGIN_HISTORY_BATCH_SIZE,
+    flush_interval=settings.LOGIN_HISTORY_FLUSH_INTERVAL,
+    max_pending=settings.LOGIN_HISTORY_MAX_PENDING,
+)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.db import repository
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+class WebhookOutbox:
+    """
+    Worker pool for the webhook_events outbox (migration_webhook_outbox.sql).
+
+    Webhook endpoints only persist the raw event and call `notify()`; `workers`
+    tasks claim due rows with claim_webhook_events (SKIP LOCKED, so several
+    processes can share the table) and run the handler registered for the event.
+    A failing event is retried with exponential backoff and marked 'dead' after
+    `max_attempts`. Events with no handler are simply marked done.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        poll_interval: float,
+        lease_seconds: int,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._handlers: Dict[str, Handler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.processed = 0
+        self.retried = 0
+        self.dead = 0
+
+    def add_handler(self, event: str, handler: Handler):
+        self._handlers[event] = handler
+
+    def notify(self):
+        """Wake idle workers; called right after an event is enqueued."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        if self._tasks or self.workers <= 0:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        """Let in-flight events finish; anything unclaimed stays queued for the next start."""
+        self._stopping = True
+        self.notify()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(self.retry_base * (2 ** max(attempts - 1, 0)), self.retry_max)
+
+    async def _worker(self, number: int):
+        while not self._stopping:
+            # Cleared before claiming, so a notify() that races the claim is not lost
+            self._wake.clear()
+            try:
+                rows = await repository.claim_webhook_events(self.batch_size, self.lease_seconds)
+            except Exception as e:
+                logger.warning("Webhook claim failed", extra={"worker": number, "error": str(e)})
+                rows = []
+
+            if not rows:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for row in rows:
+                await self._process(row)
+
+    async def _process(self, row: dict):
+        handler = self._handlers.get(row.get("event"))
+        try:
+            if handler is not None:
+                await handler(row["payload"])
+        except Exception as e:
+            await self._fail(row, e)
+            return
+
+        self.processed += 1
+        await self._update(row, {
+            "status": "done",
+            "processed_at": datetime.now(timezone.utc).isoformat(),
+            "locked_until": None,
+            "last_error": None,
+        })
+
+    async def _fail(self, row: dict, error: Exception):
+        attempts = row.get("attempts") or 1
+        if attempts >= self.max_attempts:
+            self.dead += 1
+            logger.error("Webhook event dead-lettered", extra={"event_id": row["event_id"], "attempts": attempts, "error": error})
+            values = {"status": "dead", "locked_until": None, "last_error": str(error)}
+        else:
+            self.retried += 1
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.retry_delay(attempts))
+            logger.warning("Webhook event failed, retrying", extra={"event_id": row["event_id"], "attempts": attempts, "error": error})
+            values = {
+                "status": "pending",
+                "next_attempt_at": retry_at.isoformat(),
+                "locked_until": None,
+                "last_error": str(error),
+            }
+        await self._update(row, values)
+
+    async def _update(self, row: dict, values: dict):
+        # If this write fails, the lease expires and the event is claimed again;
+        # handlers must therefore be idempotent (credit_wallet is, via payment_reference)
+        try:
+            await repository.update_webhook_event(row["id"], values)
+        except Exception as e:
+            logger.error("Could not record webhook event status", extra={"event_id": row["event_id"], "status": values["status"], "error": str(e)})
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+webhook_outbox = WebhookOutbox(
+    workers=settings.WEBHOOK_WORKERS,
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    poll_interval=settings.WEBHOOK_POLL_INTERVAL,
+    lease_seconds=settings.WEBHOOK_LEASE_SECONDS,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+    retry_base=settings.WEBHOOK_RETRY_BASE,
+    retry_max=settings.WEBHOOK_RETRY_MAX,
+)
@@ -0,0 +1,156 @@
+"""
+Async data access for the `async def` endpoints.
+Every call goes through the pooled async Supabase client, so a slow round trip
+only suspends its own request instead of blocking the event loop.
+"""
+from typing import Any, Dict, List, Optional
+
+from app.db.supabase import get_async_supabase, get_async_auth
+
+# --- Auth ---
+
+async def sign_up(email: str, password: str, user_metadata: Dict[str, Any]) -> Any:
+    client = await get_async_auth()
+    return await client.auth.sign_up({
+        "email": email,
+        "password": password,
+        "options": {"data": user_metadata}
+    })
+
+# --- Users ---
+
+async def get_user(user_id: str, columns: str = "*") -> Optional[dict]:
+    db = await get_async_supabase()
+    response = await db.table("users").select(columns).eq("id", user_id).limit(1).execute()
+    return response.data[0] if response.data else None
+
+async def find_user_id_by_email(email: str) -> Optional[str]:
+    db = await get_async_supabase()
+    response = await db.table("users").select("id").eq("email", email).limit(1).execute()
+    return response.data[0]["id"] if response.data else None
+
+async def get_wallet_balance(user_id: str) -> Optional[float]:
+    user = await get_user(user_id, "wallet_balance")
+    if user is None:
+        return None
+    return float(user.get("wallet_balance") or 0)
+
+async def update_user(user_id: str, values: Dict[str, Any]) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.table("users").update(values).eq("id", user_id).execute()
+    return response.data
+
+# --- Transactions ---
+
+class UserNotFound(Exception):
+    pass
+
+# credit_wallet raises no_data_found when the user does not exist
+USER_NOT_FOUND_SQLSTATE = "P0002"
+
+async def credit_wallet(user_id: str, amount: float, description: str, payment_reference: Optional[str] = None) -> dict:
+    """
+    Atomically add `amount` to the wallet and write the ledger row
+    (credit_wallet RPC, one round trip).
+    A `payment_reference` that was already credited is not applied again.
+    Returns {"new_balance": float, "duplicate": bool}.
+    """
+    db = await get_async_supabase()
+    try:
+        response = await db.rpc("credit_wallet", {
+            "p_user_id": user_id,
+            "p_amount": amount,
+            "p_description": description,
+            "p_payment_reference": payment_reference
+        }).execute()
+    except Exception as e:
+        if getattr(e, "code", None) == USER_NOT_FOUND_SQLSTATE:
+            raise UserNotFound(f"User {user_id} not found")
+        raise
+    return {
+        "new_balance": float(response.data["new_balance"]),
+        "duplicate": bool(response.data.get("duplicate"))
+    }
+
+# --- Webhook outbox ---
+
+async def enqueue_webhook_event(provider: str, event_id: str, event: Optional[str], payload: Dict[str, Any]) -> Optional[int]:
+    """Persist a received webhook. Returns the row id, or None if this event id was already queued."""
+    db = await get_async_supabase()
+    response = await db.rpc("enqueue_webhook_event", {
+        "p_provider": provider,
+        "p_event_id": event_id,
+        "p_event": event,
+        "p_payload": payload
+    }).execute()
+    return response.data
+
+async def claim_webhook_events(limit: int, lease_seconds: int) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.rpc("claim_webhook_events", {
+        "p_limit": limit,
+        "p_lease_seconds": lease_seconds
+    }).execute()
+    return response.data or []
+
+async def update_webhook_event(event_row_id: int, values: Dict[str, Any]) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.table("webhook_events").update(values).eq("id", event_row_id).execute()
+    return response.data
+
+# --- Services ---
+
+async def get_service(service_id: int) -> Optional[dict]:
+    db = await get_async_supabase()
+    response = await db.table("services").select("*").eq("id", service_id).execute()
+    return response.data[0] if response.data else None
+
+async def update_service(service_id: int, values: Dict[str, Any]) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.table("services").update(values).eq("id", service_id).execute()
+    return response.data
+
+# --- Submissions ---
+
+async def submit_application(user_id: str, service_id: int, data: Dict[str, Any]) -> Any:
+    """Create the submission and deduct the fee in one transaction (submit_application RPC)."""
+    db = await get_async_supabase()
+    response = await db.rpc("submit_application", {
+        "p_user_id": user_id,
+        "p_service_id": service_id,
+        "p_data": data
+    }).execute()
+    return response.data
+
+async def get_submission_documents(submission_ids: List[int], user_id: Optional[str] = None) -> List[dict]:
+    """id and final_document_url of the given submissions; only `user_id`'s own if given."""
+    db = await get_async_supabase()
+    query = db.table("submissions").select("id, final_document_url").in_("id", submission_ids)
+    if user_id is not None:
+        query = query.eq("user_id", user_id)
+    response = await query.execute()
+    return response.data or []
+
+async def update_submission(submission_id: int, values: Dict[str, Any]) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.table("submissions").update(values).eq("id", submission_id).execute()
+    return response.data
+
+# --- Login history ---
+
+async def insert_login_history(rows: List[Dict[str, Any]]) -> List[dict]:
+    db = await get_async_supabase()
+    response = await db.table("login_history").insert(rows).execute()
+    return response.data
+
+# --- Storage ---
+
+async def create_signed_urls(bucket: str, paths: List[str], expires_in: int) -> Dict[str, str]:
+    """Sign many paths in one Storage call. Returns {path: signed URL} for the paths that exist."""
+    db = await get_async_supabase()
+    items = await db.storage.from_(bucket).create_signed_urls(paths, expires_in)
+    return {item["path"]: item["signedURL"] for item in items if item.get("signedURL") and not item.get("error")}
+
+async def get_public_url(bucket: str, path: str) -> str:
+    db = await get_async_supabase()
+    return await db.storage.from_(bucket).get_public_url(path)
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.db.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+STAT_KEYS = (
+    "total_users",
+    "total_services",
+    "total_applications",
+    "pending_applications",
+    "approved_applications",
+    "rejected_applications",
+)
+
+def _fetch_counts_fallback() -> dict:
+    """Per-status exact counts, used until migration_admin_stats.sql has been applied."""
+    def count(table, status=None):
+        query = supabase.table(table).select("id", count="exact", head=True)
+        if status:
+            query = query.eq("status", status)
+        return query.execute().count or 0
+
+    return {
+        "total_users": count("users"),
+        "total_services": count("services"),
+        "total_applications": count("submissions"),
+        "pending_applications": count("submissions", "pending"),
+        "approved_applications": count("submissions", "approved"),
+        "rejected_applications": count("submissions", "rejected"),
+    }
+
+def fetch_admin_stats() -> dict:
+    """Fetch every dashboard counter in one round trip via the admin_stats() RPC."""
+    try:
+        response = supabase.rpc("admin_stats").execute()
+    except Exception as e:
+        logger.warning("admin_stats RPC unavailable, falling back to per-status counts", extra={"error": str(e)})
+        return _fetch_counts_fallback()
+
+    data = response.data or {}
+    return {key: int(data.get(key) or 0) for key in STAT_KEYS}
+
+class AdminStatsCache:
+    """
+    Keeps the last stats snapshot in memory.
+    Only the very first request waits on the database; after that, stale
+    snapshots are served while a single background task refreshes them.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[dict] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at >= self.ttl
+
+    async def refresh(self) -> dict:
+        value = await asyncio.to_thread(fetch_admin_stats)
+        self._value = value
+        self._fetched_at = time.monotonic()
+        return value
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Background admin stats refresh failed", extra={"error": str(e)})
+
+    async def get(self) -> dict:
+        if self._value is None:
+            async with self._lock:
+                if self._value is None:
+                    return await self.refresh()
+
+        if self._is_stale() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+        return self._value
+
+    def mark_stale(self):
+        """Call after writes that change the counters; the next read triggers a refresh."""
+        self._fetched_at = 0.0
+
+admin_stats_cache = AdminStatsCache(ttl=settings.ADMIN_STATS_TTL)
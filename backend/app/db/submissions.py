@@ -0,0 +1,121 @@
+import base64
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from app.db.supabase import supabase
+
+# Columns of public.submissions that callers may project with `fields=`
+SUBMISSION_COLUMNS = (
+    "id",
+    "user_id",
+    "service_id",
+    "data",
+    "status",
+    "final_document_url",
+    "captcha_verified",
+    "submitted_ip",
+    "created_at",
+)
+
+# Always selected: the keyset cursor needs (created_at, id), the services side table needs service_id
+REQUIRED_COLUMNS = ("id", "created_at", "service_id")
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(created_at), int(row_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Turn `fields=id,status` into a column list; raises ValueError on unknown columns."""
+    if not fields:
+        return list(SUBMISSION_COLUMNS)
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SUBMISSION_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    columns = list(REQUIRED_COLUMNS)
+    columns += [f for f in requested if f not in columns]
+    return columns
+
+def fetch_submissions_page(
+    columns: Iterable[str],
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    embed_user: bool = True,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    One keyset page of submissions ordered by (created_at, id) descending.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    select = ",".join(columns)
+    if embed_user:
+        select += ",users(email)"
+
+    query = supabase.table("submissions").select(select)
+
+    if status:
+        query = query.eq("status", status)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+        )
+
+    # Ask for one extra row to learn whether another page exists
+    response = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+    rows = response.data or []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return rows, next_cursor
+
+def fetch_services_by_id(service_ids: Iterable[int]) -> dict:
+    """Service name/fields/category for the given ids, keyed by id."""
+    ids = sorted({sid for sid in service_ids if sid is not None})
+    if not ids:
+        return {}
+
+    response = supabase.table("services").select("id, name, fields, Category:categories(name)").in_("id", ids).execute()
+    return {row["id"]: row for row in (response.data or [])}
+
+def iter_submissions(columns: Iterable[str], status: Optional[str] = None, batch_size: int = 500):
+    """
+    Yield every matching submission, newest first, one keyset page at a time,
+    with `user_email` and `service_name` flattened onto each row.
+    Only one batch is held in memory.
+    """
+    service_names = {}
+    cursor = None
+    while True:
+        rows, cursor = fetch_submissions_page(columns, status=status, cursor=cursor, limit=batch_size)
+
+        missing = {row.get("service_id") for row in rows} - service_names.keys()
+        found = fetch_services_by_id(missing)
+        for sid in missing:
+            service_names[sid] = (found.get(sid) or {}).get("name")
+
+        for row in rows:
+            user = row.pop("users", None) or {}
+            row["user_email"] = user.get("email")
+            row["service_name"] = service_names.get(row.get("service_id"))
+            yield row
+
+        if cursor is None:
+            break
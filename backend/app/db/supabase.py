@@ -1,7 +1,79 @@
-from supabase import create_client, Client
+import asyncio
+from typing import Optional
+
+import httpx
+from supabase import create_client, Client, acreate_client, AsyncClient, AsyncClientOptions
+from supabase.lib.client_options import SyncClientOptions
 from app.core.config import settings
+from app.core.metrics import InstrumentedTransport, InstrumentedAsyncTransport, classify_supabase
 
 url: str = settings.SUPABASE_URL
 key: str = settings.SUPABASE_SERVICE_ROLE_KEY
 
-supabase: Client = create_client(url, key)
+# Synchronous client, for sync endpoints (run in the threadpool) and scripts.
+# Its HTTP client is instrumented like the async one; 120s matches PostgREST's default timeout.
+_sync_http = httpx.Client(
+    transport=InstrumentedTransport(httpx.HTTPTransport(), classify_supabase),
+    timeout=httpx.Timeout(120, connect=settings.SUPABASE_CONNECT_TIMEOUT),
+)
+supabase: Client = create_client(url, key, SyncClientOptions(httpx_client=_sync_http, auto_refresh_token=False, persist_session=False))
+
+# Async client for `async def` endpoints. One pooled keep-alive HTTP client per worker,
+# shared by PostgREST, Storage and Auth calls.
+_async_supabase: Optional[AsyncClient] = None
+_async_auth: Optional[AsyncClient] = None
+_async_http: Optional[httpx.AsyncClient] = None
+_async_lock = asyncio.Lock()
+
+def _build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE,
+        keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        # Records latency and payload sizes of every PostgREST / Storage / Auth call
+        transport=InstrumentedAsyncTransport(httpx.AsyncHTTPTransport(limits=limits), classify_supabase),
+        timeout=httpx.Timeout(settings.SUPABASE_TIMEOUT, connect=settings.SUPABASE_CONNECT_TIMEOUT),
+    )
+
+def _options() -> AsyncClientOptions:
+    return AsyncClientOptions(httpx_client=_async_http, auto_refresh_token=False, persist_session=False)
+
+async def get_async_supabase() -> AsyncClient:
+    global _async_supabase, _async_http
+    if _async_supabase is not None:
+        return _async_supabase
+
+    async with _async_lock:
+        if _async_supabase is None:
+            if _async_http is None:
+                _async_http = _build_http_client()
+            _async_supabase = await acreate_client(url, key, _options())
+    return _async_supabase
+
+async def get_async_auth() -> AsyncClient:
+    """
+    Separate client for end-user auth calls (sign_up etc.).
+    A sign-in stores the user's session on the client that made it, which must
+    never be the service-role client used for database access.
+    """
+    global _async_auth, _async_http
+    if _async_auth is not None:
+        return _async_auth
+
+    async with _async_lock:
+        if _async_auth is None:
+            if _async_http is None:
+                _async_http = _build_http_client()
+            _async_auth = await acreate_client(url, key, _options())
+    return _async_auth
+
+async def close_async_supabase():
+    """Close pooled connections on shutdown."""
+    global _async_supabase, _async_auth, _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+    _async_supabase = None
+    _async_auth = None
+    _async_http = None
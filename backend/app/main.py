@@ -1,11 +1,44 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.db.supabase import close_async_supabase
+from app.db.outbox import webhook_outbox
+from app.db.login_history import login_history_writer
+from app.core.razorpay_gateway import razorpay_gateway
+from app.core.uploads import UploadSizeLimitMiddleware, MAX_REQUEST_BYTES
+from app.core.images import shutdown_image_pool
+from app.core.push import push_hub
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.log import setup_logging, log_request
+
+setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process queued webhook events (see migration_webhook_outbox.sql)
+    webhook_outbox.start()
+    login_history_writer.start()
+    await push_hub.start()
+    yield
+    # Close any event streams that are still open
+    await push_hub.stop()
+    await webhook_outbox.stop()
+    # Flush buffered login history before the connections go away
+    await login_history_writer.stop()
+    # Close pooled Supabase connections
+    await close_async_supabase()
+    razorpay_gateway.close()
+    shutdown_image_pool()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -18,8 +51,24 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Reject oversized uploads before they are spooled
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_REQUEST_BYTES)
+
+# Outermost, so it also times requests the middlewares above reject
+app.add_middleware(MetricsMiddleware, on_complete=log_request)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 def root():
     return {"message": "Welcome to DSK API"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text format: per-route and per-upstream latency, counts and sizes for this worker."""
+    if not settings.METRICS_TOKEN:
+        if not settings.METRICS_PUBLIC:
+            raise HTTPException(status_code=404, detail="Not Found")
+    elif not hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 
 class ServiceBase(BaseModel):
     name: str
@@ -11,7 +11,9 @@ class ServiceBase(BaseModel):
     is_active: bool = True
 
 class ServiceCreate(ServiceBase):
-    pass
+    # Resized copies of the logo from /admin/upload-logo: {"thumb_64": url, "thumb_64_webp": url, ...}.
+    # Only stored when they belong to logo_url; leave unset on trees without migration_logo_variants.sql
+    logo_variants: Optional[Dict[str, str]] = None
 
-class ServiceUpdate(ServiceBase):
+class ServiceUpdate(ServiceCreate):
     pass
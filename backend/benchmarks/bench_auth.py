@@ -0,0 +1,77 @@
+"""
+Microbenchmark for get_current_user: remote Supabase Auth check vs local JWT verification.
+
+Run from backend/:
+    python -m benchmarks.bench_auth --requests 2000 --concurrency 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_servers import SECRET, StubServer, auth_stub_app, configure_env, free_port, make_token
+
+async def run_mode(mode: str, tokens, total: int, concurrency: int) -> dict:
+    import httpx
+    from fastapi import Depends, FastAPI
+    from app.core.config import settings
+    from app.core.security import get_current_user
+    from app.core.tokens import verified_tokens
+
+    settings.AUTH_VERIFY_MODE = mode
+    verified_tokens.clear()
+
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user=Depends(get_current_user)):
+        return {"id": user.user.id}
+
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(tokens[i % len(tokens)])
+    failures = 0
+
+    async def worker(client):
+        nonlocal failures
+        while not queue.empty():
+            token = queue.get_nowait()
+            response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+            if response.status_code != 200:
+                failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {"mode": mode, "requests": total, "seconds": elapsed, "rps": total / elapsed, "failures": failures}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200, help="distinct tokens in rotation")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub auth server latency (s)")
+    args = parser.parse_args()
+
+    port = free_port()
+    configure_env(f"http://127.0.0.1:{port}")
+    stub = StubServer(auth_stub_app(SECRET, args.latency), port=port).start()
+
+    tokens = [make_token(SECRET) for _ in range(args.users)]
+    try:
+        for mode in ("remote", "local"):
+            calls_before = stub.server.config.app.state.calls
+            result = asyncio.run(run_mode(mode, tokens, args.requests, args.concurrency))
+            result["auth_calls"] = stub.server.config.app.state.calls - calls_before
+            print(
+                f"{result['mode']:>6}: {result['rps']:8.1f} req/s "
+                f"({result['requests']} requests in {result['seconds']:.2f}s, "
+                f"{result['auth_calls']} auth server calls, {result['failures']} failures)"
+            )
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
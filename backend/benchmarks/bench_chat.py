@@ -0,0 +1,121 @@
+"""
+Concurrent chat benchmark against a fake OpenAI-compatible model server and an
+in-memory PostgREST (for the platform_knowledge tool).
+
+Compares a blocking baseline (sync `invoke` inside the async handler, as the
+chat endpoint used to do) with the async /chat/ route and the SSE /chat/stream
+route, which also reports time to first token. Every chat asks a different
+question, so these measure the model round trips, not chat_response_cache;
+"/chat/ cached" then repeats two questions to show the cache-hit path.
+
+Run from backend/:
+    python -m benchmarks.bench_chat --chats 100 --concurrency 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.stub_servers import StubServer, chat_model_stub_app, configure_env, free_port, postgrest_stub_app
+
+CATALOG = {
+    "categories": [{"id": 1, "name": "Job Applications", "is_active": True}],
+    "services": [
+        {"id": i, "name": f"Service {i}", "price": 100 + i, "category_id": 1, "is_active": True, "categories": {"name": "Job Applications"}}
+        for i in range(1, 21)
+    ],
+}
+
+QUESTIONS = ["What services do you offer?", "How do I reset my password?"]
+
+def build_app():
+    from fastapi import FastAPI
+    from langchain_core.messages import HumanMessage
+    from app.api.v1.endpoints import chat
+    from app.agent.crew import get_llm_with_tools, _initial_messages
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+
+    @app.post("/blocking")
+    async def blocking(request: chat.ChatRequest):
+        # Baseline: one blocking model call holds the whole event loop
+        response = get_llm_with_tools().invoke(_initial_messages(request.message))
+        return {"response": str(response.content)}
+
+    return app
+
+async def run(base_url: str, path: str, chats: int, concurrency: int, repeat: bool = False) -> dict:
+    import httpx
+
+    remaining = iter(range(chats))
+    latencies, first_token = [], []
+    failures = 0
+
+    async def worker(client):
+        nonlocal failures
+        for i in remaining:
+            question = QUESTIONS[i % len(QUESTIONS)]
+            # Unique per chat and per run, so it misses the response cache
+            body = {"message": question if repeat else f"{question} ({path} chat {i})"}
+            start = time.perf_counter()
+            if path.endswith("/stream"):
+                async with client.stream("POST", path, json=body) as response:
+                    seen_token = False
+                    async for line in response.aiter_lines():
+                        if not seen_token and line.startswith("data: ") and '"token"' in line:
+                            first_token.append(time.perf_counter() - start)
+                            seen_token = True
+                    ok = response.status_code == 200
+            else:
+                response = await client.post(path, json=body)
+                ok = response.status_code == 200
+            latencies.append(time.perf_counter() - start)
+            failures += 0 if ok else 1
+
+    # Real HTTP (not ASGITransport) so streamed bytes arrive as they are sent
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "path": f"{path} cached" if repeat else path,
+        "chats": chats,
+        "seconds": elapsed,
+        "rps": chats / elapsed,
+        "p50": statistics.median(latencies),
+        "ttft": statistics.median(first_token) if first_token else None,
+        "failures": failures,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency per completion (s)")
+    args = parser.parse_args()
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    configure_env(url, OPENAI_API_KEY="sk-stub", OPENAI_BASE_URL=f"{url}/v1")
+    stub_app = postgrest_stub_app(0.01, tables={k: list(v) for k, v in CATALOG.items()})
+    chat_model_stub_app(args.latency, app=stub_app)
+    stub = StubServer(stub_app, port=port).start()
+    server = StubServer(build_app()).start()
+
+    try:
+        for path, repeat in (("/blocking", False), ("/chat/", False), ("/chat/stream", False), ("/chat/", True)):
+            result = asyncio.run(run(server.url, path, args.chats, args.concurrency, repeat))
+            ttft = f", first token p50 {result['ttft'] * 1000:.0f} ms" if result["ttft"] is not None else ""
+            print(
+                f"{result['path']:>14}: {result['rps']:6.1f} chats/s, p50 {result['p50'] * 1000:.0f} ms{ttft} "
+                f"({result['chats']} chats in {result['seconds']:.2f}s, {result['failures']} failures)"
+            )
+    finally:
+        server.stop()
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
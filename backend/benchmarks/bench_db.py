@@ -0,0 +1,83 @@
+"""
+Load test for database access from async endpoints: the synchronous Supabase
+client called inside `async def` (blocks the event loop for every round trip)
+vs the pooled async repository layer, against a local PostgREST stand-in.
+
+Run from backend/:
+    python -m benchmarks.bench_db --requests 1000 --concurrency 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_servers import StubServer, configure_env, free_port, postgrest_stub_app
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+def build_app():
+    from fastapi import FastAPI
+    from app.db.supabase import supabase
+    from app.db import repository
+
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        # The old pattern: sync client inside an async handler
+        response = supabase.table("users").select("wallet_balance").eq("id", USER_ID).execute()
+        return response.data[0]
+
+    @app.get("/pooled")
+    async def pooled():
+        return {"wallet_balance": await repository.get_wallet_balance(USER_ID)}
+
+    return app
+
+async def run(path: str, total: int, concurrency: int) -> dict:
+    import httpx
+    from app.db.supabase import close_async_supabase
+
+    app = build_app()
+    remaining = iter(range(total))
+    failures = 0
+
+    async def worker(client):
+        nonlocal failures
+        for _ in remaining:
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    await close_async_supabase()
+    return {"path": path, "requests": total, "seconds": elapsed, "rps": total / elapsed, "failures": failures}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub PostgREST latency (s)")
+    args = parser.parse_args()
+
+    port = free_port()
+    configure_env(f"http://127.0.0.1:{port}")
+    tables = {"users": [{"id": USER_ID, "wallet_balance": 100.0}]}
+    stub = StubServer(postgrest_stub_app(args.latency, tables=tables), port=port).start()
+
+    try:
+        for path in ("/blocking", "/pooled"):
+            result = asyncio.run(run(path, args.requests, args.concurrency))
+            print(
+                f"{result['path']:>9}: {result['rps']:8.1f} req/s "
+                f"({result['requests']} requests in {result['seconds']:.2f}s, {result['failures']} failures)"
+            )
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
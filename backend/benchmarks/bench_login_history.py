@@ -0,0 +1,95 @@
+"""
+Login burst against a PostgREST stub: one insert per login (the old
+record-login path) vs login_history_writer's buffered bulk inserts.
+
+Reports logins/s, how many round trips reached the database, the most rows
+ever buffered (must stay <= --max-pending, i.e. back-pressure held) and
+whether stop() flushed every row.
+
+Run from backend/:
+    python -m benchmarks.bench_login_history --logins 5000 --concurrency 200 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from benchmarks.stub_servers import StubServer, configure_env, postgrest_stub_app
+
+def login_row() -> dict:
+    return {"user_id": str(uuid.uuid4()), "ip_address": "127.0.0.1", "user_agent": "bench"}
+
+async def run_mode(mode: str, stub_app, logins: int, concurrency: int, args) -> dict:
+    from app.db import repository
+    from app.db.login_history import LoginHistoryWriter
+
+    stub_app.state.tables["login_history"] = []
+    calls_before = stub_app.state.calls
+    writer = LoginHistoryWriter(batch_size=args.batch_size, flush_interval=args.flush_interval, max_pending=args.max_pending)
+    peak = 0
+
+    async def login_direct():
+        await repository.insert_login_history([login_row()])
+
+    async def login_buffered():
+        nonlocal peak
+        await writer.record(login_row())
+        peak = max(peak, writer.stats()["pending"])
+
+    login = login_direct if mode == "direct" else login_buffered
+    remaining = iter(range(logins))
+
+    async def client():
+        for _ in remaining:
+            await login()
+
+    if mode == "buffered":
+        writer.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    accepted = time.perf_counter() - start
+    if mode == "buffered":
+        await writer.stop()
+    total = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "accept_rps": logins / accepted,
+        "total_seconds": total,
+        "round_trips": stub_app.state.calls - calls_before,
+        "rows": len(stub_app.state.tables["login_history"]),
+        "peak_pending": peak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub PostgREST latency per call (s)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--max-pending", type=int, default=1000)
+    args = parser.parse_args()
+
+    stub_app = postgrest_stub_app(latency=args.latency)
+    stub = StubServer(stub_app).start()
+    configure_env(stub.url)
+
+    async def run_all():
+        from app.db.supabase import close_async_supabase
+        results = [await run_mode(mode, stub_app, args.logins, args.concurrency, args) for mode in ("direct", "buffered")]
+        await close_async_supabase()
+        return results
+
+    try:
+        for r in asyncio.run(run_all()):
+            print(
+                f"{r['mode']:>8}: {r['accept_rps']:8.0f} logins/s accepted, {r['round_trips']:5d} round trips, "
+                f"{r['rows']}/{args.logins} rows stored after {r['total_seconds']:.2f}s, "
+                f"peak buffered {r['peak_pending']} (max {args.max_pending})"
+            )
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
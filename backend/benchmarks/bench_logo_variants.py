@@ -0,0 +1,78 @@
+"""
+Event-loop stall while logo variants are rendered: resizing inline in the
+handler vs in the image process pool (app.core.images.build_logo_variants).
+
+A ticker coroutine sleeps 10 ms in a loop and records how late it wakes up;
+meanwhile `--uploads` concurrent 'uploads' each render the variants of one
+large photo-like image.
+
+Run from backend/:
+    python -m benchmarks.bench_logo_variants --uploads 16 --size 3000
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+
+def make_image(size: int) -> bytes:
+    from PIL import Image
+    # Noise compresses poorly, like a photo; keeps decode/resize cost realistic
+    image = Image.frombytes("RGB", (size, size), os.urandom(size * size * 3))
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+async def run(mode: str, uploads: int, data: bytes) -> dict:
+    from app.core.images import build_logo_variants, make_logo_variants
+
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    async def upload():
+        if mode == "inline":
+            return make_logo_variants(data)
+        return await build_logo_variants(data)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await asyncio.gather(*(upload() for _ in range(uploads)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "max_lag_ms": lags[-1] * 1000,
+        "p99_lag_ms": lags[int(len(lags) * 0.99) - 1] * 1000 if lags else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=16)
+    parser.add_argument("--size", type=int, default=3000, help="edge of the source image in px")
+    args = parser.parse_args()
+
+    from app.core.images import shutdown_image_pool
+
+    data = make_image(args.size)
+    print(f"source: {args.size}x{args.size} JPEG, {len(data) // 1024} KB")
+    for mode in ("inline", "pool"):
+        r = asyncio.run(run(mode, args.uploads, data))
+        print(
+            f"{r['mode']:>6}: {args.uploads} logos in {r['seconds']:.2f}s, "
+            f"event-loop lag p99 {r['p99_lag_ms']:.1f} ms, max {r['max_lag_ms']:.1f} ms"
+        )
+    shutdown_image_pool()
+
+if __name__ == "__main__":
+    main()
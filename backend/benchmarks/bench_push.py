@@ -0,0 +1,207 @@
+"""
+Server push (/events/stream) vs polling.
+
+1. Fan-out: `--workers` PushHubs attached to one LocalBroker (the local pub/sub
+   stand-in for the Realtime channel) with `--streams` subscriptions spread
+   over them. Per-user status events and opted-in broadcasts are published
+   from random workers; reports delivery latency and checks that every event
+   reached exactly the streams it belongs to.
+
+2. End to end: the real app against a local PostgREST stub. Opens SSE streams,
+   counts the stub's queries while they sit idle, then changes application
+   statuses through PATCH /admin/applications/{id} and measures how long the
+   applicants' streams take to see it. For comparison, one round of polling
+   /notifications/jobs is counted too.
+
+Run from backend/:
+    python -m benchmarks.bench_push --workers 4 --streams 2000 --events 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from benchmarks.stub_servers import SECRET, StubServer, configure_env, make_token, postgrest_stub_app
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+async def fan_out(args):
+    from app.core.push import AUDIENCE_JOB_ALERTS, LocalBroker, PushHub
+
+    broker = LocalBroker()
+    hubs = [PushHub(broker, queue_size=1000) for _ in range(args.workers)]
+    for hub in hubs:
+        await hub.start()
+
+    users = [f"user-{i}" for i in range(args.streams // 2 or 1)]
+    opted_in = {user for user in users if random.random() < 0.5}
+    subscriptions = []
+    for i in range(args.streams):
+        user = users[i % len(users)]
+        hub = hubs[i % len(hubs)]
+        subscriptions.append((user, hub.subscribe(user, job_alerts=user in opted_in)))
+
+    expected = {id(s): 0 for _, s in subscriptions}
+    streams_of = {}
+    for user, subscription in subscriptions:
+        streams_of.setdefault(user, []).append(subscription)
+
+    latencies = []
+    received = {id(s): 0 for _, s in subscriptions}
+
+    async def reader(subscription):
+        while True:
+            try:
+                message = await subscription.next(timeout=60)
+            except EOFError:
+                return
+            if message is None:
+                continue
+            latencies.append(time.perf_counter() - message["data"]["sent"])
+            received[id(subscription)] += 1
+
+    readers = [asyncio.create_task(reader(s)) for _, s in subscriptions]
+
+    start = time.perf_counter()
+    for i in range(args.events):
+        hub = random.choice(hubs)
+        if i % 10 == 0:
+            hub.publish("job_service", {"id": i, "sent": time.perf_counter()}, audience=AUDIENCE_JOB_ALERTS)
+            for user, subscription in subscriptions:
+                if user in opted_in:
+                    expected[id(subscription)] += 1
+        else:
+            user = random.choice(users)
+            hub.publish("application_status", {"submission_id": i, "sent": time.perf_counter()}, user_id=user)
+            for subscription in streams_of[user]:
+                expected[id(subscription)] += 1
+        # Let the readers run between events, as they would between requests
+        await asyncio.sleep(0)
+
+    total = sum(expected.values())
+    while sum(received.values()) < total and time.perf_counter() - start < 30:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    for hub in hubs:
+        await hub.stop()
+    await asyncio.gather(*readers)
+
+    wrong = sum(1 for key in expected if expected[key] != received[key])
+    print(
+        f"fan-out: {args.workers} workers, {args.streams} streams, {args.events} events -> "
+        f"{sum(received.values())}/{total} deliveries in {elapsed:.2f}s "
+        f"({sum(received.values()) / elapsed:,.0f}/s), latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms "
+        f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, streams with wrong counts: {wrong}"
+    )
+
+async def end_to_end(args, stub_app, api_url):
+    import httpx
+
+    users = [f"00000000-0000-0000-0000-{i:012d}" for i in range(args.e2e_streams)]
+    tokens = {user: make_token(SECRET, sub=user) for user in users}
+    admin = make_token(SECRET, app_metadata={"provider": "email", "role": "admin"})
+    seen = {}
+    ready = asyncio.Semaphore(0)
+
+    async def listen(client, user):
+        async with client.stream("GET", "/api/v1/events/stream", headers={"Authorization": f"Bearer {tokens[user]}"}) as response:
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: "):
+                    if event == "ready":
+                        ready.release()
+                    elif event == "application_status":
+                        data = json.loads(line[6:])
+                        seen[data["submission_id"]] = time.perf_counter()
+
+    limits = httpx.Limits(max_connections=args.e2e_streams + 10)
+    async with httpx.AsyncClient(base_url=api_url, timeout=None, limits=limits) as client:
+        listeners = [asyncio.create_task(listen(client, user)) for user in users]
+        for _ in users:
+            await ready.acquire()
+
+        before = stub_app.state.calls
+        await asyncio.sleep(args.idle)
+        idle_calls = stub_app.state.calls - before
+
+        sent = {}
+        for i, user in enumerate(users[: args.updates]):
+            submission_id = i + 1
+            sent[submission_id] = time.perf_counter()
+            response = await client.patch(
+                f"/api/v1/admin/applications/{submission_id}",
+                json={"status": "approved"},
+                headers={"Authorization": f"Bearer {admin}"},
+            )
+            response.raise_for_status()
+        deadline = time.perf_counter() + 10
+        while len(seen) < len(sent) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+
+        before = stub_app.state.calls
+        await asyncio.gather(*(
+            client.get("/api/v1/notifications/jobs", headers={"Authorization": f"Bearer {tokens[user]}"})
+            for user in users
+        ))
+        poll_calls = stub_app.state.calls - before
+
+        for task in listeners:
+            task.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+
+    latencies = [seen[i] - sent[i] for i in sent if i in seen]
+    print(
+        f"end to end: {len(users)} idle streams for {args.idle:.0f}s -> {idle_calls} database queries; "
+        f"one poll of /notifications/jobs by the same users -> {poll_calls} queries"
+    )
+    print(
+        f"            {len(latencies)}/{len(sent)} status changes pushed, PATCH-to-event latency "
+        f"p50 {statistics.median(latencies) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms"
+        if latencies else "            no status changes were pushed"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--streams", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--e2e-streams", type=int, default=100)
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds the streams sit idle")
+    args = parser.parse_args()
+    args.updates = min(args.updates, args.e2e_streams)
+
+    users = [f"00000000-0000-0000-0000-{i:012d}" for i in range(args.e2e_streams)]
+    now = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+    stub_app = postgrest_stub_app(latency=0.002, tables={
+        "users": [{"id": user, "job_notifications_enabled": True} for user in users],
+        "submissions": [{"id": i + 1, "user_id": user, "service_id": 1, "status": "pending"} for i, user in enumerate(users)],
+        "categories": [{"id": 1, "name": "Job Applications"}],
+        "services": [{"id": 1, "name": "Clerk", "category_id": 1, "is_active": True, "price": 100, "created_at": now}],
+    })
+    stub = StubServer(stub_app).start()
+    # Keep the webhook worker's polling out of the idle query count
+    configure_env(stub.url, WEBHOOK_POLL_INTERVAL=3600)
+
+    from app.main import app
+
+    asyncio.run(fan_out(args))
+
+    api = StubServer(app).start()
+    try:
+        asyncio.run(end_to_end(args, stub_app, api.url))
+    finally:
+        api.stop()
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
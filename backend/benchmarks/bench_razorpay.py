@@ -0,0 +1,161 @@
+"""
+Razorpay payment lookups against a local mock: the old blocking SDK call inside
+`async def` vs razorpay_gateway (thread pool + pooled session, memoized,
+circuit breaker).
+
+While `--requests` payment fetches run (mock latency `--latency`), a probe
+pings a trivial endpoint on the same server every 10ms; its latency shows
+how badly unrelated requests are stalled. Then it checks memoization,
+timeouts and the circuit breaker.
+
+Run from backend/:
+    python -m benchmarks.bench_razorpay --requests 40 --concurrency 20 --latency 0.3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.stub_servers import StubServer, configure_env, razorpay_stub_app
+
+def build_app():
+    import razorpay
+    from fastapi import FastAPI
+    from app.core.razorpay_gateway import razorpay_gateway
+
+    blocking_client = razorpay.Client(auth=(razorpay_gateway.key_id, razorpay_gateway.key_secret), base_url=razorpay_gateway.base_url)
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/blocking/{payment_id}")
+    async def blocking(payment_id: str):
+        # What verify_payment used to do
+        return blocking_client.payment.fetch(payment_id)
+
+    @app.get("/gateway/{payment_id}")
+    async def gateway(payment_id: str):
+        return await razorpay_gateway.fetch_payment(payment_id)
+
+    return app
+
+async def run_mode(base_url: str, mode: str, ids: list, concurrency: int) -> dict:
+    import httpx
+
+    queue = asyncio.Queue()
+    for payment_id in ids:
+        queue.put_nowait(payment_id)
+    pings = []
+    done = asyncio.Event()
+
+    async def fetcher(client):
+        while not queue.empty():
+            payment_id = queue.get_nowait()
+            response = await client.get(f"/{mode}/{payment_id}")
+            response.raise_for_status()
+
+    async def probe(client):
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            pings.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=httpx.Limits(max_connections=concurrency + 5)) as client:
+        probe_task = asyncio.create_task(probe(client))
+        start = time.perf_counter()
+        await asyncio.gather(*(fetcher(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    pings.sort()
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "rps": len(ids) / elapsed,
+        "ping_p50": statistics.median(pings),
+        "ping_max": pings[-1],
+    }
+
+async def check_resilience(stub_app, latency: float, timeout: float):
+    from app.core.razorpay_gateway import razorpay_gateway, RazorpayUnavailable
+
+    # Memoization: captured payments are fetched once
+    before = stub_app.state.payment_fetches
+    await asyncio.gather(*(razorpay_gateway.fetch_payment("pay_memo") for _ in range(50)))
+    await razorpay_gateway.fetch_payment("pay_memo")
+    print(f"memoized: 51 lookups of one captured payment -> {stub_app.state.payment_fetches - before} upstream fetch(es)")
+
+    # Timeout: a hung Razorpay costs at most RAZORPAY_TIMEOUT per call
+    stub_app.state.latency = timeout * 3
+    start = time.perf_counter()
+    try:
+        await razorpay_gateway.fetch_payment("pay_slow")
+    except RazorpayUnavailable:
+        pass
+    print(f"timeout: hung upstream gave up after {time.perf_counter() - start:.2f}s (RAZORPAY_TIMEOUT={timeout})")
+
+    # Circuit breaker: once open, calls fail fast without reaching Razorpay
+    stub_app.state.latency = latency
+    stub_app.state.down = True
+    before = stub_app.state.payment_fetches
+    start = time.perf_counter()
+    failed = 0
+    for i in range(30):
+        try:
+            await razorpay_gateway.fetch_payment(f"pay_down_{i}")
+        except RazorpayUnavailable:
+            failed += 1
+    print(
+        f"breaker: 30 calls while down -> {failed} failed, {stub_app.state.payment_fetches - before} reached the mock, "
+        f"{time.perf_counter() - start:.2f}s total, state {razorpay_gateway.breaker.state}"
+    )
+
+    stub_app.state.down = False
+    await asyncio.sleep(razorpay_gateway.breaker.reset_timeout)
+    await razorpay_gateway.fetch_payment("pay_00000")
+    print(f"breaker: after reset_timeout one trial call succeeded, state {razorpay_gateway.breaker.state}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="mock Razorpay latency per call (s)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="RAZORPAY_TIMEOUT")
+    args = parser.parse_args()
+
+    payments = {
+        f"pay_{i:05d}": {"id": f"pay_{i:05d}", "entity": "payment", "amount": 10000, "currency": "INR", "status": "captured"}
+        for i in range(args.requests * 2)
+    }
+    payments["pay_memo"] = dict(payments["pay_00000"], id="pay_memo")
+    stub_app = razorpay_stub_app(latency=args.latency, payments=payments)
+    stub = StubServer(stub_app).start()
+    configure_env(
+        RAZORPAY_KEY_ID="rzp_test_bench",
+        RAZORPAY_KEY_SECRET="bench-secret",
+        RAZORPAY_BASE_URL=stub.url,
+        RAZORPAY_TIMEOUT=args.timeout,
+        RAZORPAY_BREAKER_FAILURES=5,
+        RAZORPAY_BREAKER_RESET=2,
+    )
+    backend = StubServer(build_app()).start()
+
+    try:
+        ids = list(payments)
+        for mode, batch in (("blocking", ids[:args.requests]), ("gateway", ids[args.requests:args.requests * 2])):
+            r = asyncio.run(run_mode(backend.url, mode, batch, args.concurrency))
+            print(
+                f"{r['mode']:>8}: {r['rps']:6.1f} fetches/s, "
+                f"/ping p50 {r['ping_p50'] * 1000:7.1f}ms  max {r['ping_max'] * 1000:7.1f}ms"
+            )
+        asyncio.run(check_resilience(stub_app, args.latency, args.timeout))
+    finally:
+        backend.stop()
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+API cold start: how long a fresh worker takes to import the app and answer.
+
+1. Import profile: runs `python -X importtime -c "import app.main"` and lists
+   the slowest imports (cumulative) and the packages that cost the most in
+   total, plus which heavy modules (LangChain/openai, Razorpay) are loaded at
+   boot. They should not be: the chat agent and the payment gateway import
+   them on first use.
+
+2. Cold start: starts uvicorn in a fresh process, `--runs` times, against a
+   local PostgREST stub, and measures the time from spawning it until `/` and
+   then `/api/v1/services/` answer. "eager" pre-imports the heavy modules
+   before the app, which is how every worker used to boot.
+
+Run from backend/:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stub_servers import StubServer, app_env, free_port, postgrest_stub_app
+
+HEAVY_MODULES = ["langchain_openai", "langchain_core", "openai", "razorpay", "requests"]
+
+CATALOG = {
+    "categories": [{"id": 1, "name": "Job Applications", "is_active": True}],
+    "services": [
+        {"id": i, "name": f"Service {i}", "price": 100 + i, "category_id": 1, "is_active": True}
+        for i in range(1, 21)
+    ],
+}
+
+def parse_importtime(stderr: str) -> list:
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def import_profile(env: dict, top: int):
+    check = "import sys, app.main; print(' '.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    total = next(cumulative for name, _, cumulative, _ in rows if name == "app.main")
+
+    print(f"import app.main: {total / 1000:.0f} ms")
+    print(f"  slowest imports (cumulative):")
+    for name, _, cumulative, depth in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    by_package = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    print(f"  costliest packages (sum of self time):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {package}")
+
+    loaded = result.stdout.split()
+    print(f"  heavy modules loaded at boot: {', '.join(loaded) if loaded else 'none'}")
+
+    deferred = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main, langchain_openai, razorpay"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    first_use = sum(c for name, _, c, _ in parse_importtime(deferred.stderr) if name in ("langchain_openai", "razorpay"))
+    print(f"  deferred to first use (LangChain + Razorpay): {first_use / 1000:.0f} ms")
+
+def cold_start(env: dict, eager: bool) -> tuple:
+    port = free_port()
+    uvicorn_args = ["uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    if eager:
+        command = [sys.executable, "-c", (
+            "import sys, runpy, langchain_openai, razorpay; "
+            f"sys.argv = {uvicorn_args!r}; runpy.run_module('uvicorn', run_name='__main__')"
+        )]
+    else:
+        command = [sys.executable, "-m"] + uvicorn_args
+
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                try:
+                    client.get("/").raise_for_status()
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            root = time.perf_counter() - start
+            client.get("/api/v1/services/").raise_for_status()
+            services = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+    return root, services
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    stub = StubServer(postgrest_stub_app(latency=0.005, tables=CATALOG)).start()
+    # Keep the webhook worker quiet while we time requests
+    env = dict(os.environ, **app_env(stub.url, WEBHOOK_POLL_INTERVAL=3600))
+    try:
+        import_profile(env, args.top)
+        print()
+        for eager in (True, False):
+            # First run warms the OS file cache and bytecode; not counted
+            cold_start(env, eager)
+            runs = [cold_start(env, eager) for _ in range(args.runs)]
+            print(
+                f"cold start ({'eager' if eager else 'lazy'}, {args.runs} runs): "
+                f"'/' after {statistics.median(r[0] for r in runs) * 1000:.0f} ms, "
+                f"'/api/v1/services/' after {statistics.median(r[1] for r in runs) * 1000:.0f} ms (median)"
+            )
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
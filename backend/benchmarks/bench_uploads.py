@@ -0,0 +1,130 @@
+"""
+Peak memory of the backend while it receives concurrent large document uploads:
+the old handler (`await file.read()` then upload the bytes) vs the streaming
+one (/admin/applications/{id}/document: sniff + size check in place, spooled
+file streamed to Storage from a thread).
+
+Each mode runs the backend in its own uvicorn subprocess against a local
+PostgREST + Storage stub; peak RSS is the subprocess's VmHWM (Linux).
+
+Run from backend/:
+    python -m benchmarks.bench_uploads --uploads 50 --size-mb 20
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.stub_servers import SECRET, StubServer, configure_env, free_port, make_token, postgrest_stub_app, storage_stub_app
+
+def serve(mode: str, port: int):
+    """Subprocess entry point: the real app, plus the old upload handler in legacy mode."""
+    import uvicorn
+    from fastapi import Depends, File, UploadFile
+    from app.core.security import get_current_admin
+    from app.db import repository
+    from app.db.supabase import get_async_supabase
+    from app.main import app
+
+    if mode == "legacy":
+        @app.post("/legacy/applications/{id}/document")
+        async def legacy_upload(id: int, file: UploadFile = File(...), current_user: dict = Depends(get_current_admin)):
+            file_content = await file.read()
+            file_name = f"app_{id}_{time.time_ns()}.pdf"
+            db = await get_async_supabase()
+            await db.storage.from_("final-documents").upload(file_name, file_content, {"content-type": file.content_type})
+            await repository.update_submission(id, {"final_document_url": file_name})
+            return {"success": True, "file_path": file_name}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+def read_status(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) // 1024  # MB
+    return 0
+
+async def fire(url: str, path: str, uploads: int, payload: bytes, token: str) -> tuple:
+    import httpx
+
+    async def one(i: int, client):
+        response = await client.post(
+            path.format(id=i + 1),
+            files={"file": ("document.pdf", payload, "application/pdf")},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return response.status_code
+
+    async with httpx.AsyncClient(base_url=url, timeout=300, limits=httpx.Limits(max_connections=uploads)) as client:
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(one(i, client) for i in range(uploads)))
+        return statuses, time.perf_counter() - start
+
+def run_mode(mode: str, stub_url: str, args, payload: bytes, token: str) -> dict:
+    port = free_port()
+    env = dict(os.environ)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_uploads", "--serve", mode, "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        import httpx
+        url = f"http://127.0.0.1:{port}"
+        for _ in range(200):
+            try:
+                httpx.get(url + "/")
+                break
+            except httpx.TransportError:
+                time.sleep(0.05)
+        baseline = read_status(proc.pid, "VmRSS")
+        path = "/legacy/applications/{id}/document" if mode == "legacy" else "/api/v1/admin/applications/{id}/document"
+        statuses, seconds = asyncio.run(fire(url, path, args.uploads, payload, token))
+        peak = read_status(proc.pid, "VmHWM")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {
+        "mode": mode,
+        "ok": sum(1 for s in statuses if s == 200),
+        "statuses": sorted(set(statuses)),
+        "seconds": seconds,
+        "baseline_mb": baseline,
+        "peak_mb": peak,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--serve", choices=("legacy", "streaming"), help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    stub_app = postgrest_stub_app(latency=0.005, tables={"submissions": [{"id": i + 1} for i in range(args.uploads)]})
+    storage_stub_app(latency=0.01, app=stub_app)
+    stub = StubServer(stub_app).start()
+    configure_env(stub.url)
+
+    token = make_token(SECRET, app_metadata={"provider": "email", "role": "admin"})
+    payload = b"%PDF-1.7\n" + os.urandom(args.size_mb * 1024 * 1024 - 9)
+
+    try:
+        for mode in ("legacy", "streaming"):
+            r = run_mode(mode, stub.url, args, payload, token)
+            print(
+                f"{r['mode']:>9}: {r['ok']}/{args.uploads} x {args.size_mb} MB uploaded in {r['seconds']:.1f}s "
+                f"(statuses {r['statuses']}), RSS {r['baseline_mb']} MB idle -> peak {r['peak_mb']} MB"
+            )
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Concurrency benchmark for wallet credits against a local Postgres.
+
+Compares the old read-modify-write sequence (SELECT balance, UPDATE with the
+Python-computed balance, INSERT ledger row: three round trips) with the
+credit_wallet() function from the wallet migrations, firing
+parallel credits at a few hot wallets and checking for lost updates.
+
+Needs a scratch database it may create tables in, and psycopg:
+    pip install -r requirements-bench.txt
+
+Run from backend/:
+    python -m benchmarks.bench_wallet_credit --dsn postgresql://postgres@localhost/dsk_bench \\
+        --credits 2000 --concurrency 32 --users 5
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+MIGRATIONS = [
+    BACKEND_DIR / "migration_atomic_wallet_credit.sql",
+    BACKEND_DIR / "migration_payment_reference.sql",
+]
+
+# The subset of schema.sql the credit path touches (no auth schema locally)
+SCHEMA = """
+DROP TABLE IF EXISTS public.transactions;
+DROP TABLE IF EXISTS public.users;
+DO $$ BEGIN
+  CREATE TYPE transaction_type AS ENUM ('credit', 'debit');
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+  CREATE ROLE anon; EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+  CREATE ROLE authenticated; EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+  CREATE ROLE service_role; EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+CREATE TABLE public.users (
+  id uuid PRIMARY KEY,
+  wallet_balance decimal(10, 2) DEFAULT 0.00
+);
+CREATE TABLE public.transactions (
+  id uuid DEFAULT gen_random_uuid() PRIMARY KEY,
+  user_id uuid REFERENCES public.users(id),
+  amount decimal(10, 2) NOT NULL,
+  type transaction_type NOT NULL,
+  description text,
+  created_at timestamptz DEFAULT now()
+);
+"""
+
+async def legacy_credit(conn, user_id, amount):
+    # What wallet.credit_wallet used to do, one autocommit statement per PostgREST call
+    row = await (await conn.execute("SELECT wallet_balance FROM public.users WHERE id = %s", (user_id,))).fetchone()
+    new_balance = row[0] + amount
+    await conn.execute("UPDATE public.users SET wallet_balance = %s WHERE id = %s", (new_balance, user_id))
+    await conn.execute(
+        "INSERT INTO public.transactions (user_id, amount, type, description) VALUES (%s, %s, 'credit', 'bench')",
+        (user_id, amount),
+    )
+
+async def rpc_credit(conn, user_id, amount):
+    await conn.execute("SELECT public.credit_wallet(%s, %s, 'bench')", (user_id, amount))
+
+async def run(dsn: str, mode: str, credits: int, concurrency: int, users: int) -> dict:
+    import psycopg
+
+    async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as setup:
+        await setup.execute(SCHEMA)
+        for migration in MIGRATIONS:
+            await setup.execute(migration.read_text())
+        user_ids = [uuid.uuid4() for _ in range(users)]
+        for uid in user_ids:
+            await setup.execute("INSERT INTO public.users (id) VALUES (%s)", (uid,))
+
+    credit = legacy_credit if mode == "legacy" else rpc_credit
+    amount = Decimal("1.00")
+    remaining = iter(range(credits))
+
+    async def worker():
+        async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+            for i in remaining:
+                await credit(conn, user_ids[i % users], amount)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as check:
+        balance = (await (await check.execute("SELECT COALESCE(SUM(wallet_balance), 0) FROM public.users")).fetchone())[0]
+        ledger = (await (await check.execute("SELECT COALESCE(SUM(amount), 0) FROM public.transactions")).fetchone())[0]
+
+    return {
+        "mode": mode,
+        "credits": credits,
+        "seconds": elapsed,
+        "per_second": credits / elapsed,
+        "expected": amount * credits,
+        "balance": balance,
+        "ledger": ledger,
+        "lost": int((amount * credits - balance) / amount),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", required=True, help="scratch database; public.users/transactions are dropped and recreated")
+    parser.add_argument("--credits", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=5, help="wallets the credits are spread over")
+    args = parser.parse_args()
+
+    for mode in ("legacy", "rpc"):
+        r = asyncio.run(run(args.dsn, mode, args.credits, args.concurrency, args.users))
+        print(
+            f"{r['mode']:>6}: {r['per_second']:8.1f} credits/s, "
+            f"balance {r['balance']} / expected {r['expected']} (ledger {r['ledger']}), "
+            f"{r['lost']} lost updates"
+        )
+
+if __name__ == "__main__":
+    main()
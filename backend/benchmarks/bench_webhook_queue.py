@@ -0,0 +1,225 @@
+"""
+Burst test for the queued Razorpay webhook: how fast events are acknowledged,
+how long the outbox workers take to drain them, and whether every payment is
+credited exactly once.
+
+The backend runs under uvicorn (so the lifespan starts the outbox workers)
+against an in-memory PostgREST stub implementing enqueue_webhook_event,
+claim_webhook_events and credit_wallet. The burst mixes in:
+  - Razorpay retries (same X-Razorpay-Event-Id sent again),
+  - redeliveries of a payment under a new event id,
+  - transient credit_wallet failures (retried by the workers),
+  - payments for unknown users (dead-lettered after WEBHOOK_MAX_ATTEMPTS).
+
+Client, backend and stub share one Python process, so absolute throughput is
+bounded by the harness; the interesting numbers are ack latency (one insert,
+independent of crediting work) and whether the queue drains correctly.
+
+Run from backend/:
+    python -m benchmarks.bench_webhook_queue --events 5000 --concurrency 100 --latency 0.01
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.stub_servers import WEBHOOK_SECRET, PostgresError, StubServer, configure_env, postgrest_stub_app
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def outbox_rpcs(failure_rate: float, rng: random.Random) -> dict:
+    """Python versions of the SQL functions, run under the stub's table lock."""
+    keys = set()
+
+    def enqueue(tables, p):
+        key = (p["p_provider"], p["p_event_id"])
+        if key in keys:
+            return None
+        keys.add(key)
+        rows = tables.setdefault("webhook_events", [])
+        row = {
+            "id": len(rows) + 1,
+            "provider": p["p_provider"],
+            "event_id": p["p_event_id"],
+            "event": p["p_event"],
+            "payload": p["p_payload"],
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": _now().isoformat(),
+            "locked_until": None,
+            "last_error": None,
+        }
+        rows.append(row)
+        return row["id"]
+
+    def claim(tables, p):
+        now = _now()
+        claimed = []
+        for row in tables.get("webhook_events", []):
+            due = row["status"] == "pending" and datetime.fromisoformat(row["next_attempt_at"]) <= now
+            expired = row["status"] == "processing" and datetime.fromisoformat(row["locked_until"]) < now
+            if due or expired:
+                row["status"] = "processing"
+                row["attempts"] += 1
+                row["locked_until"] = (now + timedelta(seconds=p["p_lease_seconds"])).isoformat()
+                claimed.append(dict(row))
+                if len(claimed) >= p["p_limit"]:
+                    break
+        return claimed
+
+    def credit_wallet(tables, p):
+        user = next((u for u in tables["users"] if u["id"] == p["p_user_id"]), None)
+        if user is None:
+            raise PostgresError("User not found", code="P0002")
+        if rng.random() < failure_rate:
+            raise Exception("could not serialize access (simulated)")
+        ledger = tables.setdefault("transactions", [])
+        ref = p.get("p_payment_reference")
+        if ref and any(t.get("payment_reference") == ref for t in ledger):
+            return {"success": True, "duplicate": True, "new_balance": user["wallet_balance"]}
+        user["wallet_balance"] += p["p_amount"]
+        ledger.append({"user_id": user["id"], "amount": p["p_amount"], "payment_reference": ref})
+        return {"success": True, "duplicate": False, "new_balance": user["wallet_balance"]}
+
+    return {"enqueue_webhook_event": enqueue, "claim_webhook_events": claim, "credit_wallet": credit_wallet}
+
+def build_burst(events: int, users: list, rng: random.Random, retry_rate: float, redeliver_rate: float, poison_rate: float):
+    """Returns (deliveries, expected credit per user, number of distinct poison events)."""
+    deliveries, expected, poison = [], {u: 0.0 for u in users}, 0
+    for i in range(events):
+        payment_id = f"pay_{i:08d}"
+        is_poison = rng.random() < poison_rate
+        if is_poison:
+            user_id, poison = str(uuid.uuid4()), poison + 1
+        else:
+            user_id = rng.choice(users)
+            expected[user_id] += 100.0
+        body = json.dumps({
+            "event": "payment.captured",
+            "payload": {"payment": {"entity": {
+                "id": payment_id, "amount": 10000, "status": "captured",
+                "notes": {"user_id": user_id, "plan_name": "Go"},
+            }}},
+        }).encode()
+        event_id = f"evt_{i:08d}"
+        deliveries.append((event_id, body))
+        if rng.random() < retry_rate:
+            deliveries.append((event_id, body))
+        if rng.random() < redeliver_rate:
+            deliveries.append((f"evt_{i:08d}_again", body))
+            poison += is_poison
+    rng.shuffle(deliveries)
+    return deliveries, expected, poison
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def fire(base_url: str, deliveries: list, concurrency: int):
+    import httpx
+
+    queue = asyncio.Queue()
+    for item in deliveries:
+        queue.put_nowait(item)
+    latencies, failures = [], 0
+
+    async def worker(client):
+        nonlocal failures
+        while not queue.empty():
+            event_id, body = queue.get_nowait()
+            signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    "/api/v1/wallet/razorpay-webhook",
+                    content=body,
+                    headers={"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": event_id, "Content-Type": "application/json"},
+                )
+                ok = response.status_code == 200
+            except httpx.TransportError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                failures += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, failures, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000, help="distinct payments in the burst")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4, help="WEBHOOK_WORKERS")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01, help="stub PostgREST latency per call (s)")
+    parser.add_argument("--retry-rate", type=float, default=0.1)
+    parser.add_argument("--redeliver-rate", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="transient credit_wallet failures")
+    parser.add_argument("--poison-rate", type=float, default=0.01, help="payments for unknown users")
+    parser.add_argument("--timeout", type=float, default=300, help="give up draining after this many seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    tables = {"users": [{"id": u, "wallet_balance": 0.0} for u in users]}
+    stub = StubServer(postgrest_stub_app(latency=args.latency, tables=tables, rpcs=outbox_rpcs(args.failure_rate, rng))).start()
+    configure_env(
+        stub.url,
+        RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET,
+        WEBHOOK_WORKERS=args.workers,
+        WEBHOOK_MAX_ATTEMPTS=6,
+        WEBHOOK_RETRY_BASE=0.02,
+        WEBHOOK_POLL_INTERVAL=0.2,
+    )
+
+    from app.main import app
+
+    backend = StubServer(app).start()
+    deliveries, expected, poison = build_burst(args.events, users, rng, args.retry_rate, args.redeliver_rate, args.poison_rate)
+
+    try:
+        latencies, failures, ack_seconds = asyncio.run(fire(backend.url, deliveries, args.concurrency))
+        print(
+            f"acked {len(deliveries)} deliveries ({args.events} payments) in {ack_seconds:.2f}s "
+            f"= {len(deliveries) / ack_seconds:.0f}/s, {failures} non-200"
+        )
+        print(
+            f"ack latency p50 {percentile(latencies, 50) * 1000:.1f}ms  "
+            f"p95 {percentile(latencies, 95) * 1000:.1f}ms  p99 {percentile(latencies, 99) * 1000:.1f}ms  "
+            f"mean {statistics.mean(latencies) * 1000:.1f}ms"
+        )
+
+        drain_start = time.perf_counter()
+        while time.perf_counter() - drain_start < args.timeout:
+            rows = list(tables.get("webhook_events", []))
+            if rows and all(r["status"] in ("done", "dead") for r in rows):
+                break
+            time.sleep(0.1)
+        drain_seconds = time.perf_counter() - drain_start
+    finally:
+        backend.stop()
+        stub.stop()
+
+    rows = tables.get("webhook_events", [])
+    status = {s: sum(1 for r in rows if r["status"] == s) for s in ("pending", "processing", "done", "dead")}
+    wrong = [u for u in users if abs(next(x for x in tables["users"] if x["id"] == u)["wallet_balance"] - expected[u]) > 1e-6]
+    print(f"queued {len(rows)} unique events, drained {drain_seconds:.2f}s after the burst: {status}")
+    print(f"dead-lettered {status['dead']} (expected {poison} events for unknown users)")
+    print(f"wallets with a wrong balance: {len(wrong)} of {len(users)}")
+    if failures or wrong or status["pending"] or status["processing"] or status["dead"] != poison:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
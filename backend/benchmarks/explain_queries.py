@@ -0,0 +1,216 @@
+"""
+EXPLAIN ANALYZE of the hot queries before and after migration_hot_path_indexes.sql,
+on a database filled by benchmarks.gen_dataset.
+
+The queries are the SQL equivalents of what the endpoints and dashboard pages
+ask PostgREST for. Embedded resources become lateral joins and the
+admin_stats() RPC is inlined. Parameters are picked from the data, using the
+most active user and service (worst case), so runs on the same dataset are
+comparable.
+
+Steps:
+  1. drop the migration's indexes (if a previous run left them), ANALYZE,
+     capture plans ("before");
+  2. apply the migration statement by statement (statements that fail, e.g.
+     pg_trgm on a Postgres without it, are reported and skipped), ANALYZE,
+     capture plans ("after").
+Each query runs `--repeat` times after one warm-up; the median execution
+time is reported. The plans are written as text to `--out`/{before,after}/,
+with summary.json next to them. Pass --keep to leave the indexes in place.
+job_category only uses the trigram index once categories is large enough for
+a scan to cost more (e.g. gen_dataset --categories 50000), and needs pg_trgm
+to be available to the server.
+
+Needs psycopg 3 (pip install -r requirements-bench.txt).
+
+Run from backend/ (after gen_dataset):
+    python -m benchmarks.explain_queries --dsn postgresql://postgres@localhost/dsk_bench
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+
+import psycopg
+from psycopg import sql
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATION = os.path.join(BACKEND_DIR, "migration_hot_path_indexes.sql")
+
+SUBMISSION_COLUMNS = "s.id, s.user_id, s.service_id, s.status, s.final_document_url, s.created_at, s.data"
+
+# name -> (what runs it, SQL with {placeholders} filled from pick_parameters)
+QUERIES = {
+    "admin_applications": ("GET /admin/applications", f"""
+        select {SUBMISSION_COLUMNS}, u.email
+        from submissions s left join lateral (select email from users where id = s.user_id) u on true
+        order by s.created_at desc, s.id desc limit 51"""),
+    "admin_applications_status": ("GET /admin/applications?status=pending", f"""
+        select {SUBMISSION_COLUMNS}, u.email
+        from submissions s left join lateral (select email from users where id = s.user_id) u on true
+        where s.status = 'pending'
+        order by s.created_at desc, s.id desc limit 51"""),
+    "admin_applications_page_20": ("GET /admin/applications?cursor=... (page 20)", f"""
+        select {SUBMISSION_COLUMNS}, u.email
+        from submissions s left join lateral (select email from users where id = s.user_id) u on true
+        where s.created_at < {{cursor_created_at}} or (s.created_at = {{cursor_created_at}} and s.id < {{cursor_id}})
+        order by s.created_at desc, s.id desc limit 51"""),
+    "admin_stats": ("GET /admin/stats (admin_stats RPC)", """
+        select (select count(*) from users), (select count(*) from services),
+               coalesce(sum(n), 0),
+               coalesce(sum(n) filter (where status = 'pending'), 0),
+               coalesce(sum(n) filter (where status = 'approved'), 0),
+               coalesce(sum(n) filter (where status = 'rejected'), 0)
+        from (select status, count(*) as n from submissions group by status) s"""),
+    "service_delete_submissions": ("DELETE /services/{id} (submissions of the service)", """
+        select count(*) from submissions where service_id = {service_id}"""),
+    "user_submissions": ("dashboard: own submissions", """
+        select s.*, sv.name
+        from submissions s left join lateral (select name from services where id = s.service_id) sv on true
+        where s.user_id = {user_id} order by s.created_at desc"""),
+    "user_service_submissions": ("service page: own submissions of one service", """
+        select * from submissions where user_id = {user_id} and service_id = {service_id} order by created_at desc"""),
+    "wallet_history": ("history page: transactions", """
+        select * from transactions where user_id = {user_id} order by created_at desc"""),
+    "topup_rate_limit": ("credit_wallet_topup: recent credits", """
+        select count(*) from transactions
+        where user_id = {user_id} and type = 'credit' and created_at > {recent}"""),
+    "payment_duplicate": ("credit_wallet: payment_reference conflict check", """
+        select id from transactions where payment_reference = {payment_reference}"""),
+    "webhook_user_by_email": ("POST /wallet/razorpay-webhook: payer by email", """
+        select id from users where email = {email} limit 1"""),
+    "login_history": ("history page: logins", """
+        select * from login_history where user_id = {user_id} order by login_at desc"""),
+    "category_services": ("category page: active services", """
+        select * from services where category_id = {category_id} and is_active order by name"""),
+    "admin_services": ("admin services page", """
+        select s.*, c.name as category
+        from services s left join lateral (select name from categories where id = s.category_id) c on true
+        order by s.created_at desc"""),
+    "active_jobs": ("GET /jobs/", """
+        select * from job_notifications where is_active order by created_at desc"""),
+    "job_category": ("job alerts: job category lookup", """
+        select id, name from categories where name ilike '%job%' order by id"""),
+}
+
+def migration_statements() -> list:
+    with open(MIGRATION) as f:
+        text = "\n".join(line for line in f.read().splitlines() if not line.lstrip().startswith("--"))
+    return [statement.strip() for statement in text.split(";") if statement.strip()]
+
+def migration_indexes() -> list:
+    with open(MIGRATION) as f:
+        return re.findall(r"CREATE INDEX IF NOT EXISTS (\w+)", f.read())
+
+def pick_parameters(conn) -> dict:
+    user_id, = conn.execute("select user_id from submissions group by user_id order by count(*) desc, user_id limit 1").fetchone()
+    service_id, = conn.execute("select service_id from submissions group by service_id order by count(*) desc, service_id limit 1").fetchone()
+    cursor_created_at, cursor_id = conn.execute(
+        "select created_at, id from submissions order by created_at desc, id desc offset 1000 limit 1"
+    ).fetchone()
+    email, = conn.execute("select email from users where id = %s", (user_id,)).fetchone()
+    recent, = conn.execute("select max(created_at) - interval '5 minutes' from transactions").fetchone()
+    payment_reference, = conn.execute(
+        "select payment_reference from transactions where payment_reference is not null order by payment_reference limit 1"
+    ).fetchone()
+    category_id, = conn.execute("select category_id from services where is_active group by 1 order by count(*) desc, 1 limit 1").fetchone()
+    return {
+        "user_id": user_id, "service_id": service_id, "cursor_created_at": cursor_created_at, "cursor_id": cursor_id,
+        "email": email, "recent": recent, "payment_reference": payment_reference, "category_id": category_id,
+    }
+
+def plan_summary(node: dict) -> list:
+    """The scans (and sorts) of a plan, e.g. ['Index Scan using x on submissions', 'Sort']."""
+    steps = []
+    kind = node["Node Type"]
+    if "Scan" in kind:
+        label = kind
+        if node.get("Index Name"):
+            label += f" using {node['Index Name']}"
+        if node.get("Relation Name"):
+            label += f" on {node['Relation Name']}"
+        steps.append(label)
+    elif kind in ("Sort", "Incremental Sort"):
+        steps.append(kind)
+    for child in node.get("Plans", []):
+        steps.extend(plan_summary(child))
+    return steps
+
+def capture(conn, params: dict, repeat: int, out_dir: str) -> dict:
+    os.makedirs(out_dir, exist_ok=True)
+    results = {}
+    for name, (_, query) in QUERIES.items():
+        statement = sql.SQL(query).format(**{key: sql.Literal(value) for key, value in params.items()})
+        conn.execute(statement)  # warm-up
+        timings = []
+        for _ in range(repeat):
+            plan = conn.execute(sql.SQL("explain (analyze, buffers, format json) ") + statement).fetchone()[0][0]
+            timings.append(plan["Execution Time"])
+        text = conn.execute(sql.SQL("explain (analyze, buffers) ") + statement).fetchall()
+        with open(os.path.join(out_dir, f"{name}.txt"), "w") as f:
+            f.write(statement.as_string(conn).strip() + "\n\n" + "\n".join(row[0] for row in text) + "\n")
+        results[name] = {
+            "execution_ms": statistics.median(timings),
+            "planning_ms": plan["Planning Time"],
+            "rows": plan["Plan"].get("Actual Rows"),
+            "plan": plan_summary(plan["Plan"]),
+        }
+    return results
+
+def analyze(conn):
+    for table in ("users", "services", "categories", "submissions", "transactions", "login_history", "job_notifications"):
+        conn.execute(f"analyze {table}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL", "postgresql://postgres@localhost/dsk_bench"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default="explain_plans", help="directory for the captured plans")
+    parser.add_argument("--keep", action="store_true", help="leave the indexes in place afterwards")
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        if conn.execute("select to_regclass('public.submissions') is null").fetchone()[0]:
+            raise SystemExit("no submissions table: fill the database with benchmarks.gen_dataset first")
+        counts = conn.execute("select (select count(*) from submissions), (select count(*) from transactions)").fetchone()
+        print(f"dataset: {counts[0]:,} submissions, {counts[1]:,} transactions")
+
+        for index in migration_indexes():
+            conn.execute(sql.SQL("drop index if exists {}").format(sql.Identifier(index)))
+        analyze(conn)
+        params = pick_parameters(conn)
+        before = capture(conn, params, args.repeat, os.path.join(args.out, "before"))
+
+        for statement in migration_statements():
+            started = time.perf_counter()
+            try:
+                conn.execute(statement)
+                outcome = f"{time.perf_counter() - started:.1f}s"
+            except psycopg.Error as e:
+                outcome = f"skipped: {str(e).splitlines()[0]}"
+            print(f"  {' '.join(statement.split())[:80]:<80}  {outcome}")
+        analyze(conn)
+        after = capture(conn, params, args.repeat, os.path.join(args.out, "after"))
+
+        if not args.keep:
+            for index in migration_indexes():
+                conn.execute(sql.SQL("drop index if exists {}").format(sql.Identifier(index)))
+
+    print()
+    print(f"{'query':<28} {'before ms':>10} {'after ms':>10} {'speedup':>8}  plan after")
+    for name, (endpoint, _) in QUERIES.items():
+        b, a = before[name], after[name]
+        speedup = b["execution_ms"] / a["execution_ms"] if a["execution_ms"] else float("inf")
+        print(f"{name:<28} {b['execution_ms']:>10.2f} {a['execution_ms']:>10.2f} {speedup:>7.1f}x  {', '.join(a['plan'])}")
+
+    with open(os.path.join(args.out, "summary.json"), "w") as f:
+        json.dump({"parameters": {k: str(v) for k, v in params.items()}, "queries": {
+            name: {"endpoint": endpoint, "before": before[name], "after": after[name]}
+            for name, (endpoint, _) in QUERIES.items()
+        }}, f, indent=2)
+    print(f"plans written to {args.out}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+Synthetic dataset for scale-testing the schema on a local Postgres.
+
+Creates the tables from schema.sql plus the migrations, in the order
+MIGRATIONS lists them. Supabase-only pieces get small stand-ins: the auth and
+storage schemas, an extensions schema on the database's search_path,
+auth.uid(), the anon/authenticated/service_role roles, and uuid_generate_v4()
+when uuid-ossp is not installed. Then it streams rows into
+every table with COPY and no per-row round trips:
+
+  users (+ auth.users)  skewed activity, ~30% with job alerts on
+  categories            "Job Applications" first, a few inactive
+  services              form `fields` jsonb in the FormBuilder shape
+  submissions           `data` keyed by the service's field ids; recent ones
+                        mostly pending, older ones mostly approved/rejected
+  transactions          one debit per submission ("Application fee for ..."),
+                        the rest are Razorpay credits with payment_reference
+  login_history, job_notifications, webhook_events
+
+Output is deterministic: the same --seed and volumes give the same rows,
+ids and timestamps (which end at --end, not now), so plans and timings can
+be reproduced. Triggers and foreign-key checks are skipped while loading
+(session_replication_role = replica); the rows are consistent by construction.
+Afterwards, wallet balances are set from the ledger, sequences are advanced
+past the loaded ids and every table is analyzed.
+
+Needs psycopg 3 (pip install -r requirements-bench.txt) and a database you can drop
+tables in. It refuses to touch a database that already has public.users
+unless you pass --reset, which drops the public, auth and storage schemas first.
+
+Run from backend/:
+    python -m benchmarks.gen_dataset --dsn postgresql://postgres@localhost/dsk_bench --reset
+    python -m benchmarks.gen_dataset --dsn ... --reset --submissions 1000000 --transactions 5000000
+"""
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from array import array
+from datetime import datetime, timezone
+
+import psycopg
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Applied after schema.sql, oldest first
+MIGRATIONS = [
+    "migration_privacy_security.sql",
+    "add_job_notifications_column.sql",
+    "enable_rls_categories.sql",
+    "job_notifications.sql",
+    "migration_wallet_credit.sql",
+    "migration_atomic_wallet_credit.sql",
+    "migration_payment_reference.sql",
+    "migration_admin_stats.sql",
+    "migration_webhook_outbox.sql",
+    "migration_logo_variants.sql",
+]
+
+SUPABASE_STANDINS = """
+create schema if not exists auth;
+create table if not exists auth.users (id uuid primary key, email text);
+create or replace function auth.uid() returns uuid language sql stable as
+  $$ select nullif(current_setting('request.jwt.claim.sub', true), '')::uuid $$;
+create schema if not exists storage;
+create table if not exists storage.buckets (id text primary key, name text, public boolean);
+-- Supabase installs extensions (pg_trgm, ...) into their own schema, which is on the search_path
+create schema if not exists extensions;
+do $$
+begin
+  execute format('alter database %I set search_path = "$user", public, extensions', current_database());
+end $$;
+set search_path = "$user", public, extensions;
+do $$
+declare r text;
+begin
+  foreach r in array array['anon', 'authenticated', 'service_role'] loop
+    if not exists (select 1 from pg_roles where rolname = r) then
+      execute format('create role %I nologin', r);
+    end if;
+  end loop;
+end $$;
+"""
+
+UUID_OSSP = 'create extension if not exists "uuid-ossp";'
+
+CATEGORIES = [
+    ("Job Applications", "briefcase"), ("Government Certificates", "file-text"), ("Licences", "id-card"),
+    ("Scholarships", "graduation-cap"), ("Utility Bills", "zap"), ("Banking", "landmark"),
+    ("Travel & Passport", "plane"), ("Education", "book"), ("Health", "heart"), ("Tax Filing", "calculator"),
+    ("Land Records", "map"), ("Pensions", "wallet"), ("Vehicle Services", "car"), ("Insurance", "shield"),
+]
+SERVICE_WORDS = ["Application", "Registration", "Renewal", "Certificate", "Correction", "Verification", "Enrollment", "Claim"]
+PRICES = [20, 30, 50, 75, 100, 150, 200, 250, 350, 500]
+FIELD_TEMPLATES = [
+    ("Full Name", "text"), ("Father's Name", "text"), ("Date of Birth", "date"), ("Email", "email"),
+    ("Mobile Number", "number"), ("Address", "textarea"), ("Aadhaar Number", "number"),
+    ("Gender", "select", ["Male", "Female", "Other"]), ("Category", "select", ["General", "OBC", "SC", "ST"]),
+    ("Qualification", "select", ["10th", "12th", "Graduate", "Post Graduate"]),
+    ("Photo", "file"), ("Signature", "file"), ("Previous Certificate", "file"), ("Remarks", "textarea"),
+]
+USER_AGENTS = [
+    "Mozilla/5.0 (Linux; Android 13; SM-A146B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 12; Redmi Note 11) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0 Mobile Safari/537.36",
+]
+PLANS = [("Go", 100), ("Pro", 300), ("Plus", 600)]
+
+BATCH_ROWS = 10_000
+
+def _escape(value: str) -> str:
+    # COPY text format: backslash, tab and newlines must be escaped
+    if "\\" in value or "\t" in value or "\n" in value or "\r" in value:
+        value = value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return value
+
+def _json(value) -> str:
+    return _escape(json.dumps(value, separators=(",", ":")))
+
+def _ts(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch)) + "+00"
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _skewed(rng: random.Random, n: int, power: float = 2.0) -> int:
+    """0..n-1, low indexes far more likely (a few users/services get most of the traffic)."""
+    return min(n - 1, int(n * rng.random() ** power))
+
+def _ip(rng: random.Random) -> str:
+    return f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+class Loader:
+    def __init__(self, conn: psycopg.Connection, args):
+        self.conn = conn
+        self.args = args
+        self.end = datetime.strptime(args.end, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+        self.start = self.end - args.days * 86400
+
+    def rng(self, table: str) -> random.Random:
+        # One stream per table, so changing one volume does not reshuffle the others
+        return random.Random(f"{self.args.seed}:{table}")
+
+    def when(self, rng: random.Random, after: float = None) -> float:
+        """A timestamp in [after, end], denser towards the end (the platform keeps growing)."""
+        low = self.start if after is None else max(after, self.start)
+        return low + (self.end - low) * rng.random() ** 0.5
+
+    def columns(self, table: str) -> set:
+        schema, _, name = table.rpartition(".")
+        rows = self.conn.execute(
+            "select column_name from information_schema.columns where table_schema = %s and table_name = %s",
+            (schema or "public", name),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def copy(self, table: str, columns: list, rows):
+        """Stream rows (tuples of already formatted text, None for NULL) into table."""
+        missing = [c for c in columns if c not in self.columns(table)]
+        if missing:
+            raise SystemExit(f"{table} has no column(s) {', '.join(missing)}: schema.sql and the generator disagree")
+
+        started = time.perf_counter()
+        count = 0
+        with self.conn.cursor() as cur:
+            with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                batch = []
+                for row in rows:
+                    batch.append("\t".join("\\N" if v is None else v for v in row))
+                    if len(batch) >= BATCH_ROWS:
+                        copy.write("\n".join(batch) + "\n")
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    copy.write("\n".join(batch) + "\n")
+                    count += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"  {table:<26} {count:>10,} rows in {elapsed:6.1f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)", flush=True)
+
+    # --- tables ---
+
+    def users(self):
+        rng = self.rng("users")
+        self.user_ids = []
+        self.user_created = array("d")
+        rows = []
+        for i in range(self.args.users):
+            user_id = _uuid(rng)
+            created = self.when(rng)
+            self.user_ids.append(user_id)
+            self.user_created.append(created)
+            accepted = rng.random() < 0.95
+            rows.append((
+                user_id, f"user{i:07d}@example.com", "admin" if i < 3 else "user", "0.00",
+                "t" if accepted else "f", _ts(created + 60) if accepted else None, _ip(rng), _ts(created),
+                "t" if rng.random() < 0.3 else "f",
+            ))
+        self.copy("auth.users", ["id", "email"], ((r[0], r[1]) for r in rows))
+        self.copy("public.users", [
+            "id", "email", "role", "wallet_balance", "privacy_policy_accepted", "accepted_at",
+            "ip_address", "created_at", "job_notifications_enabled",
+        ], rows)
+
+    def categories(self):
+        rng = self.rng("categories")
+        count = self.args.categories
+        names = [CATEGORIES[i % len(CATEGORIES)] for i in range(count)]
+        self.copy("public.categories", ["id", "name", "icon", "is_active", "created_at"], (
+            (str(i + 1), name if i < len(CATEGORIES) else f"{name} {i // len(CATEGORIES) + 1}", icon,
+             "t" if i == 0 or rng.random() < 0.85 else "f", _ts(self.start + i * 3600))
+            for i, (name, icon) in enumerate(names)
+        ))
+
+    def services(self):
+        rng = self.rng("services")
+        self.service_fields = []
+        self.service_price = array("d")
+        self.service_names = []
+        rows = []
+        for i in range(self.args.services):
+            category = _skewed(rng, self.args.categories, 1.5) + 1
+            category_name = CATEGORIES[(category - 1) % len(CATEGORIES)][0]
+            name = f"{category_name.split()[0]} {rng.choice(SERVICE_WORDS)} {i + 1}"
+            fields = []
+            for template in rng.sample(FIELD_TEMPLATES, rng.randint(3, 10)):
+                field = {"id": _uuid(rng), "label": template[0], "type": template[1], "required": rng.random() < 0.7}
+                if len(template) > 2:
+                    field["options"] = template[2]
+                fields.append(field)
+            price = rng.choice(PRICES)
+            self.service_fields.append(fields)
+            self.service_price.append(price)
+            self.service_names.append(name)
+            rows.append((
+                str(i + 1), str(category), _escape(name), _escape(f"Apply for {name} online. Documents are verified within 3 working days."),
+                f"{price:.2f}", f"https://cdn.example.com/logos/{i + 1}.png", _json(fields),
+                "t" if rng.random() < 0.85 else "f", _ts(self.start + rng.random() * (self.end - self.start) * 0.8),
+            ))
+        self.copy("public.services", [
+            "id", "category_id", "name", "description", "price", "logo_url", "fields", "is_active", "created_at",
+        ], rows)
+
+    def _field_value(self, rng: random.Random, field: dict, submission_id: int, user_id: str):
+        kind = field["type"]
+        if kind == "file":
+            return f"uploads/{user_id}/{submission_id}-{field['id'][:8]}.pdf"
+        if kind == "select":
+            return rng.choice(field["options"])
+        if kind == "date":
+            return f"{rng.randint(1960, 2006)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if kind == "number":
+            return str(rng.randrange(10 ** 9, 10 ** 10))
+        if kind == "email":
+            return f"applicant{submission_id}@example.com"
+        if kind == "textarea":
+            return f"House {rng.randint(1, 999)}, Ward {rng.randint(1, 40)}, District {rng.randint(1, 30)}"
+        return f"Applicant {submission_id}"
+
+    def submissions(self):
+        rng = self.rng("submissions")
+        users, services = self.args.users, self.args.services
+        self.sub_user = array("l")
+        self.sub_service = array("l")
+        self.sub_created = array("d")
+
+        def rows():
+            for i in range(1, self.args.submissions + 1):
+                user = _skewed(rng, users, 1.6)
+                service = _skewed(rng, services, 2.2)
+                user_id = self.user_ids[user]
+                created = self.when(rng, after=self.user_created[user])
+                age_days = (self.end - created) / 86400
+                roll = rng.random()
+                if age_days < 3:
+                    status = "pending" if roll < 0.7 else ("approved" if roll < 0.92 else "rejected")
+                else:
+                    status = "approved" if roll < 0.75 else ("rejected" if roll < 0.9 else "pending")
+                data = {f["id"]: self._field_value(rng, f, i, user_id) for f in self.service_fields[service]}
+                data["user_id"] = user_id
+                document = f"final-documents/{user_id}/{i}.pdf" if status == "approved" and rng.random() < 0.8 else None
+                self.sub_user.append(user)
+                self.sub_service.append(service)
+                self.sub_created.append(created)
+                yield (
+                    str(i), user_id, str(service + 1), _json(data), status, document,
+                    "f", _ip(rng), _ts(created),
+                )
+
+        self.copy("public.submissions", [
+            "id", "user_id", "service_id", "data", "status", "final_document_url",
+            "captcha_verified", "submitted_ip", "created_at",
+        ], rows())
+
+    def transactions(self):
+        rng = self.rng("transactions")
+        debits = min(self.args.transactions, self.args.submissions)
+
+        def rows():
+            # The application fee of each submission, as submit_application records it
+            for i in range(debits):
+                service = self.sub_service[i]
+                yield (
+                    _uuid(rng), self.user_ids[self.sub_user[i]], f"{self.service_price[service]:.2f}", "debit",
+                    _escape(f"Application fee for {self.service_names[service]}"), None, _ts(self.sub_created[i] - 1),
+                )
+            # Wallet top-ups: Razorpay payments (with a unique payment_reference) and a few manual credits
+            for i in range(self.args.transactions - debits):
+                user = _skewed(rng, self.args.users, 1.6)
+                created = self.when(rng, after=self.user_created[user])
+                if rng.random() < 0.97:
+                    plan, amount = rng.choice(PLANS)
+                    payment_id = f"pay_{rng.getrandbits(64):016x}{i:x}"
+                    description, reference = f"{plan} Plan - Razorpay Payment: {payment_id}", payment_id
+                else:
+                    amount, description, reference = rng.choice([50, 100, 500]), "Top-up Plan - Wallet Top-up", None
+                yield (_uuid(rng), self.user_ids[user], f"{amount:.2f}", "credit", description, reference, _ts(created))
+
+        self.copy("public.transactions", [
+            "id", "user_id", "amount", "type", "description", "payment_reference", "created_at",
+        ], rows())
+
+    def login_history(self):
+        rng = self.rng("login_history")
+
+        def rows():
+            for _ in range(self.args.logins):
+                user = _skewed(rng, self.args.users, 1.6)
+                yield (_uuid(rng), self.user_ids[user], _ip(rng), rng.choice(USER_AGENTS), _ts(self.when(rng, after=self.user_created[user])))
+
+        self.copy("public.login_history", ["id", "user_id", "ip_address", "user_agent", "login_at"], rows())
+
+    def job_notifications(self):
+        rng = self.rng("job_notifications")
+        # id is GENERATED ALWAYS, so it is left to the identity
+        self.copy("public.job_notifications", ["title", "description", "link", "is_active", "created_at"], (
+            (f"Recruitment {i + 1}: {rng.choice(['Clerk', 'Constable', 'Teacher', 'Nurse', 'Engineer'])} posts",
+             f"{rng.randint(10, 900)} vacancies. Last date in {rng.randint(7, 45)} days.",
+             f"https://jobs.example.com/notice/{i + 1}", "t" if rng.random() < 0.4 else "f", _ts(self.when(rng)))
+            for i in range(self.args.jobs)
+        ))
+
+    def webhook_events(self):
+        rng = self.rng("webhook_events")
+
+        def rows():
+            for i in range(1, self.args.webhooks + 1):
+                user = _skewed(rng, self.args.users, 1.6)
+                created = self.when(rng, after=self.user_created[user])
+                payment_id = f"pay_wh{i:012d}"
+                payload = {"event": "payment.captured", "payload": {"payment": {"entity": {
+                    "id": payment_id, "amount": 10000, "status": "captured",
+                    "notes": {"user_id": self.user_ids[user], "plan_name": "Go"},
+                }}}}
+                dead = rng.random() < 0.005
+                yield (
+                    str(i), "razorpay", f"evt_{i:012d}", "payment.captured", _json(payload),
+                    "dead" if dead else "done", str(6 if dead else 1), _ts(created),
+                    "User not found" if dead else None, _ts(created), None if dead else _ts(created + 1),
+                )
+
+        self.copy("public.webhook_events", [
+            "id", "provider", "event_id", "event", "payload", "status", "attempts", "next_attempt_at",
+            "last_error", "created_at", "processed_at",
+        ], rows())
+
+    def finish(self):
+        started = time.perf_counter()
+        self.conn.execute("""
+            update public.users u
+            set wallet_balance = greatest(0, t.balance)
+            from (
+              select user_id, sum(case when type = 'credit' then amount else -amount end) as balance
+              from public.transactions group by user_id
+            ) t
+            where u.id = t.user_id
+        """)
+        for table in ("categories", "services", "submissions", "webhook_events"):
+            self.conn.execute(
+                f"select setval(pg_get_serial_sequence('public.{table}', 'id'), coalesce((select max(id) from public.{table}), 1))"
+            )
+        self.conn.commit()
+        self.conn.autocommit = True
+        for table in ("users", "categories", "services", "submissions", "transactions", "login_history", "job_notifications", "webhook_events"):
+            self.conn.execute(f"analyze public.{table}")
+        self.conn.autocommit = False
+        print(f"  balances, sequences, analyze     {time.perf_counter() - started:6.1f}s")
+
+def create_schema(dsn: str, reset: bool):
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        exists = conn.execute("select to_regclass('public.users') is not null").fetchone()[0]
+        if exists and not reset:
+            raise SystemExit("public.users already exists; pass --reset to drop the public, auth and storage schemas and start over")
+        if reset:
+            conn.execute("drop publication if exists supabase_realtime")
+            conn.execute("drop schema if exists public cascade; drop schema if exists auth cascade; drop schema if exists storage cascade")
+            conn.execute("create schema public")
+
+        conn.execute(SUPABASE_STANDINS)
+        with open(os.path.join(BACKEND_DIR, "schema.sql")) as f:
+            schema = f.read()
+        has_uuid_ossp = conn.execute("select 1 from pg_available_extensions where name = 'uuid-ossp'").fetchone()
+        if not has_uuid_ossp:
+            schema = schema.replace(UUID_OSSP, "create or replace function public.uuid_generate_v4() returns uuid language sql as 'select gen_random_uuid()';")
+        conn.execute(schema)
+        for name in MIGRATIONS:
+            with open(os.path.join(BACKEND_DIR, name)) as f:
+                conn.execute(f.read())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL", "postgresql://postgres@localhost/dsk_bench"))
+    parser.add_argument("--reset", action="store_true", help="drop the public, auth and storage schemas first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", default="2025-06-30", help="latest timestamp (UTC date)")
+    parser.add_argument("--days", type=int, default=730, help="history length")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--categories", type=int, default=12)
+    parser.add_argument("--services", type=int, default=400)
+    parser.add_argument("--submissions", type=int, default=1_000_000)
+    parser.add_argument("--transactions", type=int, default=5_000_000)
+    parser.add_argument("--logins", type=int, default=300_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--webhooks", type=int, default=20_000)
+    args = parser.parse_args()
+    if min(args.users, args.categories, args.services) < 1:
+        parser.error("--users, --categories and --services must be at least 1")
+
+    started = time.perf_counter()
+    create_schema(args.dsn, args.reset)
+    print(f"schema.sql + {len(MIGRATIONS)} migrations applied", flush=True)
+
+    with psycopg.connect(args.dsn) as conn:
+        # No triggers (on_auth_user_created) or FK checks while bulk loading
+        conn.execute("set session_replication_role = replica")
+        loader = Loader(conn, args)
+        for step in (loader.users, loader.categories, loader.services, loader.submissions,
+                     loader.transactions, loader.login_history, loader.job_notifications, loader.webhook_events):
+            step()
+        conn.commit()
+        conn.execute("set session_replication_role = origin")
+        loader.finish()
+        size = conn.execute("select pg_size_pretty(pg_database_size(current_database()))").fetchone()[0]
+
+    print(f"done in {time.perf_counter() - started:.1f}s, database size {size}")
+
+if __name__ == "__main__":
+    main()
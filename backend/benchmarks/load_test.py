@@ -0,0 +1,438 @@
+"""
+Load test: the real API under realistic request mixes, against local stand-ins
+for everything it talks to, so it runs anywhere without a live Supabase project.
+
+The app runs under uvicorn in its own process(es) (`--workers`), with the
+lifespan workers running as in production. Stand-ins, from stub_servers:
+  - Supabase: PostgREST (tables plus Python versions of submit_application,
+    enqueue_webhook_event, claim_webhook_events and credit_wallet), Auth and
+    Storage, all on one URL,
+  - Razorpay (payments API),
+  - an OpenAI-compatible chat model.
+The seeded catalog, users and submissions are the same on every run (`--seed`).
+
+Each scenario is a closed loop: `--concurrency` virtual users send the
+scenario's mix back to back for `--duration` seconds, after `--warmup`
+seconds whose results are discarded. Scenarios:
+  catalog  GET /services/ (all, by category, one service)
+  apply    POST /services/apply
+  admin    GET /admin/applications (newest, by status, slim fields)
+  pages    GET /admin/applications following next_cursor to the last page,
+             and GET /admin/applications/export; a page that repeats or
+             skips rows, or is out of order, counts as an error
+  webhook  POST /wallet/razorpay-webhook (signed, some Razorpay retries)
+             and POST /wallet/verify-payment
+  chat     POST /chat/ (a question pool where popular questions repeat)
+  mixed    all of the above, weighted like dashboard traffic
+
+Reports throughput and p50/p95/p99 per scenario and per endpoint. With
+`--baseline FILE` the run is compared with stored results and the exit status
+is 1 if any scenario's p95 or throughput is worse than the baseline by more
+than `--tolerance`, or its error rate went up. `--save FILE` stores this run
+(e.g. as the new baseline). Baselines only compare runs on the same machine.
+
+Run from backend/:
+    python -m benchmarks.load_test --duration 10 --concurrency 20
+    python -m benchmarks.load_test --save benchmarks/baseline.json
+    python -m benchmarks.load_test --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from benchmarks.bench_webhook_queue import outbox_rpcs
+from benchmarks.stub_servers import (
+    SECRET, WEBHOOK_SECRET, StubServer, app_env, auth_stub_app, chat_model_stub_app, free_port, make_token,
+    postgrest_stub_app, razorpay_stub_app, storage_stub_app,
+)
+
+SCENARIOS = {
+    "catalog": {"services_list": 70, "services_by_category": 20, "service_detail": 10},
+    "apply": {"apply": 1},
+    "admin": {"admin_applications": 60, "admin_applications_status": 25, "admin_applications_slim": 15},
+    "pages": {"admin_pages": 90, "admin_export": 10},
+    "webhook": {"webhook": 85, "verify_payment": 15},
+    "chat": {"chat": 1},
+    "mixed": {
+        "services_list": 45, "services_by_category": 15, "service_detail": 10,
+        "apply": 8, "admin_applications": 7, "webhook": 6, "verify_payment": 2, "chat": 7,
+    },
+}
+
+def build_dataset(rng: random.Random, users: int, services: int, submissions: int) -> dict:
+    categories = [{"id": i, "name": name, "is_active": True} for i, name in enumerate(
+        ["Job Applications", "Certificates", "Licences", "Scholarships", "Utilities", "Banking", "Travel", "Education"], start=1)]
+    service_rows = [
+        {
+            "id": i, "name": f"Service {i}", "description": f"Apply for service {i}",
+            "price": float(rng.choice([20, 50, 100, 150, 250])), "category_id": rng.choice(categories)["id"],
+            "is_active": rng.random() < 0.9, "fields": [{"name": "full_name", "type": "text"}],
+            "created_at": f"2025-01-{1 + i % 28:02d}T10:00:00+00:00",
+        }
+        for i in range(1, services + 1)
+    ]
+    user_rows = [
+        {"id": str(uuid.UUID(int=rng.getrandbits(128))), "email": f"user{i}@example.com",
+         "wallet_balance": 1_000_000.0, "job_notifications_enabled": rng.random() < 0.3}
+        for i in range(users)
+    ]
+    submission_rows = [
+        {
+            "id": i, "user_id": rng.choice(user_rows)["id"], "service_id": rng.choice(service_rows)["id"],
+            "status": rng.choice(["pending", "pending", "approved", "rejected", "completed"]),
+            "data": {"full_name": f"Applicant {i}"}, "final_document_url": None,
+            "created_at": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00+00:00",
+        }
+        for i in range(1, submissions + 1)
+    ]
+    return {"categories": categories, "services": service_rows, "users": user_rows, "submissions": submission_rows}
+
+def supabase_rpcs(rng: random.Random) -> dict:
+    rpcs = outbox_rpcs(failure_rate=0.0, rng=rng)
+
+    def submit_application(tables, p):
+        user = next((u for u in tables["users"] if u["id"] == p["p_user_id"]), None)
+        service = next((s for s in tables["services"] if s["id"] == p["p_service_id"]), None)
+        if user is None or service is None:
+            raise Exception("User or service not found")
+        if user["wallet_balance"] < service["price"]:
+            raise Exception("Insufficient wallet balance")
+        user["wallet_balance"] -= service["price"]
+        rows = tables["submissions"]
+        row = {
+            "id": len(rows) + 1, "user_id": user["id"], "service_id": service["id"], "status": "pending",
+            "data": p["p_data"], "final_document_url": None,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()),
+        }
+        rows.append(row)
+        return {"success": True, "submission_id": row["id"], "new_balance": user["wallet_balance"]}
+
+    rpcs["submit_application"] = submit_application
+    return rpcs
+
+class Traffic:
+    """Builds the requests of each kind; one per virtual user, with its own random stream."""
+
+    QUESTIONS = [f"What does service {i} cost and how do I apply?" for i in range(1, 41)] + [
+        "What services do you offer?", "How do I top up my wallet?", "How long does approval take?",
+    ]
+
+    def __init__(self, dataset: dict, rng: random.Random, admin_token: str):
+        self.rng = rng
+        self.dataset = dataset
+        self.admin = {"Authorization": f"Bearer {admin_token}"}
+        self.active = [s for s in dataset["services"] if s["is_active"]]
+        # Seeded submissions per status filter: a finished walk must have seen at least these
+        self.seeded = {None: len(dataset["submissions"])}
+        for row in dataset["submissions"]:
+            self.seeded[row["status"]] = self.seeded.get(row["status"], 0) + 1
+        self.walk = None
+
+    def services_list(self):
+        return "GET", "/api/v1/services/", {}
+
+    def services_by_category(self):
+        return "GET", f"/api/v1/services/?category_id={self.rng.choice(self.dataset['categories'])['id']}", {}
+
+    def service_detail(self):
+        return "GET", f"/api/v1/services/{self.rng.choice(self.active)['id']}", {}
+
+    def apply(self):
+        user = self.rng.choice(self.dataset["users"])
+        body = {"service_id": self.rng.choice(self.active)["id"], "data": {"user_id": user["id"], "full_name": "Load Test"}}
+        return "POST", "/api/v1/services/apply", {"json": body}
+
+    def admin_applications(self):
+        return "GET", "/api/v1/admin/applications?limit=50", {"headers": self.admin}
+
+    def admin_applications_status(self):
+        status = self.rng.choice(["pending", "approved", "completed"])
+        return "GET", f"/api/v1/admin/applications?status={status}&limit=50", {"headers": self.admin}
+
+    def admin_applications_slim(self):
+        return "GET", "/api/v1/admin/applications?limit=100&fields=id,status,service_id,created_at", {"headers": self.admin}
+
+    def admin_pages(self):
+        # One walk per virtual user, a page per request; a new walk starts after the last page
+        if self.walk is None:
+            self.walk = {"status": self.rng.choice([None, "pending", "approved"]), "cursor": None, "seen": set(), "last": None}
+        params = {"limit": 100, "fields": "id,status,service_id,created_at"}
+        if self.walk["status"]:
+            params["status"] = self.walk["status"]
+        if self.walk["cursor"]:
+            params["cursor"] = self.walk["cursor"]
+        return "GET", "/api/v1/admin/applications", {"params": params, "headers": self.admin}
+
+    def admin_export(self):
+        return "GET", "/api/v1/admin/applications/export?fields=id,created_at", {"headers": self.admin}
+
+    def check(self, kind: str, response: httpx.Response) -> bool:
+        """Whether a successful response is also correct (only checked for pagination)."""
+        if kind == "admin_pages":
+            return self._check_page(response.json())
+        if kind == "admin_export":
+            ids = [json.loads(line)["id"] for line in response.text.splitlines()]
+            return len(ids) == len(set(ids)) and len(ids) >= self.seeded[None]
+        return True
+
+    def _check_page(self, body: dict) -> bool:
+        walk = self.walk
+        keys = [(item["created_at"], item["id"]) for item in body["items"]]
+        ids = {item["id"] for item in body["items"]}
+        ok = (
+            all(a > b for a, b in zip(keys, keys[1:]))
+            and not (keys and walk["last"] and keys[0] >= walk["last"])
+            and not (ids & walk["seen"])
+            and all(item["status"] == walk["status"] for item in body["items"] if walk["status"])
+        )
+        walk["seen"] |= ids
+        if keys:
+            walk["last"] = keys[-1]
+        walk["cursor"] = body["next_cursor"]
+        if not ok or walk["cursor"] is None:
+            # Rows applied during the walk may be missed (they are newer), seeded ones may not
+            ok = ok and (walk["cursor"] is not None or len(walk["seen"]) >= self.seeded.get(walk["status"], 0))
+            self.walk = None
+        return ok
+
+    def webhook(self):
+        user = self.rng.choice(self.dataset["users"])
+        # About one delivery in ten is a Razorpay retry of an earlier event
+        number = self.rng.getrandbits(48) if self.rng.random() >= 0.1 else self.rng.randrange(256)
+        payment_id = f"pay_{number:012x}"
+        body = json.dumps({
+            "event": "payment.captured",
+            "payload": {"payment": {"entity": {
+                "id": payment_id, "amount": 10000, "status": "captured",
+                "notes": {"user_id": user["id"], "plan_name": "Go"},
+            }}},
+        }).encode()
+        signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        headers = {"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": f"evt_{payment_id}", "Content-Type": "application/json"}
+        return "POST", "/api/v1/wallet/razorpay-webhook", {"content": body, "headers": headers}
+
+    def verify_payment(self):
+        user = self.rng.choice(self.dataset["users"])
+        body = {"razorpay_payment_id": f"pay_verify{self.rng.randrange(500):04d}", "user_id": user["id"], "plan_name": "Go"}
+        return "POST", "/api/v1/wallet/verify-payment", {"json": body}
+
+    def chat(self):
+        # Skewed towards the first questions, like real traffic, so the response cache sees repeats
+        question = self.QUESTIONS[min(int(self.rng.expovariate(1 / 8)), len(self.QUESTIONS) - 1)]
+        return "POST", "/api/v1/chat/", {"json": {"message": question}}
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summarize(samples: list, elapsed: float) -> dict:
+    latencies = [latency for _, latency, _ in samples]
+    errors = sum(1 for _, _, ok in samples if not ok)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+async def run_scenario(base_url: str, mix: dict, args, dataset: dict, admin_token: str, seed: int) -> dict:
+    kinds, weights = list(mix), list(mix.values())
+    samples = []
+    recording = False
+
+    async def virtual_user(client: httpx.AsyncClient, index: int, stop_at: float):
+        rng = random.Random(seed * 1000 + index)
+        traffic = Traffic(dataset, rng, admin_token)
+        while time.perf_counter() < stop_at:
+            kind = rng.choices(kinds, weights)[0]
+            method, url, options = getattr(traffic, kind)()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **options)
+                ok = response.status_code < 400 and traffic.check(kind, response)
+            except httpx.HTTPError:
+                ok = False
+            if not ok and kind == "admin_pages":
+                traffic.walk = None
+            if recording:
+                samples.append((kind, time.perf_counter() - start, ok))
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        begin = time.perf_counter()
+        stop_at = begin + args.warmup + args.duration
+        users = [asyncio.create_task(virtual_user(client, i, stop_at)) for i in range(args.concurrency)]
+        await asyncio.sleep(args.warmup)
+        recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - started
+
+    result = summarize(samples, elapsed)
+    result["endpoints"] = {
+        kind: summarize([s for s in samples if s[0] == kind], elapsed)
+        for kind in kinds if any(s[0] == kind for s in samples)
+    }
+    return result
+
+def scenario_process(base_url: str, mix: dict, args, dataset: dict, admin_token: str, seed: int) -> dict:
+    return asyncio.run(run_scenario(base_url, mix, args, dataset, admin_token, seed))
+
+def start_api(env: dict, workers: int) -> tuple:
+    port = free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + 60
+    while True:
+        if process.poll() is not None or time.perf_counter() > deadline:
+            process.kill()
+            raise RuntimeError("API did not start")
+        try:
+            if httpx.get(url + "/", timeout=1).status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            time.sleep(0.05)
+
+def print_result(name: str, result: dict, breakdown: bool):
+    def line(label: str, r: dict, indent: str) -> str:
+        return (
+            f"{indent}{label:<{26 - len(indent)}} {r['requests']:>7} req {r['rps']:>8.1f}/s  "
+            f"p50 {r['p50_ms']:>7.1f}  p95 {r['p95_ms']:>7.1f}  p99 {r['p99_ms']:>7.1f} ms  "
+            f"{r['errors']} errors"
+        )
+
+    print(line(name, result, ""))
+    if breakdown and len(result["endpoints"]) > 1:
+        for kind, r in result["endpoints"].items():
+            print(line(kind, r, "  "))
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Scenarios that regressed against the baseline, as readable lines."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']:.1f} ms vs baseline {before['p95_ms']:.1f} ms")
+        if current["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['rps']:.1f}/s vs baseline {before['rps']:.1f}/s")
+        if current["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {current['error_rate']:.1%} vs baseline {before['error_rate']:.1%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated, from: " + ", ".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="stub Supabase latency per call (s)")
+    parser.add_argument("--razorpay-latency", type=float, default=0.1)
+    parser.add_argument("--model-latency", type=float, default=0.2, help="stub chat model latency per completion (s)")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--services", type=int, default=200)
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", help="compare with this results file; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown vs the baseline")
+    parser.add_argument("--save", help="write this run's results here")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    rng = random.Random(args.seed)
+    dataset = build_dataset(rng, args.users, args.services, args.submissions)
+    payments = {
+        f"pay_verify{i:04d}": {"id": f"pay_verify{i:04d}", "amount": 10000, "status": "captured", "email": "user@example.com"}
+        for i in range(500)
+    }
+
+    # The stub mutates its tables; the generator only needs a snapshot to pick ids from
+    client_dataset = {key: list(rows) for key, rows in dataset.items()}
+    supabase_app = postgrest_stub_app(latency=args.db_latency, tables=dataset, rpcs=supabase_rpcs(rng))
+    auth_stub_app(SECRET, latency=args.db_latency, app=supabase_app)
+    storage_stub_app(latency=args.db_latency, app=supabase_app)
+    supabase = StubServer(supabase_app).start()
+    razorpay = StubServer(razorpay_stub_app(latency=args.razorpay_latency, payments=payments)).start()
+    model = StubServer(chat_model_stub_app(latency=args.model_latency)).start()
+
+    env = dict(os.environ, **app_env(
+        supabase.url,
+        RAZORPAY_KEY_ID="rzp_test_bench",
+        RAZORPAY_KEY_SECRET="bench",
+        RAZORPAY_BASE_URL=razorpay.url,
+        RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET,
+        OPENAI_API_KEY="bench",
+        OPENAI_BASE_URL=model.url + "/v1",
+        LOG_LEVEL="WARNING",
+    ))
+    admin_token = make_token(SECRET, app_metadata={"provider": "email", "role": "admin"}, ttl=24 * 3600)
+
+    api, api_url = start_api(env, args.workers)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("baseline", "save", "scenarios", "tolerance")},
+        },
+        "scenarios": {},
+    }
+    try:
+        print(f"{args.concurrency} virtual users, {args.duration:.0f}s per scenario, {args.workers} API worker(s)")
+        # The load generator gets a process of its own, so it neither slows nor is slowed by the stubs
+        with ProcessPoolExecutor(max_workers=1) as generator:
+            for index, name in enumerate(names):
+                result = generator.submit(scenario_process, api_url, SCENARIOS[name], args, client_dataset, admin_token, args.seed + index).result()
+                results["scenarios"][name] = result
+                print_result(name, result, breakdown=True)
+    finally:
+        api.terminate()
+        api.wait()
+        for server in (model, razorpay, supabase):
+            server.stop()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changed = [k for k, v in results["meta"]["args"].items() if baseline.get("meta", {}).get("args", {}).get(k) != v]
+        if changed:
+            print(f"warning: baseline was recorded with different settings ({', '.join(changed)})")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"REGRESSION against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Local stand-ins for the services the backend talks to, so benchmarks can run
+without a live Supabase project.
+
+Each stub is a small FastAPI app served by uvicorn on a background thread.
+"""
+import asyncio
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+import jwt
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+
+# What the stub tokens are signed with, and what the app is told to verify them with
+SECRET = "bench-jwt-secret-with-enough-length-for-hs256"
+WEBHOOK_SECRET = "bench-webhook-secret"
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class StubServer:
+    """Runs an ASGI app on 127.0.0.1 in a daemon thread."""
+
+    def __init__(self, app, port: int = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+def make_token(secret: str, sub: str = None, ttl: int = 3600, **claims) -> str:
+    """Mint a Supabase-shaped HS256 access token."""
+    now = int(time.time())
+    payload = {
+        "sub": sub or str(uuid.uuid4()),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": claims.pop("email", "user@example.com"),
+        "app_metadata": claims.pop("app_metadata", {"provider": "email"}),
+        "user_metadata": {},
+        "iat": now,
+        "exp": now + ttl,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+def app_env(supabase_url: str = None, **settings) -> dict:
+    """
+    Settings that point the app at the stubs: with `supabase_url`, the Supabase
+    URL, a service-role key and the JWT secret; plus any other setting passed
+    as NAME=value. For subprocesses, merge into their environment.
+    """
+    env = {}
+    if supabase_url:
+        env["SUPABASE_URL"] = supabase_url
+        env["SUPABASE_SERVICE_ROLE_KEY"] = make_token(SECRET, sub="service", role="service_role")
+        env["SUPABASE_JWT_SECRET"] = SECRET
+    env.update({name: str(value) for name, value in settings.items()})
+    return env
+
+def configure_env(supabase_url: str = None, **settings):
+    """app_env() for this process. Must run before anything under app/ is imported (settings are read at import time)."""
+    os.environ.update(app_env(supabase_url, **settings))
+
+def _stub_app(app: FastAPI = None) -> FastAPI:
+    # Stubs can share one app so a single SUPABASE_URL serves auth, rest and storage
+    if app is None:
+        app = FastAPI()
+        app.state.calls = 0
+    return app
+
+def auth_stub_app(secret: str, latency: float = 0.02, app: FastAPI = None) -> FastAPI:
+    """
+    Fake Supabase Auth: GET /auth/v1/user validates the bearer token after
+    `latency` seconds, like the real round trip would.
+    """
+    app = _stub_app(app)
+
+    @app.get("/auth/v1/user")
+    async def get_user(authorization: str = Header(None)):
+        app.state.calls += 1
+        await asyncio.sleep(latency)
+        try:
+            claims = jwt.decode(authorization.split(" ")[1], secret, algorithms=["HS256"], audience="authenticated")
+        except Exception:
+            raise HTTPException(status_code=401, detail={"msg": "invalid JWT"})
+        return {
+            "id": claims["sub"],
+            "aud": claims["aud"],
+            "role": claims.get("role"),
+            "email": claims.get("email"),
+            "app_metadata": claims.get("app_metadata", {}),
+            "user_metadata": claims.get("user_metadata", {}),
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+
+    @app.get("/auth/v1/.well-known/jwks.json")
+    async def jwks():
+        # HS256 projects publish no asymmetric keys
+        return {"keys": []}
+
+    return app
+
+# --- PostgREST ---
+
+def _coerce(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+def _matches(row: dict, column: str, expr: str) -> bool:
+    op, _, raw = expr.partition(".")
+    value = row.get(column)
+    if op == "eq":
+        return str(value).lower() == raw.lower() if isinstance(value, bool) else str(value) == raw
+    if op == "neq":
+        return str(value) != raw
+    if op == "is":
+        return (value is None) if raw == "null" else str(value).lower() == raw
+    if op == "in":
+        return str(value) in [v.strip().strip('"') for v in raw.strip("()").split(",")]
+    if op in ("like", "ilike"):
+        pattern = raw.replace("*", "%").strip("%").lower()
+        parts = [p for p in pattern.split("%") if p]
+        text = str(value or "").lower()
+        pos = 0
+        for part in parts:
+            pos = text.find(part, pos)
+            if pos < 0:
+                return False
+            pos += len(part)
+        return True
+    if value is None:
+        return False
+    left, right = _coerce(value), _coerce(raw)
+    if isinstance(left, str) or isinstance(right, str):
+        # Numbers compare as numbers (an int column against "22" is 22.0), everything else as text
+        left, right = str(value), raw
+    return {"gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right}.get(op, True)
+
+def _split_conditions(text: str) -> list:
+    """Split `a.eq.1,and(b.lt.2,c.gt.3)` on the commas outside parentheses and quotes."""
+    parts, current, depth, quoted = [], "", 0, False
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+def _tree_filter(operator: str, expr: str):
+    """Logic trees, e.g. or=(created_at.lt."...",and(created_at.eq."...",id.lt.5)), as a row predicate."""
+    checks = []
+    for condition in _split_conditions(expr.strip()[1:-1]):
+        if condition.startswith(("and(", "or(")):
+            nested, _, rest = condition.partition("(")
+            checks.append(_tree_filter(nested, "(" + rest))
+        else:
+            column, _, filter_expr = condition.partition(".")
+            op, _, raw = filter_expr.partition(".")
+            checks.append(lambda row, column=column, expr=f"{op}.{raw.strip(chr(34))}": _matches(row, column, expr))
+    combine = any if operator == "or" else all
+    return lambda row: combine(check(row) for check in checks)
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+class PostgresError(Exception):
+    """Raised by a stub RPC to fail with a given SQLSTATE, like RAISE ... USING ERRCODE."""
+
+    def __init__(self, message: str, code: str = "P0001"):
+        super().__init__(message)
+        self.code = code
+
+def postgrest_stub_app(latency: float = 0.01, tables: dict = None, rpcs: dict = None, app: FastAPI = None) -> FastAPI:
+    """
+    In-memory PostgREST look-alike: enough of select/insert/update/delete/rpc for
+    the queries this backend makes (eq/neq/in/is/ilike/gt/lt filters, or/and
+    logic trees, order, limit, exact counts and single()). Embedded resources are ignored.
+
+    `rpcs` maps function names to callables(tables, params) -> json.
+    """
+    app = _stub_app(app)
+    app.state.tables = tables if tables is not None else {}
+    app.state.rpcs = rpcs or {}
+    app.state.calls = 0
+    app.state.lock = threading.Lock()
+    ids = {}
+
+    def rows_for(table: str, params) -> list:
+        rows = app.state.tables.setdefault(table, [])
+        for column, expr in params.multi_items():
+            if column in ("or", "and"):
+                matches = _tree_filter(column, expr)
+                rows = [row for row in rows if matches(row)]
+            elif column not in RESERVED_PARAMS:
+                rows = [row for row in rows if _matches(row, column, expr)]
+        return rows
+
+    def respond(request: Request, rows: list, total: int = None) -> Response:
+        headers = {}
+        if "count=exact" in request.headers.get("prefer", ""):
+            count = len(rows) if total is None else total
+            headers["Content-Range"] = f"0-{max(count - 1, 0)}/{count}"
+        if request.method == "HEAD":
+            return Response(status_code=200, headers=headers)
+        if request.headers.get("accept") == "application/vnd.pgrst.object+json":
+            if len(rows) != 1:
+                return Response(
+                    content=json.dumps({"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned", "details": None, "hint": None}),
+                    status_code=406, media_type="application/json",
+                )
+            return Response(content=json.dumps(rows[0], default=str), media_type="application/json", headers=headers)
+        return Response(content=json.dumps(rows, default=str), media_type="application/json", headers=headers)
+
+    @app.api_route("/rest/v1/rpc/{name}", methods=["POST"])
+    async def rpc(name: str, request: Request):
+        app.state.calls += 1
+        await asyncio.sleep(latency)
+        handler = app.state.rpcs.get(name)
+        if handler is None:
+            return Response(content=json.dumps({"code": "PGRST202", "message": f"function {name} not found", "details": None, "hint": None}), status_code=404, media_type="application/json")
+        params = await request.json() if await request.body() else {}
+        try:
+            with app.state.lock:
+                result = handler(app.state.tables, params)
+        except Exception as e:
+            code = getattr(e, "code", "P0001")
+            # PostgREST answers no_data_found with 404
+            status_code = 404 if code == "P0002" else 400
+            return Response(content=json.dumps({"code": code, "message": str(e), "details": None, "hint": None}), status_code=status_code, media_type="application/json")
+        return Response(content=json.dumps(result, default=str), media_type="application/json")
+
+    @app.api_route("/rest/v1/{table}", methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])
+    async def table(table: str, request: Request):
+        app.state.calls += 1
+        await asyncio.sleep(latency)
+        params = request.query_params
+
+        if request.method in ("GET", "HEAD"):
+            rows = rows_for(table, params)
+            total = len(rows)
+            for part in reversed((params.get("order") or "").split(",")):
+                if part:
+                    column, _, direction = part.partition(".")
+                    rows = sorted(rows, key=lambda r: (r.get(column) is None, _coerce(r.get(column))), reverse=direction.startswith("desc"))
+            offset = int(params.get("offset") or 0)
+            limit = params.get("limit")
+            rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+            return respond(request, rows, total)
+
+        if request.method == "POST":
+            payload = await request.json()
+            payload = payload if isinstance(payload, list) else [payload]
+            inserted = []
+            with app.state.lock:
+                rows = app.state.tables.setdefault(table, [])
+                counter = ids.setdefault(table, itertools.count(len(rows) + 1))
+                for item in payload:
+                    row = dict(item)
+                    row.setdefault("id", next(counter))
+                    row.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()))
+                    rows.append(row)
+                    inserted.append(row)
+            return respond(request, inserted)
+
+        if request.method == "PATCH":
+            values = await request.json()
+            with app.state.lock:
+                rows = rows_for(table, params)
+                for row in rows:
+                    row.update(values)
+            return respond(request, rows)
+
+        with app.state.lock:
+            doomed = rows_for(table, params)
+            app.state.tables[table] = [row for row in app.state.tables.get(table, []) if row not in doomed]
+        return respond(request, doomed)
+
+    return app
+
+# --- Storage ---
+
+def storage_stub_app(latency: float = 0.01, app: FastAPI = None) -> FastAPI:
+    """
+    Fake Supabase Storage uploads: the body is consumed as a stream and only
+    its size is kept (app.state.objects maps "bucket/path" to bytes received).
+    Batch URL signing (POST /object/sign/{bucket}) signs any path.
+    """
+    app = _stub_app(app)
+    app.state.objects = {}
+    app.state.sign_calls = 0
+
+    @app.post("/storage/v1/object/sign/{bucket}")
+    async def sign_many(bucket: str, request: Request):
+        app.state.calls += 1
+        app.state.sign_calls += 1
+        body = await request.json()
+        await asyncio.sleep(latency)
+        return [
+            {"path": path, "signedURL": f"/object/sign/{bucket}/{path}?token={uuid.uuid4().hex}", "error": None}
+            for path in body["paths"]
+        ]
+
+    @app.post("/storage/v1/object/{bucket}/{path:path}")
+    async def upload(bucket: str, path: str, request: Request):
+        app.state.calls += 1
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        await asyncio.sleep(latency)
+        app.state.objects[f"{bucket}/{path}"] = size
+        return {"Key": f"{bucket}/{path}", "Id": str(uuid.uuid4())}
+
+    return app
+
+# --- Razorpay ---
+
+def razorpay_stub_app(latency: float = 0.3, payments: dict = None, app: FastAPI = None) -> FastAPI:
+    """
+    Fake Razorpay API: GET /v1/payments/{id} answers after `latency` seconds.
+    Unknown ids get Razorpay's BAD_REQUEST_ERROR. Set `app.state.latency` to
+    slow it down at runtime, or `app.state.down = True` to answer 503s.
+    """
+    app = _stub_app(app)
+    app.state.payments = payments if payments is not None else {}
+    app.state.latency = latency
+    app.state.down = False
+    app.state.payment_fetches = 0
+
+    @app.get("/v1/payments/{payment_id}")
+    async def fetch_payment(payment_id: str):
+        app.state.payment_fetches += 1
+        await asyncio.sleep(app.state.latency)
+        if app.state.down:
+            error = {"error": {"code": "SERVER_ERROR", "description": "The server encountered an error."}}
+            return Response(content=json.dumps(error), status_code=503, media_type="application/json")
+        payment = app.state.payments.get(payment_id)
+        if payment is None:
+            error = {"error": {"code": "BAD_REQUEST_ERROR", "description": "The id provided does not exist"}}
+            return Response(content=json.dumps(error), status_code=400, media_type="application/json")
+        return payment
+
+    return app
+
+# --- OpenAI-compatible chat model ---
+
+def chat_model_stub_app(latency: float = 0.2, token_delay: float = 0.005, answer_words: int = 40, app: FastAPI = None) -> FastAPI:
+    """
+    Fake /v1/chat/completions. Questions mentioning services trigger one
+    platform_knowledge tool call; everything else gets a canned answer of
+    `answer_words` tokens. Supports both plain and `stream: true` requests.
+    """
+    from fastapi.responses import StreamingResponse
+
+    app = _stub_app(app)
+    app.state.completions = 0
+
+    def wants_tool(body: dict) -> bool:
+        last = body["messages"][-1]
+        return bool(body.get("tools")) and last.get("role") == "user" and "service" in str(last.get("content", "")).lower()
+
+    def answer_tokens(body: dict) -> list:
+        return [f"word{i} " for i in range(answer_words)]
+
+    def envelope(model: str, obj: str, choice: dict) -> dict:
+        return {"id": "chatcmpl-stub", "object": obj, "created": int(time.time()), "model": model, "choices": [choice]}
+
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "platform_knowledge", "arguments": "{}"}}
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        app.state.completions += 1
+        model = body.get("model", "stub")
+        await asyncio.sleep(latency)
+
+        if not body.get("stream"):
+            if wants_tool(body):
+                message, finish = {"role": "assistant", "content": None, "tool_calls": [tool_call]}, "tool_calls"
+            else:
+                message, finish = {"role": "assistant", "content": "".join(answer_tokens(body))}, "stop"
+            result = envelope(model, "chat.completion", {"index": 0, "message": message, "finish_reason": finish})
+            result["usage"] = {"prompt_tokens": 100, "completion_tokens": answer_words, "total_tokens": 100 + answer_words}
+            return result
+
+        async def chunks():
+            if wants_tool(body):
+                delta = {"role": "assistant", "content": None, "tool_calls": [dict(tool_call, index=0)]}
+                yield "data: " + json.dumps(envelope(model, "chat.completion.chunk", {"index": 0, "delta": delta, "finish_reason": None})) + "\n\n"
+                finish = "tool_calls"
+            else:
+                for token in answer_tokens(body):
+                    delta = {"role": "assistant", "content": token}
+                    yield "data: " + json.dumps(envelope(model, "chat.completion.chunk", {"index": 0, "delta": delta, "finish_reason": None})) + "\n\n"
+                    await asyncio.sleep(token_delay)
+                finish = "stop"
+            yield "data: " + json.dumps(envelope(model, "chat.completion.chunk", {"index": 0, "delta": {}, "finish_reason": finish})) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
@@ -0,0 +1,25 @@
+-- SQL Migration for Admin Dashboard Stats
+-- Run this in your Supabase SQL Editor
+
+-- All dashboard counters in one round trip: a single grouped scan over
+-- submissions.status plus the user and service totals.
+CREATE OR REPLACE FUNCTION public.admin_stats()
+RETURNS jsonb AS $$
+  SELECT jsonb_build_object(
+    'total_users', (SELECT COUNT(*) FROM public.users),
+    'total_services', (SELECT COUNT(*) FROM public.services),
+    'total_applications', COALESCE(SUM(s.n), 0),
+    'pending_applications', COALESCE(SUM(s.n) FILTER (WHERE s.status = 'pending'), 0),
+    'approved_applications', COALESCE(SUM(s.n) FILTER (WHERE s.status = 'approved'), 0),
+    'rejected_applications', COALESCE(SUM(s.n) FILTER (WHERE s.status = 'rejected'), 0)
+  )
+  FROM (
+    SELECT status, COUNT(*) AS n
+    FROM public.submissions
+    GROUP BY status
+  ) s;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Only the backend (service role) may read platform-wide counts
+REVOKE EXECUTE ON FUNCTION public.admin_stats() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_stats() TO service_role;
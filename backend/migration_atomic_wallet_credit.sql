@@ -0,0 +1,41 @@
+-- SQL Migration for Atomic Wallet Credits
+-- Run this in your Supabase SQL Editor
+
+-- Credit a wallet in one round trip: the balance is incremented in place
+-- (the UPDATE row lock serialises concurrent credits, so none are lost),
+-- the ledger row is written in the same transaction and the new balance is returned.
+CREATE OR REPLACE FUNCTION public.credit_wallet(
+  p_user_id uuid,
+  p_amount decimal(10, 2),
+  p_description text
+) RETURNS jsonb AS $$
+DECLARE
+  v_new_balance decimal(10, 2);
+BEGIN
+  IF p_amount IS NULL OR p_amount <= 0 THEN
+    RAISE EXCEPTION 'Credit amount must be positive';
+  END IF;
+
+  UPDATE public.users
+  SET wallet_balance = COALESCE(wallet_balance, 0) + p_amount
+  WHERE id = p_user_id
+  RETURNING wallet_balance INTO v_new_balance;
+
+  IF NOT FOUND THEN
+    -- no_data_found: the backend maps this SQLSTATE (and only this one) to 404
+    RAISE EXCEPTION 'User % not found', p_user_id USING ERRCODE = 'P0002';
+  END IF;
+
+  INSERT INTO public.transactions (user_id, amount, type, description)
+  VALUES (p_user_id, p_amount, 'credit', p_description);
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'new_balance', v_new_balance
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) may credit arbitrary wallets
+REVOKE EXECUTE ON FUNCTION public.credit_wallet(uuid, decimal, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.credit_wallet(uuid, decimal, text) TO service_role;
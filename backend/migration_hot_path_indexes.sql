@@ -0,0 +1,60 @@
+-- SQL Migration for Hot-Path Indexes
+-- Run this in your Supabase SQL Editor
+
+-- schema.sql only has primary keys, so every list below was a full scan plus a
+-- sort. Each index matches one access path of the API or the dashboard.
+-- On a large, busy table, run the statements one at a time from psql as
+-- CREATE INDEX CONCURRENTLY instead (it cannot run inside the editor's transaction).
+-- benchmarks/explain_queries.py shows the plans before and after.
+
+-- GET /admin/applications: newest first, keyset pagination on (created_at, id)
+CREATE INDEX IF NOT EXISTS submissions_created_at_id_idx
+  ON public.submissions (created_at DESC, id DESC);
+
+-- GET /admin/applications?status=...: same order within one status; also lets
+-- admin_stats() count per status from the index
+CREATE INDEX IF NOT EXISTS submissions_status_created_at_id_idx
+  ON public.submissions (status, created_at DESC, id DESC);
+
+-- Dashboard, category and service pages: a user's own submissions, newest first
+CREATE INDEX IF NOT EXISTS submissions_user_created_at_idx
+  ON public.submissions (user_id, created_at DESC);
+
+-- DELETE /services/{id} removes the service's submissions first
+CREATE INDEX IF NOT EXISTS submissions_service_id_idx
+  ON public.submissions (service_id);
+
+-- Wallet history page, and credit_wallet_topup's recent-credits check
+CREATE INDEX IF NOT EXISTS transactions_user_created_at_idx
+  ON public.transactions (user_id, created_at DESC);
+
+-- Razorpay webhook: payer lookup by email when the notes carry no user id
+CREATE INDEX IF NOT EXISTS users_email_idx
+  ON public.users (email);
+
+-- Login history on the dashboard and history pages
+CREATE INDEX IF NOT EXISTS login_history_user_login_at_idx
+  ON public.login_history (user_id, login_at DESC);
+
+-- Category page: active services of one category by name (inactive ones are never listed)
+CREATE INDEX IF NOT EXISTS services_active_category_name_idx
+  ON public.services (category_id, name)
+  WHERE is_active;
+
+-- Admin services page: newest first
+CREATE INDEX IF NOT EXISTS services_created_at_idx
+  ON public.services (created_at DESC);
+
+-- GET /jobs/: active notifications, newest first
+CREATE INDEX IF NOT EXISTS job_notifications_active_created_at_idx
+  ON public.job_notifications (created_at DESC)
+  WHERE is_active;
+
+-- Job alerts: categories matched with name ILIKE '%job%'. A leading wildcard
+-- cannot use a btree, so the match goes through a trigram index.
+-- The operator class is left unqualified: pg_trgm may already be installed in
+-- public rather than extensions, and both are on Supabase's search_path.
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+
+CREATE INDEX IF NOT EXISTS categories_name_trgm_idx
+  ON public.categories USING gin (name gin_trgm_ops);
@@ -0,0 +1,7 @@
+-- SQL Migration for Service Logo Variants
+-- Run this in your Supabase SQL Editor
+
+-- Public URLs of the resized copies made by /admin/upload-logo, e.g.
+-- {"thumb_64": "...", "thumb_64_webp": "...", "card_256": "...", "card_256_webp": "..."}.
+-- logo_url keeps pointing at the original upload.
+ALTER TABLE public.services ADD COLUMN IF NOT EXISTS logo_variants jsonb;
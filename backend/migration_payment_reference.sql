@@ -0,0 +1,84 @@
+-- SQL Migration for Payment Idempotency
+-- Run this in your Supabase SQL Editor (after migration_atomic_wallet_credit.sql)
+
+-- Dedicated, uniquely indexed payment reference (e.g. Razorpay payment id)
+-- instead of matching on transactions.description.
+ALTER TABLE public.transactions ADD COLUMN IF NOT EXISTS payment_reference text;
+
+-- Backfill from legacy descriptions ('<Plan> Plan - Razorpay Payment: pay_xxx').
+-- The old duplicate check never matched, so a payment may have been credited twice;
+-- only the earliest row per payment gets the reference so the unique index can be built.
+UPDATE public.transactions t
+SET payment_reference = d.ref
+FROM (
+  SELECT DISTINCT ON (ref) id, ref
+  FROM (
+    SELECT id, created_at, substring(description FROM 'Razorpay Payment: (pay_[A-Za-z0-9]+)') AS ref
+    FROM public.transactions
+    WHERE description LIKE '%Razorpay Payment: %'
+  ) x
+  WHERE ref IS NOT NULL
+  ORDER BY ref, created_at
+) d
+WHERE t.id = d.id AND t.payment_reference IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_payment_reference_key
+  ON public.transactions (payment_reference)
+  WHERE payment_reference IS NOT NULL;
+
+-- credit_wallet gains an optional payment reference. The ledger row is inserted
+-- first with ON CONFLICT DO NOTHING, so a replayed payment is detected by the
+-- unique index and the balance is left untouched.
+DROP FUNCTION IF EXISTS public.credit_wallet(uuid, decimal, text);
+
+CREATE OR REPLACE FUNCTION public.credit_wallet(
+  p_user_id uuid,
+  p_amount decimal(10, 2),
+  p_description text,
+  p_payment_reference text DEFAULT NULL
+) RETURNS jsonb AS $$
+DECLARE
+  v_new_balance decimal(10, 2);
+  v_transaction_id uuid;
+BEGIN
+  IF p_amount IS NULL OR p_amount <= 0 THEN
+    RAISE EXCEPTION 'Credit amount must be positive';
+  END IF;
+
+  PERFORM 1 FROM public.users WHERE id = p_user_id;
+  IF NOT FOUND THEN
+    -- no_data_found: the backend maps this SQLSTATE (and only this one) to 404
+    RAISE EXCEPTION 'User % not found', p_user_id USING ERRCODE = 'P0002';
+  END IF;
+
+  INSERT INTO public.transactions (user_id, amount, type, description, payment_reference)
+  VALUES (p_user_id, p_amount, 'credit', p_description, p_payment_reference)
+  ON CONFLICT (payment_reference) WHERE payment_reference IS NOT NULL DO NOTHING
+  RETURNING id INTO v_transaction_id;
+
+  IF v_transaction_id IS NULL THEN
+    -- Already credited
+    SELECT wallet_balance INTO v_new_balance FROM public.users WHERE id = p_user_id;
+    RETURN jsonb_build_object(
+      'success', true,
+      'duplicate', true,
+      'new_balance', COALESCE(v_new_balance, 0)
+    );
+  END IF;
+
+  UPDATE public.users
+  SET wallet_balance = COALESCE(wallet_balance, 0) + p_amount
+  WHERE id = p_user_id
+  RETURNING wallet_balance INTO v_new_balance;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'duplicate', false,
+    'new_balance', v_new_balance
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) may credit arbitrary wallets
+REVOKE EXECUTE ON FUNCTION public.credit_wallet(uuid, decimal, text, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.credit_wallet(uuid, decimal, text, text) TO service_role;
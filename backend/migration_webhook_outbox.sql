@@ -0,0 +1,82 @@
+-- SQL Migration for Queued Webhook Processing
+-- Run this in your Supabase SQL Editor
+
+-- Outbox of received webhook events. The endpoint only verifies the signature
+-- and inserts here; the backend's worker pool claims and processes the rows.
+CREATE TABLE IF NOT EXISTS public.webhook_events (
+  id bigserial PRIMARY KEY,
+  provider text NOT NULL DEFAULT 'razorpay',
+  event_id text NOT NULL,              -- X-Razorpay-Event-Id (same on every retry of an event)
+  event text,                          -- e.g. 'payment.captured'
+  payload jsonb NOT NULL,
+  status text NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'done', 'dead')),
+  attempts int NOT NULL DEFAULT 0,
+  next_attempt_at timestamptz NOT NULL DEFAULT now(),
+  locked_until timestamptz,
+  last_error text,
+  created_at timestamptz DEFAULT now(),
+  processed_at timestamptz,
+  UNIQUE (provider, event_id)
+);
+
+-- Only unfinished rows are ever scanned by the workers
+CREATE INDEX IF NOT EXISTS webhook_events_due_idx
+  ON public.webhook_events (next_attempt_at, id)
+  WHERE status IN ('pending', 'processing');
+
+-- Service role only (no policies)
+ALTER TABLE public.webhook_events ENABLE ROW LEVEL SECURITY;
+
+-- Store an event once. Returns the row id, or NULL if the event was already queued.
+CREATE OR REPLACE FUNCTION public.enqueue_webhook_event(
+  p_provider text,
+  p_event_id text,
+  p_event text,
+  p_payload jsonb
+)
+RETURNS bigint
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO public.webhook_events (provider, event_id, event, payload)
+  VALUES (p_provider, p_event_id, p_event, p_payload)
+  ON CONFLICT (provider, event_id) DO NOTHING
+  RETURNING id;
+$$;
+
+-- Lease up to p_limit due events to the caller. SKIP LOCKED lets any number of
+-- workers (across processes) claim concurrently without handing out a row twice;
+-- rows whose lease ran out (worker died mid-event) become claimable again.
+CREATE OR REPLACE FUNCTION public.claim_webhook_events(
+  p_limit int DEFAULT 10,
+  p_lease_seconds int DEFAULT 60
+)
+RETURNS SETOF public.webhook_events
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  UPDATE public.webhook_events e
+  SET status = 'processing',
+      attempts = e.attempts + 1,
+      locked_until = now() + make_interval(secs => p_lease_seconds)
+  WHERE e.id IN (
+    SELECT id FROM public.webhook_events
+    WHERE (status = 'pending' AND next_attempt_at <= now())
+       OR (status = 'processing' AND locked_until < now())
+    ORDER BY next_attempt_at, id
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  RETURNING e.*;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.enqueue_webhook_event(text, text, text, jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.claim_webhook_events(int, int) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.enqueue_webhook_event(text, text, text, jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION public.claim_webhook_events(int, int) TO service_role;
+
+-- Dead-lettered events stay in the table with status 'dead' and their last_error.
+-- To replay one after fixing the cause:
+--   UPDATE public.webhook_events SET status = 'pending', attempts = 0, next_attempt_at = now() WHERE id = <id>;
@@ -29,6 +29,7 @@ async def promote_admin():
         
         print(f"Update result: {update_res.data}")
         print("Success! User is now an admin.")
+        print("Running API workers pick up the new role within ROLE_CACHE_TTL seconds.")
 
     except Exception as e:
         print(f"Error promoting user: {e}")
@@ -1,9 +1,13 @@
+import os
 import requests
 
+# record-login needs a session token: ACCESS_TOKEN=<supabase access token> python test_login_history.py
+
 try:
     response = requests.post(
         "http://localhost:8000/api/v1/auth/record-login",
-        json={"user_id": "test-user-id", "user_agent": "Test Agent"},
+        headers={"Authorization": f"Bearer {os.getenv('ACCESS_TOKEN', '')}"},
+        json={"user_agent": "Test Agent"},
         timeout=10
     )
     print(f"Status Code: {response.status_code}")
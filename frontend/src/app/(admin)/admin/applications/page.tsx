@@ -16,17 +16,22 @@ import {
 
 export default function ApplicationsPage() {
     const [applications, setApplications] = useState<any[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const router = useRouter();
     const supabase = createClient();
 
-    const fetchApplications = async () => {
-        setLoading(true);
+    const fetchApplications = async (cursor: string | null = null) => {
+        if (cursor) setLoadingMore(true); else setLoading(true);
         try {
             const { data: { session } } = await supabase.auth.getSession();
             if (!session) return;
 
             const url = new URL(`${API_URL}/admin/applications`);
+            // The list only shows who/what/when, so skip the heavy form data
+            url.searchParams.set('fields', 'id,user_id,service_id,status,created_at');
+            if (cursor) url.searchParams.set('cursor', cursor);
 
             const res = await fetch(url.toString(), {
                 headers: { 'Authorization': `Bearer ${session.access_token}` }
@@ -34,12 +39,19 @@ export default function ApplicationsPage() {
 
             if (res.ok) {
                 const data = await res.json();
-                setApplications(data);
+                // Services come back once in a side table; attach them to each row
+                const page = data.items.map((app: any) => ({
+                    ...app,
+                    services: data.services[app.service_id]
+                }));
+                setApplications(prev => cursor ? [...prev, ...page] : page);
+                setNextCursor(data.next_cursor);
             }
         } catch (error) {
             console.error("Failed to fetch applications", error);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -106,6 +118,18 @@ export default function ApplicationsPage() {
                         onView={(app) => router.push(`/admin/applications/${app.id}`)}
                     />
 
+                    {nextCursor && (
+                        <div className="text-center">
+                            <Button
+                                onClick={() => fetchApplications(nextCursor)}
+                                variant="outline"
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more applications'}
+                            </Button>
+                        </div>
+                    )}
+
                 </div>
             )}
         </div>
@@ -33,6 +33,7 @@ export default function ServiceEditorPage({ params }: { params: Promise<{ id: st
         price: '',
         description: '',
         logo_url: '',
+        logo_variants: null as Record<string, string> | null,
         fields: [] as FormField[],
         is_active: true
     });
@@ -71,7 +72,7 @@ export default function ServiceEditorPage({ params }: { params: Promise<{ id: st
             }
 
             const data = await res.json();
-            setService(prev => ({ ...prev, logo_url: data.url }));
+            setService(prev => ({ ...prev, logo_url: data.url, logo_variants: data.variants || null }));
 
         } catch (error: any) {
             alert('Error uploading image: ' + error.message);
@@ -101,6 +102,7 @@ export default function ServiceEditorPage({ params }: { params: Promise<{ id: st
                         price: srv.price.toString(),
                         description: srv.description || '',
                         logo_url: srv.logo_url || '',
+                        logo_variants: srv.logo_variants || null,
                         fields: srv.fields || [],
                         is_active: srv.is_active
                     });
@@ -124,6 +126,7 @@ export default function ServiceEditorPage({ params }: { params: Promise<{ id: st
             price: parseFloat(service.price),
             description: service.description,
             logo_url: service.logo_url,
+            logo_variants: service.logo_variants,
             fields: service.fields,
             is_active: service.is_active
         };
@@ -42,7 +42,10 @@ function LoginForm() {
                     const apiBase = baseUrl.endsWith('/api/v1') ? baseUrl : `${baseUrl}/api/v1`;
                     await fetch(`${apiBase}/auth/record-login`, {
                         method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'Authorization': `Bearer ${data.session.access_token}`
+                        },
                         body: JSON.stringify({
                             user_id: data.user.id,
                             user_agent: navigator.userAgent
@@ -5,6 +5,7 @@ import { createClient } from '@/lib/supabase/client';
 import Link from 'next/link';
 import { Box, ArrowRight, Clock, CheckCircle2, AlertCircle, Download } from 'lucide-react';
 import { Button } from '@/components/ui/button';
+import { fetchDocumentUrls } from '@/lib/documents';
 
 export default function CategoryViewPage({ params }: { params: Promise<{ id: string }> }) {
     const [unwrappedParams, setUnwrappedParams] = useState<{ id: string } | null>(null);
@@ -16,6 +17,7 @@ export default function CategoryViewPage({ params }: { params: Promise<{ id: str
     const [services, setServices] = useState<any[]>([]);
     const [categoryName, setCategoryName] = useState('');
     const [submissions, setSubmissions] = useState<any[]>([]);
+    const [documentUrls, setDocumentUrls] = useState<Record<number, string>>({});
     const [loading, setLoading] = useState(true);
     const supabase = createClient();
 
@@ -49,7 +51,15 @@ export default function CategoryViewPage({ params }: { params: Promise<{ id: str
                         .in('service_id', serviceIds)
                         .order('created_at', { ascending: false });
 
-                    if (subs) setSubmissions(subs);
+                    if (subs) {
+                        setSubmissions(subs);
+                        // One batched call signs every downloadable document up front
+                        const withDocs = subs.filter((s: any) => s.final_document_url).map((s: any) => s.id);
+                        const { data: { session } } = await supabase.auth.getSession();
+                        if (session && withDocs.length > 0) {
+                            setDocumentUrls(await fetchDocumentUrls(withDocs, session.access_token));
+                        }
+                    }
                 }
             }
             setLoading(false);
@@ -110,8 +120,18 @@ export default function CategoryViewPage({ params }: { params: Promise<{ id: str
 
                                     <div className="w-14 h-14 bg-white rounded-xl flex items-center justify-center mb-4 group-hover:scale-110 transition-transform shadow-lg relative z-10 overflow-hidden">
                                         {service.logo_url ? (
-                                            /* eslint-disable-next-line @next/next/no-img-element */
-                                            <img src={service.logo_url} alt={service.name} className="w-full h-full object-contain p-2" />
+                                            <picture>
+                                                {service.logo_variants && (
+                                                    <source type="image/webp" srcSet={`${service.logo_variants.thumb_64_webp} 1x, ${service.logo_variants.card_256_webp} 2x`} />
+                                                )}
+                                                {/* eslint-disable-next-line @next/next/no-img-element */}
+                                                <img
+                                                    src={service.logo_variants?.thumb_64 || service.logo_url}
+                                                    srcSet={service.logo_variants ? `${service.logo_variants.thumb_64} 1x, ${service.logo_variants.card_256} 2x` : undefined}
+                                                    alt={service.name}
+                                                    className="w-full h-full object-contain p-2"
+                                                />
+                                            </picture>
                                         ) : (
                                             <Box size={24} className="text-slate-900" />
                                         )}
@@ -197,6 +217,10 @@ export default function CategoryViewPage({ params }: { params: Promise<{ id: str
                                     <Button
                                         className="bg-emerald-600 text-white hover:bg-emerald-700 shadow-lg font-bold"
                                         onClick={async () => {
+                                            if (documentUrls[app.id]) {
+                                                window.open(documentUrls[app.id], '_blank');
+                                                return;
+                                            }
                                             const { data } = await supabase.storage
                                                 .from('final-documents')
                                                 .createSignedUrl(app.final_document_url, 60);
@@ -8,6 +8,8 @@ import { Button } from '@/components/ui/button';
 import FormRenderer from '@/components/form-builder/FormRenderer';
 import Link from 'next/link';
 import { API_URL } from '@/lib/api-config';
+import { fetchDocumentUrls } from '@/lib/documents';
+import { subscribeToEvents } from '@/lib/events';
 
 export default function ServiceApplicationPage({ params }: { params: Promise<{ id: string }> }) {
     const [unwrappedParams, setUnwrappedParams] = useState<{ id: string } | null>(null);
@@ -24,6 +26,7 @@ export default function ServiceApplicationPage({ params }: { params: Promise<{ i
 
     // Changed from single submission to list
     const [submissions, setSubmissions] = useState<any[]>([]);
+    const [documentUrls, setDocumentUrls] = useState<Record<number, string>>({});
 
     const fetchData = async () => {
         if (!id) return;
@@ -42,7 +45,15 @@ export default function ServiceApplicationPage({ params }: { params: Promise<{ i
                 .eq('service_id', id)
                 .order('created_at', { ascending: false });
 
-            if (subs) setSubmissions(subs);
+            if (subs) {
+                setSubmissions(subs);
+                // One batched call signs every downloadable document up front
+                const withDocs = subs.filter((s: any) => s.final_document_url).map((s: any) => s.id);
+                const { data: { session } } = await supabase.auth.getSession();
+                if (session && withDocs.length > 0) {
+                    setDocumentUrls(await fetchDocumentUrls(withDocs, session.access_token));
+                }
+            }
         }
 
         // Get Service Details
@@ -52,6 +63,24 @@ export default function ServiceApplicationPage({ params }: { params: Promise<{ i
         setLoading(false);
     };
 
+    // Status changes made by the admin are pushed over the event stream
+    useEffect(() => {
+        let unsubscribe = () => {};
+        let cancelled = false;
+        supabase.auth.getSession().then(({ data: { session } }) => {
+            if (!session || cancelled) return;
+            unsubscribe = subscribeToEvents(session.access_token, {
+                application_status: (change) => setSubmissions(prev =>
+                    prev.map(s => s.id === change.submission_id ? { ...s, status: change.status } : s)
+                ),
+            });
+        });
+        return () => {
+            cancelled = true;
+            unsubscribe();
+        };
+    }, []);
+
     useEffect(() => {
         fetchData();
     }, [id]);
@@ -121,8 +150,18 @@ export default function ServiceApplicationPage({ params }: { params: Promise<{ i
                 <div className="flex items-start justify-between">
                     <div className="flex items-center gap-4">
                         {service.logo_url && (
-                            /* eslint-disable-next-line @next/next/no-img-element */
-                            <img src={service.logo_url} alt={service.name} className="w-16 h-16 object-contain rounded-xl border border-gray-100 p-2 bg-white" />
+                            <picture>
+                                {service.logo_variants && (
+                                    <source type="image/webp" srcSet={`${service.logo_variants.thumb_64_webp} 1x, ${service.logo_variants.card_256_webp} 2x`} />
+                                )}
+                                {/* eslint-disable-next-line @next/next/no-img-element */}
+                                <img
+                                    src={service.logo_variants?.thumb_64 || service.logo_url}
+                                    srcSet={service.logo_variants ? `${service.logo_variants.thumb_64} 1x, ${service.logo_variants.card_256} 2x` : undefined}
+                                    alt={service.name}
+                                    className="w-16 h-16 object-contain rounded-xl border border-gray-100 p-2 bg-white"
+                                />
+                            </picture>
                         )}
                         <div>
                             <h1 className="text-3xl font-bold text-gray-900">{service.name}</h1>
@@ -223,6 +262,10 @@ export default function ServiceApplicationPage({ params }: { params: Promise<{ i
                                                 size="sm"
                                                 className="w-full bg-green-50 text-green-700 hover:bg-green-100 hover:text-green-800 border border-green-200 shadow-none"
                                                 onClick={async () => {
+                                                    if (documentUrls[app.id]) {
+                                                        window.open(documentUrls[app.id], '_blank');
+                                                        return;
+                                                    }
                                                     const { data } = await supabase.storage
                                                         .from('final-documents')
                                                         .createSignedUrl(app.final_document_url, 60);
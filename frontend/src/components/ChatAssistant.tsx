@@ -7,7 +7,8 @@ import { Input } from '@/components/ui/input';
 import { cn } from '@/lib/utils';
 
 // Helper for chat API
-const sendChatMessage = async (message: string) => {
+// Streams the answer from the SSE endpoint, calling onToken for each chunk.
+const streamChatMessage = async (message: string, onToken: (token: string) => void) => {
     // Determine API URL (default to relative path if not set, or localhost)
     const baseUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
     // Remove trailing slash if present
@@ -17,7 +18,7 @@ const sendChatMessage = async (message: string) => {
     const apiBase = cleanBase.endsWith('/api/v1') ? cleanBase : `${cleanBase}/api/v1`;
 
     // Add endpoint
-    const endpoint = `${apiBase}/chat/`;
+    const endpoint = `${apiBase}/chat/stream`;
 
     const res = await fetch(endpoint, {
         method: 'POST',
@@ -30,11 +31,36 @@ const sendChatMessage = async (message: string) => {
         body: JSON.stringify({ message }),
     });
 
-    if (!res.ok) {
+    if (!res.ok || !res.body) {
         const err = await res.json().catch(() => ({}));
         throw new Error(err.detail || 'Failed to send message');
     }
-    return res.json();
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE events are separated by a blank line
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+
+        for (const event of events) {
+            const lines = event.split('\n');
+            const type = lines.find(l => l.startsWith('event: '))?.slice(7);
+            const data = lines.find(l => l.startsWith('data: '))?.slice(6);
+            if (!data) continue;
+            const payload = JSON.parse(data);
+
+            if (type === 'error') throw new Error(payload.detail || 'Failed to send message');
+            if (type === 'done') return;
+            if (payload.token) onToken(payload.token);
+        }
+    }
 };
 
 export default function ChatAssistant() {
@@ -60,8 +86,20 @@ export default function ChatAssistant() {
         setIsLoading(true);
 
         try {
-            const data = await sendChatMessage(userMsg);
-            setMessages(prev => [...prev, { role: 'assistant', content: data.response }]);
+            let started = false;
+            await streamChatMessage(userMsg, (token) => {
+                if (!started) {
+                    // First token: swap the typing indicator for the answer bubble
+                    started = true;
+                    setIsLoading(false);
+                    setMessages(prev => [...prev, { role: 'assistant', content: token }]);
+                    return;
+                }
+                setMessages(prev => {
+                    const last = prev[prev.length - 1];
+                    return [...prev.slice(0, -1), { ...last, content: last.content + token }];
+                });
+            });
         } catch (error) {
             console.error(error);
             setMessages(prev => [...prev, { role: 'assistant', content: "Sorry, I'm having trouble connecting to the server. Please try again later." }]);
@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react';
 import { createPortal } from 'react-dom';
 import { Bell, BellRing, X, Briefcase, CheckCircle2, Clock, Zap, AlertCircle } from 'lucide-react';
 import { createClient } from '@/lib/supabase/client';
+import { subscribeToEvents } from '@/lib/events';
 import { motion, AnimatePresence } from 'framer-motion';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
@@ -209,47 +210,33 @@ export default function JobAlertBell() {
         } else {
             setNotificationPermission('unsupported');
         }
+    }, [isEnabled, supabase]);
 
-        // Listen for new job services
-        const channel = supabase
-            .channel('public:services')
-            .on(
-                'postgres_changes',
-                {
-                    event: 'INSERT',
-                    schema: 'public',
-                    table: 'services'
-                },
-                async (payload) => {
-                    console.log('New service event:', payload);
-
-                    // Check if this service belongs to Job Applications category
-                    // We need to fetch the category name or check against known ID
-                    // For now, we'll fetch the category details to be sure
-                    const { data: categoryData } = await supabase
-                        .from('categories')
-                        .select('name')
-                        .eq('id', payload.new.category_id)
-                        .single();
-
-                    if (categoryData && categoryData.name.toLowerCase().includes('job')) {
-                        // It's a job! Show notification if enabled.
-                        if (isEnabled && Notification.permission === 'granted') {
-                            showBrowserNotification(
-                                `New Job: ${payload.new.name}`,
-                                payload.new.description || 'Check out this new job opportunity!',
-                                '/favicon.ico'
-                            );
-                        }
+    useEffect(() => {
+        // New job services are pushed by the backend, and only while job alerts are on
+        let unsubscribe = () => {};
+        let cancelled = false;
+        supabase.auth.getSession().then(({ data: { session } }) => {
+            if (!session || cancelled) return;
+            unsubscribe = subscribeToEvents(session.access_token, {
+                job_service: (job) => {
+                    if ('Notification' in window && Notification.permission === 'granted') {
+                        showBrowserNotification(
+                            `New Job: ${job.name}`,
+                            job.description || 'Check out this new job opportunity!',
+                            '/favicon.ico'
+                        );
                     }
-                }
-            )
-            .subscribe();
+                },
+                preference: (pref) => setIsEnabled(pref.enabled),
+            });
+        });
 
         return () => {
-            supabase.removeChannel(channel);
+            cancelled = true;
+            unsubscribe();
         };
-    }, [isEnabled, supabase]);
+    }, []);
 
     const fetchPreference = async () => {
         const { data: { session } } = await supabase.auth.getSession();
@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { createClient } from '@/lib/supabase/client';
+import { subscribeToEvents } from '@/lib/events';
 import { Briefcase, ExternalLink, Sparkles } from 'lucide-react';
 import Link from 'next/link';
 
@@ -22,6 +23,20 @@ export default function NewJobAlerts() {
 
     useEffect(() => {
         fetchNewJobs();
+
+        // Fetched once; new job services arrive over the event stream
+        let unsubscribe = () => {};
+        let cancelled = false;
+        supabase.auth.getSession().then(({ data: { session } }) => {
+            if (!session || cancelled) return;
+            unsubscribe = subscribeToEvents(session.access_token, {
+                job_service: (job: JobService) => setJobs(prev => [job, ...prev.filter(j => j.id !== job.id)].slice(0, 10)),
+            });
+        });
+        return () => {
+            cancelled = true;
+            unsubscribe();
+        };
     }, []);
 
     const fetchNewJobs = async () => {
@@ -0,0 +1,30 @@
+import { API_URL } from '@/lib/api-config';
+
+export interface SignedDocumentUrl {
+    submission_id: number;
+    path: string;
+    url: string;
+    expires_at: number;
+}
+
+// Signed download URLs for many submissions' final documents in one request.
+// Returns a map of submission id -> signed URL; missing entries have no document.
+export async function fetchDocumentUrls(submissionIds: number[], accessToken: string): Promise<Record<number, string>> {
+    if (submissionIds.length === 0) return {};
+    try {
+        const res = await fetch(`${API_URL}/documents/signed-urls`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${accessToken}`
+            },
+            body: JSON.stringify({ submission_ids: submissionIds })
+        });
+        if (!res.ok) return {};
+        const items: SignedDocumentUrl[] = await res.json();
+        return Object.fromEntries(items.map(item => [item.submission_id, item.url]));
+    } catch (error) {
+        console.error('Failed to fetch document URLs:', error);
+        return {};
+    }
+}
@@ -0,0 +1,131 @@
+import { API_URL } from '@/lib/api-config';
+import { createClient } from '@/lib/supabase/client';
+
+export type PushEvent =
+    | 'ready'
+    | 'job_notification'
+    | 'job_notification_removed'
+    | 'job_service'
+    | 'application_status'
+    | 'preference';
+
+const EVENTS: PushEvent[] = ['ready', 'job_notification', 'job_notification_removed', 'job_service', 'application_status', 'preference'];
+
+type Handlers = Partial<Record<PushEvent, (data: any) => void>>;
+
+// One stream per tab, shared by every component that subscribes
+let stream: AbortController | null = null;
+const subscribers = new Set<Handlers>();
+let authListener: { unsubscribe: () => void } | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+let failures = 0;
+
+function dispatch(event: string, raw: string) {
+    if (!EVENTS.includes(event as PushEvent)) return;
+    let data: any;
+    try {
+        data = JSON.parse(raw);
+    } catch (error) {
+        console.error(`Bad ${event} event:`, error);
+        return;
+    }
+    subscribers.forEach(handlers => handlers[event as PushEvent]?.(data));
+}
+
+// Read the stream with fetch() rather than EventSource, so the token goes in the
+// Authorization header instead of the URL (where access logs would keep it).
+async function read(accessToken: string, signal: AbortSignal) {
+    const res = await fetch(`${API_URL}/events/stream`, {
+        headers: { 'Authorization': `Bearer ${accessToken}` },
+        signal,
+    });
+    if (!res.ok || !res.body) throw new Error(`Event stream failed (${res.status})`);
+    failures = 0;
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) return;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE events are separated by a blank line; heartbeats are ": ping" comments
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+
+        for (const event of events) {
+            const lines = event.split('\n');
+            const type = lines.find(l => l.startsWith('event: '))?.slice(7);
+            const data = lines.find(l => l.startsWith('data: '))?.slice(6);
+            if (type && data) dispatch(type, data);
+        }
+    }
+}
+
+function open(accessToken: string) {
+    stream?.abort();
+    const controller = new AbortController();
+    stream = controller;
+    // The server ends every stream after PUSH_STREAM_MAX_AGE; either way it
+    // ends, reopen with a fresh token unless it was closed on purpose
+    read(accessToken, controller.signal)
+        .catch(error => {
+            if (!controller.signal.aborted) console.error('Event stream error:', error);
+        })
+        .finally(() => {
+            if (stream !== controller) return;
+            stream = null;
+            reconnect();
+        });
+}
+
+function reconnect() {
+    if (reconnectTimer || subscribers.size === 0) return;
+    const delay = Math.min(30000, 1000 * 2 ** failures);
+    failures += 1;
+    reconnectTimer = setTimeout(async () => {
+        reconnectTimer = null;
+        // getSession() refreshes an expired access token
+        const { data: { session } } = await createClient().auth.getSession();
+        if (session && subscribers.size > 0 && !stream) open(session.access_token);
+    }, delay);
+}
+
+function close() {
+    const controller = stream;
+    stream = null;
+    controller?.abort();
+    if (reconnectTimer) clearTimeout(reconnectTimer);
+    reconnectTimer = null;
+    authListener?.unsubscribe();
+    authListener = null;
+}
+
+// Listen to the backend's Server-Sent Events stream (/events/stream) instead of
+// polling. The stream is reopened with the current session token when it ends
+// and whenever Supabase refreshes the token.
+// Returns a function that removes the handlers (and closes the stream after the last one).
+export function subscribeToEvents(accessToken: string, handlers: Handlers): () => void {
+    if (typeof window === 'undefined' || !('ReadableStream' in window)) return () => {};
+
+    subscribers.add(handlers);
+    if (!stream && !reconnectTimer) open(accessToken);
+    if (!authListener) {
+        const { data: { subscription } } = createClient().auth.onAuthStateChange((event, session) => {
+            if (event === 'TOKEN_REFRESHED' && session && subscribers.size > 0) open(session.access_token);
+            if (event === 'SIGNED_OUT') {
+                const controller = stream;
+                stream = null;
+                controller?.abort();
+            }
+        });
+        authListener = subscription;
+    }
+
+    return () => {
+        subscribers.delete(handlers);
+        if (subscribers.size === 0) close();
+    };
+}